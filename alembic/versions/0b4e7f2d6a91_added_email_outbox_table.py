@@ -0,0 +1,47 @@
+"""added email outbox table
+
+Revision ID: 0b4e7f2d6a91
+Revises: f3b8d5a1c29e
+Create Date: 2026-10-17 17:42:03.915270
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "0b4e7f2d6a91"
+down_revision: str | Sequence[str] | None = "f3b8d5a1c29e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "emailoutbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("recipient", sa.String(), nullable=False),
+        sa.Column("subject", sa.String(), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(), nullable=False),
+        sa.Column("next_attempt_at", sa.TIMESTAMP(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_emailoutbox")),
+    )
+    op.create_index(
+        "ix_emailoutbox_next_attempt_at",
+        "emailoutbox",
+        ["next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_emailoutbox_next_attempt_at", table_name="emailoutbox")
+    op.drop_table("emailoutbox")
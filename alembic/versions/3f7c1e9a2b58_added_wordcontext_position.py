@@ -0,0 +1,49 @@
+"""added wordcontext position
+
+Revision ID: 3f7c1e9a2b58
+Revises: b6a3d9e2f418
+Create Date: 2026-10-18 10:12:47.318206
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f7c1e9a2b58"
+down_revision: str | Sequence[str] | None = "b6a3d9e2f418"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("wordcontext", sa.Column("position", sa.Integer(), nullable=True))
+    # Contexts were ordered by id until now
+    op.execute(
+        """
+        UPDATE wordcontext SET position = numbered.position
+        FROM (
+            SELECT id, row_number() OVER (PARTITION BY word_id ORDER BY id) - 1
+                AS position
+            FROM wordcontext
+        ) AS numbered
+        WHERE numbered.id = wordcontext.id
+        """
+    )
+    op.alter_column("wordcontext", "position", nullable=False)
+    op.create_index(
+        "ix_wordcontext_word_id_position",
+        "wordcontext",
+        ["word_id", "position"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_wordcontext_word_id_position", table_name="wordcontext")
+    op.drop_column("wordcontext", "position")
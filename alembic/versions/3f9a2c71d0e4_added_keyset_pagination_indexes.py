@@ -0,0 +1,41 @@
+"""added keyset pagination indexes
+
+Revision ID: 3f9a2c71d0e4
+Revises: bee699f67b8e
+Create Date: 2026-10-17 10:12:41.503118
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a2c71d0e4"
+down_revision: str | Sequence[str] | None = "bee699f67b8e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_user_created_at_id", "user", ["created_at", "id"], unique=False)
+    op.create_index(
+        "ix_dictlist_user_id_created_at_id",
+        "dictlist",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_word_user_id_created_at_id",
+        "word",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_word_user_id_created_at_id", table_name="word")
+    op.drop_index("ix_dictlist_user_id_created_at_id", table_name="dictlist")
+    op.drop_index("ix_user_created_at_id", table_name="user")
@@ -0,0 +1,78 @@
+"""recomputed word normalized_key
+
+Revision ID: 4d2e8b7c1a90
+Revises: 7c2d9e4a1f63
+Create Date: 2026-10-17 18:20:41.508317
+
+"""
+
+import os
+import unicodedata
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4d2e8b7c1a90"
+down_revision: str | Sequence[str] | None = "7c2d9e4a1f63"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BATCH_SIZE = 5000
+
+
+def normalize_word(value: str, *, strip_accents: bool = False) -> str:
+    """Copy of app.utils.search_utils.normalize_word at this revision."""
+    value = unicodedata.normalize("NFKC", value).casefold()
+    if strip_accents:
+        decomposed = unicodedata.normalize("NFD", value)
+        value = unicodedata.normalize(
+            "NFC", "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+        )
+    return " ".join(value.split())
+
+
+def rekey_words(strip_accents: bool) -> None:
+    if op.get_context().as_sql:
+        raise RuntimeError("normalized_key is recomputed in Python, run online")
+    word = sa.table(
+        "word",
+        sa.column("id", sa.Integer),
+        sa.column("new_word", sa.String),
+        sa.column("normalized_key", sa.String),
+    )
+    conn = op.get_bind()
+    last_id = 0
+    while rows := conn.execute(
+        sa.select(word.c.id, word.c.new_word, word.c.normalized_key)
+        .where(word.c.id > last_id)
+        .order_by(word.c.id)
+        .limit(BATCH_SIZE)
+    ).all():
+        changed = [
+            {"word_id": row.id, "key": key}
+            for row in rows
+            if (key := normalize_word(row.new_word, strip_accents=strip_accents))
+            != row.normalized_key
+        ]
+        if changed:
+            conn.execute(
+                word.update()
+                .where(word.c.id == sa.bindparam("word_id"))
+                .values(normalized_key=sa.bindparam("key")),
+                changed,
+            )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keys were accent-stripped until accents became a setting
+    rekey_words(os.environ.get("WORD_KEY_STRIP_ACCENTS", "false").lower() == "true")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    rekey_words(strip_accents=True)
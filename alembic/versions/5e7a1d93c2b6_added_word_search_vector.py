@@ -0,0 +1,116 @@
+"""added word search_vector
+
+Revision ID: 5e7a1d93c2b6
+Revises: c52e0b7f4a18
+Create Date: 2026-10-17 13:02:41.509271
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5e7a1d93c2b6"
+down_revision: str | Sequence[str] | None = "c52e0b7f4a18"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+WORD_SEARCH_DDL = (
+    """
+    CREATE FUNCTION word_search_document(
+        word_id integer, new_word text, translation text, note text
+    ) RETURNS tsvector
+    LANGUAGE sql STABLE AS $$
+        SELECT setweight(to_tsvector('simple', coalesce(new_word, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(translation, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(note, '')), 'C')
+            || setweight(to_tsvector('simple', coalesce((
+                SELECT string_agg(context, ' ') FROM wordcontext
+                WHERE wordcontext.word_id = word_search_document.word_id
+            ), '')), 'D')
+    $$
+    """,
+    """
+    CREATE FUNCTION word_search_vector_refresh() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := word_search_document(
+            NEW.id, NEW.new_word, NEW.translation, NEW.note
+        );
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE FUNCTION wordcontext_search_vector_refresh() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE word SET search_vector = word_search_document(
+            word.id, word.new_word, word.translation, word.note
+        )
+        WHERE word.id IN (SELECT word_id FROM changed_rows);
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER word_search_vector
+    BEFORE INSERT OR UPDATE OF new_word, translation, note ON word
+    FOR EACH ROW EXECUTE FUNCTION word_search_vector_refresh()
+    """,
+    """
+    CREATE TRIGGER wordcontext_search_vector_insert AFTER INSERT ON wordcontext
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION wordcontext_search_vector_refresh()
+    """,
+    """
+    CREATE TRIGGER wordcontext_search_vector_update AFTER UPDATE ON wordcontext
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION wordcontext_search_vector_refresh()
+    """,
+    """
+    CREATE TRIGGER wordcontext_search_vector_delete AFTER DELETE ON wordcontext
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION wordcontext_search_vector_refresh()
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "word", sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True)
+    )
+    for statement in WORD_SEARCH_DDL:
+        op.execute(statement)
+    op.execute(
+        """
+        UPDATE word SET search_vector = word_search_document(
+            id, new_word, translation, note
+        )
+        """
+    )
+    op.create_index(
+        "ix_word_search_vector",
+        "word",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_word_search_vector", table_name="word", postgresql_using="gin")
+    op.execute("DROP TRIGGER wordcontext_search_vector_delete ON wordcontext")
+    op.execute("DROP TRIGGER wordcontext_search_vector_update ON wordcontext")
+    op.execute("DROP TRIGGER wordcontext_search_vector_insert ON wordcontext")
+    op.execute("DROP TRIGGER word_search_vector ON word")
+    op.execute("DROP FUNCTION wordcontext_search_vector_refresh()")
+    op.execute("DROP FUNCTION word_search_vector_refresh()")
+    op.execute("DROP FUNCTION word_search_document(integer, text, text, text)")
+    op.drop_column("word", "search_vector")
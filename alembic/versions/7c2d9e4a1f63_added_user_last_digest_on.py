@@ -0,0 +1,29 @@
+"""added user last digest on
+
+Revision ID: 7c2d9e4a1f63
+Revises: 0b4e7f2d6a91
+Create Date: 2026-10-17 18:31:47.602184
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7c2d9e4a1f63"
+down_revision: str | Sequence[str] | None = "0b4e7f2d6a91"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("user", sa.Column("last_digest_on", sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("user", "last_digest_on")
@@ -0,0 +1,93 @@
+"""added dictlist word_count
+
+Revision ID: 8d41e6b2a9c5
+Revises: 3f9a2c71d0e4
+Create Date: 2026-10-17 11:03:27.118406
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41e6b2a9c5"
+down_revision: str | Sequence[str] | None = "3f9a2c71d0e4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+WORD_COUNT_DDL = (
+    """
+    CREATE FUNCTION dictlist_words_count_insert() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE dictlist SET word_count = dictlist.word_count + changed.n
+        FROM (
+            SELECT dictlist_id, count(*) AS n FROM new_rows GROUP BY dictlist_id
+        ) AS changed
+        WHERE dictlist.id = changed.dictlist_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE FUNCTION dictlist_words_count_delete() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE dictlist SET word_count = dictlist.word_count - changed.n
+        FROM (
+            SELECT dictlist_id, count(*) AS n FROM old_rows GROUP BY dictlist_id
+        ) AS changed
+        WHERE dictlist.id = changed.dictlist_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER dictlist_words_count_insert AFTER INSERT ON dictlist_words
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dictlist_words_count_insert()
+    """,
+    """
+    CREATE TRIGGER dictlist_words_count_delete AFTER DELETE ON dictlist_words
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dictlist_words_count_delete()
+    """,
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "dictlist",
+        sa.Column("word_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE dictlist SET word_count = (
+            SELECT count(*) FROM dictlist_words
+            WHERE dictlist_words.dictlist_id = dictlist.id
+        )
+        """
+    )
+    op.create_check_constraint(
+        op.f("ck_dictlist_word_count_within_limit"),
+        "dictlist",
+        "max_words_limit IS NULL OR word_count <= max_words_limit",
+    )
+    for statement in WORD_COUNT_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER dictlist_words_count_delete ON dictlist_words")
+    op.execute("DROP TRIGGER dictlist_words_count_insert ON dictlist_words")
+    op.execute("DROP FUNCTION dictlist_words_count_delete()")
+    op.execute("DROP FUNCTION dictlist_words_count_insert()")
+    op.drop_constraint(
+        op.f("ck_dictlist_word_count_within_limit"), "dictlist", type_="check"
+    )
+    op.drop_column("dictlist", "word_count")
@@ -0,0 +1,35 @@
+"""added pending job index
+
+Revision ID: 9e1f4c3b7d25
+Revises: 4d2e8b7c1a90
+Create Date: 2026-10-17 21:04:37.190264
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9e1f4c3b7d25"
+down_revision: str | Sequence[str] | None = "4d2e8b7c1a90"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_job_id_pending",
+        "job",
+        ["id"],
+        unique=False,
+        postgresql_where=sa.text("status = 'Pending'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_job_id_pending", table_name="job")
@@ -0,0 +1,41 @@
+"""added word trigram index
+
+Revision ID: a83f5c2e9d17
+Revises: 5e7a1d93c2b6
+Create Date: 2026-10-17 13:48:12.330957
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a83f5c2e9d17"
+down_revision: str | Sequence[str] | None = "5e7a1d93c2b6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+    op.create_index(
+        "ix_word_user_id_new_word_trgm",
+        "word",
+        ["user_id", "new_word"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"new_word": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_word_user_id_new_word_trgm",
+        table_name="word",
+        postgresql_using="gin",
+        postgresql_ops={"new_word": "gin_trgm_ops"},
+    )
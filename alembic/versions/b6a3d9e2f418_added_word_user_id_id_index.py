@@ -0,0 +1,27 @@
+"""added word user_id id index
+
+Revision ID: b6a3d9e2f418
+Revises: 9e1f4c3b7d25
+Create Date: 2026-10-17 21:37:12.604981
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b6a3d9e2f418"
+down_revision: str | Sequence[str] | None = "9e1f4c3b7d25"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index("ix_word_user_id_id", "word", ["user_id", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_word_user_id_id", table_name="word")
@@ -0,0 +1,41 @@
+"""added word prefix indexes
+
+Revision ID: d94b27e61f3a
+Revises: a83f5c2e9d17
+Create Date: 2026-10-17 14:21:56.804412
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d94b27e61f3a"
+down_revision: str | Sequence[str] | None = "a83f5c2e9d17"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_word_user_id_lang_code_new_word_prefix",
+        "word",
+        ["user_id", "lang_code", sa.text("lower(new_word) text_pattern_ops")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_word_user_id_lang_code_translation_prefix",
+        "word",
+        ["user_id", "lang_code", sa.text("lower(translation) text_pattern_ops")],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_word_user_id_lang_code_translation_prefix", table_name="word")
+    op.drop_index("ix_word_user_id_lang_code_new_word_prefix", table_name="word")
@@ -0,0 +1,75 @@
+"""added word normalized_key
+
+Revision ID: e1c6a08b5f72
+Revises: d94b27e61f3a
+Create Date: 2026-10-17 14:55:09.172639
+
+"""
+
+import unicodedata
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e1c6a08b5f72"
+down_revision: str | Sequence[str] | None = "d94b27e61f3a"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+BATCH_SIZE = 5000
+
+
+def normalize_word(value: str) -> str:
+    """Copy of app.utils.search_utils.normalize_word at this revision."""
+    value = unicodedata.normalize("NFKC", value).casefold()
+    decomposed = unicodedata.normalize("NFD", value)
+    value = unicodedata.normalize(
+        "NFC", "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    )
+    return " ".join(value.split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().as_sql:
+        raise RuntimeError("normalized_key is backfilled in Python, run online")
+    op.add_column("word", sa.Column("normalized_key", sa.String(), nullable=True))
+
+    word = sa.table(
+        "word",
+        sa.column("id", sa.Integer),
+        sa.column("new_word", sa.String),
+        sa.column("normalized_key", sa.String),
+    )
+    conn = op.get_bind()
+    last_id = 0
+    while rows := conn.execute(
+        sa.select(word.c.id, word.c.new_word)
+        .where(word.c.id > last_id)
+        .order_by(word.c.id)
+        .limit(BATCH_SIZE)
+    ).all():
+        conn.execute(
+            word.update()
+            .where(word.c.id == sa.bindparam("word_id"))
+            .values(normalized_key=sa.bindparam("key")),
+            [{"word_id": row.id, "key": normalize_word(row.new_word)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+    op.alter_column("word", "normalized_key", nullable=False)
+    op.create_index(
+        "ix_word_user_id_lang_code_normalized_key",
+        "word",
+        ["user_id", "lang_code", "normalized_key"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_word_user_id_lang_code_normalized_key", table_name="word")
+    op.drop_column("word", "normalized_key")
@@ -0,0 +1,54 @@
+"""added duplicate word table
+
+Revision ID: f3b8d5a1c29e
+Revises: e1c6a08b5f72
+Create Date: 2026-10-17 16:05:12.284617
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3b8d5a1c29e"
+down_revision: str | Sequence[str] | None = "e1c6a08b5f72"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # ADD VALUE cannot be used in the transaction that adds it, so commit it
+    # before anything else runs.
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE job_kind_enum ADD VALUE IF NOT EXISTS 'DuplicateScan'")
+        op.execute("ALTER TYPE job_kind_enum ADD VALUE IF NOT EXISTS 'DuplicateMerge'")
+    op.create_table(
+        "duplicateword",
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("word_id", sa.Integer(), nullable=False),
+        sa.Column("keeper_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["job_id"],
+            ["job.id"],
+            name=op.f("fk_duplicateword_job_id_job"),
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint("job_id", "word_id", name=op.f("pk_duplicateword")),
+    )
+    op.create_index(
+        "ix_duplicateword_job_id_keeper_id",
+        "duplicateword",
+        ["job_id", "keeper_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_duplicateword_job_id_keeper_id", table_name="duplicateword")
+    op.drop_table("duplicateword")
+    # PostgreSQL cannot drop values from an enum type, so the job kinds stay.
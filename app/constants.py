@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from dotenv import load_dotenv
 
@@ -19,3 +20,61 @@ MAIL_STARTTLS = os.environ["MAIL_STARTTLS"]
 MAIL_SSL_TLS = os.environ["MAIL_SSL_TLS"]
 
 JWT_ALGORITM = "HS256"
+
+# Processes hashing passwords, and calls that may wait for one before
+# requests are turned away with 503
+PASSWORD_HASH_WORKERS = int(
+    os.environ.get("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1))
+)
+PASSWORD_HASH_MAX_PENDING = int(os.environ.get("PASSWORD_HASH_MAX_PENDING", "16"))
+
+# Emails sent per second by each outbox worker, 0 for no limit
+MAIL_MAX_RATE = float(os.environ.get("MAIL_MAX_RATE", "0"))
+# Hour (UTC) at which the daily digests of the previous day are queued
+DIGEST_HOUR = int(os.environ.get("DIGEST_HOUR", "6"))
+# Import uploads larger than this are refused with 413
+IMPORT_MAX_BYTES = int(os.environ.get("IMPORT_MAX_BYTES", str(100 * 1024 * 1024)))
+# Uploaded Anki packages whose entries add up to more bytes once
+# uncompressed are refused, so that a small zip cannot fill the disk
+ANKI_MAX_UNCOMPRESSED_BYTES = int(
+    os.environ.get("ANKI_MAX_UNCOMPRESSED_BYTES", str(512 * 1024 * 1024))
+)
+
+# Connections kept open per engine and process, extra ones opened under
+# load, and seconds a request waits for one before failing
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+# Test connections on checkout, to survive database restarts
+DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "false").lower() == "true"
+
+# Statements slower than this many seconds are logged with their parameters,
+# and with their plan when SQL_EXPLAIN_SLOW_QUERIES is on. The plan comes
+# from EXPLAIN ANALYZE, which runs the statement again: a debugging aid only
+SLOW_QUERY_SECONDS = float(os.environ.get("SLOW_QUERY_SECONDS", "0.5"))
+SQL_EXPLAIN_SLOW_QUERIES = (
+    os.environ.get("SQL_EXPLAIN_SLOW_QUERIES", "false").lower() == "true"
+)
+
+# Where profiles of requests asked for by admins are stored, how many are
+# kept, the seconds between two stack samples, the samples taken at most for
+# a request, which bounds the memory of a long one, and the minutes a
+# profiling token is valid
+PROFILE_DIR = os.environ.get(
+    "PROFILE_DIR", f"{tempfile.gettempdir()}/vocabularynotes-profiles"
+)
+PROFILE_MAX_FILES = int(os.environ.get("PROFILE_MAX_FILES", "100"))
+PROFILE_INTERVAL = float(os.environ.get("PROFILE_INTERVAL", "0.005"))
+PROFILE_MAX_SAMPLES = int(os.environ.get("PROFILE_MAX_SAMPLES", "12000"))
+PROFILE_TOKEN_EXPIRE_MINUTES = int(os.environ.get("PROFILE_TOKEN_EXPIRE_MINUTES", "10"))
+
+# Compare words without their accents when looking for duplicates, so that
+# "résumé" matches "resume". Off by default, as accents tell apart words of
+# many languages ("año", "ano"). Keys of existing words are computed by
+# migration 4d2e8b7c1a90, which has to be run again after a change
+WORD_KEY_STRIP_ACCENTS = (
+    os.environ.get("WORD_KEY_STRIP_ACCENTS", "false").lower() == "true"
+)
+
+# Raise on any lazy relationship load instead of silently emitting extra queries.
+SQL_STRICT_LOADING = os.environ.get("SQL_STRICT_LOADING", "false").lower() == "true"
@@ -2,8 +2,17 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.constants import DATABASE_URL
+from app.utils.metrics import count_queries
+from app.utils.pool_utils import PoolStats, listen_pool_events, pool_options
+from app.utils.query_utils import track_queries
 
-engine = create_engine(DATABASE_URL)
+# Pool of the engine of this process
+pool_stats = {"sync": PoolStats("sync")}
+
+engine = create_engine(DATABASE_URL, **pool_options(DATABASE_URL, pool_stats["sync"]))
+listen_pool_events(engine, pool_stats["sync"])
+count_queries(engine, "sync")
+track_queries(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
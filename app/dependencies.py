@@ -1,12 +1,12 @@
 import uuid
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer
 from fastapi_filter import FilterDepends
 from sqlalchemy.orm import Session
 
-from app import filters_schemas, models
+from app import filters_schemas, models, schemas
 from app.database import get_db
 from app.exceptions import NotFoundError
 from app.services import users
@@ -18,8 +18,15 @@ TokenDep = Annotated[HTTPBearer, Depends(auth_scheme)]
 
 def current_user(token: TokenDep, db: DbSessionDep):
     try:
-        user_id = uuid.UUID(jwt_decode(token.credentials))
-        user = users.get_user_by_id(user_id, db)
+        subject = jwt_decode(token.credentials)
+        if not isinstance(subject, str):
+            # A valid token that is not an access token, e.g. a profiling one
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        user_id = uuid.UUID(subject)
+        user = users.get_cached_user(user_id, db)
     except (ValueError, NotFoundError):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
     return user
@@ -53,6 +60,10 @@ FullAccessDep = Annotated[models.User, Depends(full_access_required)]
 AuthorizedDep = Annotated[models.User, Depends(authorized_required)]
 
 
+PageParamsDep = Annotated[schemas.PageParams, Query()]
+SearchParamsDep = Annotated[schemas.SearchParams, Query()]
+
+
 UserFiltersDep = Annotated[
     filters_schemas.UserFilter, FilterDepends(filters_schemas.UserFilter)
 ]
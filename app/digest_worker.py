@@ -0,0 +1,27 @@
+"""Queue the daily vocabulary digests; the email worker sends them.
+
+Run a single instance:
+
+    python -m app.digest_worker
+"""
+
+import logging
+import signal
+import threading
+
+from app.database import SessionLocal
+from app.services import digests as digest_service
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s"
+    )
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    digest_service.run_digest_scheduler(SessionLocal, stop)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Send the emails queued in the outbox.
+
+Run one or more next to the API:
+
+    python -m app.email_worker
+"""
+
+import logging
+import signal
+import threading
+
+from app.database import SessionLocal
+from app.services import emails as email_service
+from app.utils.email_utils import sender_from_settings
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s"
+    )
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda *_: stop.set())
+    email_service.run_outbox_worker(SessionLocal, sender_from_settings(), stop)
+
+
+if __name__ == "__main__":
+    main()
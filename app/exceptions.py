@@ -8,3 +8,7 @@ class AlreadyExistsError(Exception):
 
 class ForbiddenError(Exception):
     pass
+
+
+class ServiceUnavailableError(Exception):
+    pass
@@ -1,8 +1,35 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
-from app.routers import auth, dictlists, languages, users, words
+from app.routers import (
+    auth,
+    dictlists,
+    duplicates,
+    health,
+    imports,
+    jobs,
+    languages,
+    metrics,
+    profiles,
+    users,
+    words,
+)
+from app.utils.metrics import MetricsMiddleware, mark_process_dead
+from app.utils.profiling_utils import ProfilingMiddleware
+from app.utils.query_utils import QueryStatsMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    mark_process_dead()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(ProfilingMiddleware)
 
 
 app.include_router(auth.router)
@@ -10,3 +37,9 @@ app.include_router(users.router)
 app.include_router(languages.router)
 app.include_router(dictlists.router)
 app.include_router(words.router)
+app.include_router(imports.router)
+app.include_router(jobs.router)
+app.include_router(duplicates.router)
+app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(profiles.router)
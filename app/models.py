@@ -1,21 +1,28 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
-from enum import IntEnum
+from datetime import date, datetime
+from enum import IntEnum, StrEnum
 
 from sqlalchemy import (
+    DDL,
+    CheckConstraint,
     Column,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     MetaData,
     PrimaryKeyConstraint,
     String,
     Table,
+    Text,
+    event,
+    func,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
+from sqlalchemy.ext.orderinglist import ordering_list
 from sqlalchemy.orm import (
     DeclarativeBase,
     Mapped,
@@ -25,8 +32,9 @@ from sqlalchemy.orm import (
     relationship,
 )
 
-from app.utils.auth_utils import pwd_context
 from app.utils.datetime_utils import utc_now
+from app.utils.password_utils import verify_password
+from app.utils.search_utils import word_key
 
 naming_convention = {
     "ix": "ix_%(column_0_label)s",
@@ -44,6 +52,19 @@ class UserRole(IntEnum):
     UnauthorizedUser = 1
 
 
+class JobKind(StrEnum):
+    WordImport = "word_import"
+    DuplicateScan = "duplicate_scan"
+    DuplicateMerge = "duplicate_merge"
+
+
+class JobStatus(StrEnum):
+    Pending = "pending"
+    Running = "running"
+    Done = "done"
+    Failed = "failed"
+
+
 class Base(MappedAsDataclass, DeclarativeBase):
     metadata = MetaData(naming_convention=naming_convention)
 
@@ -69,6 +90,8 @@ dictlist_words = Table(
 
 
 class User(Base):
+    __table_args__ = (Index("ix_user_created_at_id", "created_at", "id"),)
+
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default_factory=uuid.uuid4, init=False
     )
@@ -79,6 +102,8 @@ class User(Base):
         Enum(UserRole, name="role_enum"), default=UserRole.UnauthorizedUser
     )
     created_at: Mapped[datetime] = mapped_column(default_factory=utc_now, init=False)
+    # Day whose digest was last queued for the user, see services.digests
+    last_digest_on: Mapped[date | None] = mapped_column(default=None, init=False)
 
     dict_lists: Mapped[list[DictList]] = relationship(
         "DictList",
@@ -92,10 +117,18 @@ class User(Base):
     )
 
     def verify_password(self, password):
-        return pwd_context.verify(password, self.password)
+        return verify_password(password, self.password)
 
 
 class DictList(Base):
+    __table_args__ = (
+        Index("ix_dictlist_user_id_created_at_id", "user_id", "created_at", "id"),
+        CheckConstraint(
+            "max_words_limit IS NULL OR word_count <= max_words_limit",
+            name="word_count_within_limit",
+        ),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, init=False)
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
@@ -113,6 +146,8 @@ class DictList(Base):
         "Language", back_populates="dict_lists", repr=False
     )
     max_words_limit: Mapped[int | None] = mapped_column(default=200)
+    # Maintained by triggers on dictlist_words, see below
+    word_count: Mapped[int] = mapped_column(default=0, server_default="0", init=False)
     words: Mapped[list[Word]] = relationship(
         "Word",
         secondary=dictlist_words,
@@ -121,21 +156,32 @@ class DictList(Base):
         repr=False,
     )
 
-    def add_words(self, words: list[Word]) -> None:
-        new_words = set(words) - set(self.words)
-
-        if self.max_words_limit is not None:
-            if len(self.words) + len(new_words) > self.max_words_limit:
-                raise ValueError
-        self.words.extend(new_words)
-
-    def remove_words(self, words: list[Word]) -> None:
-        words_to_remove = set(words)
-        for word in words_to_remove:
-            self.words.remove(word)
-
 
 class Word(Base):
+    __table_args__ = (
+        Index("ix_word_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Random picks of a user's words seek to an id of theirs
+        Index("ix_word_user_id_id", "user_id", "id"),
+        Index(
+            "ix_word_user_id_lang_code_normalized_key",
+            "user_id",
+            "lang_code",
+            "normalized_key",
+        ),
+        Index("ix_word_search_vector", "search_vector", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+        # btree_gin puts user_id in the same GIN index, so that a similarity
+        # search only matches the user's words
+        Index(
+            "ix_word_user_id_new_word_trgm",
+            "user_id",
+            "new_word",
+            postgresql_using="gin",
+            postgresql_ops={"new_word": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     id: Mapped[int] = mapped_column(primary_key=True, init=False)
     lang_code: Mapped[str] = mapped_column(ForeignKey("language.code"), init=False)
     user_id: Mapped[uuid.UUID] = mapped_column(
@@ -145,6 +191,9 @@ class Word(Base):
         init=False,
     )
     new_word: Mapped[str] = mapped_column(nullable=False)
+    # word_key(new_word), set on flush below; Core inserts and updates
+    # have to pass it themselves
+    normalized_key: Mapped[str] = mapped_column(nullable=False, init=False, repr=False)
     created_at: Mapped[datetime] = mapped_column(default_factory=utc_now, init=False)
     user: Mapped[User] = relationship("User", back_populates="words", repr=False)
     language: Mapped[Language] = relationship(
@@ -157,31 +206,75 @@ class Word(Base):
     )
     translation: Mapped[str | None] = mapped_column(default=None)
     note: Mapped[str | None] = mapped_column(default=None)
+    # Maintained by triggers on PostgreSQL, see below. SQLite searches the
+    # word_fts table instead and leaves this column empty.
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR().with_variant(Text(), "sqlite"),
+        default=None,
+        init=False,
+        deferred=True,
+        repr=False,
+    )
+    # Contexts and dictlist memberships are removed by ON DELETE CASCADE
     dict_lists: Mapped[list[DictList]] = relationship(
         "DictList",
         secondary=dictlist_words,
         back_populates="words",
         init=False,
         repr=False,
+        passive_deletes=True,
     )
+    # Contexts are kept in the order given, numbered by their position. Merged
+    # duplicates can share a position, the older context comes first then.
     contexts: Mapped[list[WordContext]] = relationship(
         "WordContext",
         back_populates="word",
+        order_by="(WordContext.position, WordContext.id)",
+        collection_class=ordering_list("position"),
         init=False,
         repr=False,
         cascade="all, delete-orphan",
+        passive_deletes=True,
     )
 
     def __hash__(self):
         return id(self)
 
 
+@event.listens_for(Word, "before_insert")
+@event.listens_for(Word, "before_update")
+def _set_normalized_key(mapper, connection, target: Word):
+    target.normalized_key = word_key(target.new_word)
+
+
+# Prefix lookups: lower(...) LIKE 'abc%' is served by text_pattern_ops
+# indexes regardless of the database collation.
+Index(
+    "ix_word_user_id_lang_code_new_word_prefix",
+    Word.user_id,
+    Word.lang_code,
+    func.lower(Word.new_word).label("new_word_lower"),
+    postgresql_ops={"new_word_lower": "text_pattern_ops"},
+)
+Index(
+    "ix_word_user_id_lang_code_translation_prefix",
+    Word.user_id,
+    Word.lang_code,
+    func.lower(Word.translation).label("translation_lower"),
+    postgresql_ops={"translation_lower": "text_pattern_ops"},
+)
+
+
 class WordContext(Base):
+    __table_args__ = (Index("ix_wordcontext_word_id_position", "word_id", "position"),)
+
     id: Mapped[int] = mapped_column(primary_key=True, init=False)
     word_id: Mapped[int] = mapped_column(
         ForeignKey("word.id", ondelete="CASCADE"), init=False
     )
     context: Mapped[str] = mapped_column(nullable=False)
+    # Set by the ordering list of Word.contexts; Core inserts pass it themselves
+    position: Mapped[int] = mapped_column(nullable=False, init=False)
 
     word: Mapped[Word] = relationship(
         "Word", back_populates="contexts", init=False, repr=False
@@ -198,3 +291,313 @@ class Language(Base):
     words: Mapped[list[Word]] = relationship(
         "Word", back_populates="language", init=False, repr=False
     )
+
+
+class Job(Base):
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("user.id", ondelete="CASCADE"), nullable=False
+    )
+    kind: Mapped[JobKind] = mapped_column(Enum(JobKind, name="job_kind_enum"))
+    status: Mapped[JobStatus] = mapped_column(
+        Enum(JobStatus, name="job_status_enum"), default=JobStatus.Pending
+    )
+    dictlist_id: Mapped[int | None] = mapped_column(
+        ForeignKey("dictlist.id", ondelete="SET NULL"), default=None
+    )
+    size_bytes: Mapped[int] = mapped_column(default=0)
+    processed_bytes: Mapped[int] = mapped_column(default=0)
+    processed_rows: Mapped[int] = mapped_column(default=0)
+    imported_rows: Mapped[int] = mapped_column(default=0)
+    failed_rows: Mapped[int] = mapped_column(default=0)
+    created_at: Mapped[datetime] = mapped_column(default_factory=utc_now, init=False)
+    finished_at: Mapped[datetime | None] = mapped_column(default=None)
+
+    @property
+    def progress(self) -> float:
+        if self.status == JobStatus.Done:
+            return 1.0
+        if not self.size_bytes:
+            return 0.0
+        return min(self.processed_bytes / self.size_bytes, 1.0)
+
+
+# Few jobs are pending at any time: the queue depth of GET /metrics counts
+# them from this index instead of scanning every job ever run.
+Index(
+    "ix_job_id_pending",
+    Job.id,
+    postgresql_where=Job.status == JobStatus.Pending,
+    sqlite_where=Job.status == JobStatus.Pending,
+)
+
+
+class JobError(Base):
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    job_id: Mapped[int] = mapped_column(
+        ForeignKey("job.id", ondelete="CASCADE"), index=True
+    )
+    row_number: Mapped[int] = mapped_column(nullable=False)
+    message: Mapped[str] = mapped_column(nullable=False)
+
+
+class DuplicateWord(Base):
+    """A word found by a duplicate scan job, with the word it merges into.
+
+    The keeper of each cluster is its oldest word and has a row of its own.
+    """
+
+    __table_args__ = (
+        Index("ix_duplicateword_job_id_keeper_id", "job_id", "keeper_id"),
+    )
+
+    job_id: Mapped[int] = mapped_column(
+        ForeignKey("job.id", ondelete="CASCADE"), primary_key=True
+    )
+    word_id: Mapped[int] = mapped_column(primary_key=True)
+    keeper_id: Mapped[int] = mapped_column(nullable=False)
+
+
+class EmailOutbox(Base):
+    """An email waiting for the outbox worker.
+
+    Rows are written in the transaction of the change they announce and
+    deleted once sent. A row whose next_attempt_at is NULL ran out of
+    attempts and is kept, with its last error, for inspection.
+    """
+
+    __table_args__ = (Index("ix_emailoutbox_next_attempt_at", "next_attempt_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True, init=False)
+    recipient: Mapped[str] = mapped_column(nullable=False)
+    subject: Mapped[str] = mapped_column(nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(default_factory=utc_now, init=False)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(
+        default_factory=utc_now, init=False
+    )
+    attempts: Mapped[int] = mapped_column(default=0, init=False)
+    last_error: Mapped[str | None] = mapped_column(default=None, init=False)
+
+
+# dictlist.word_count is kept in sync by triggers, so every write to
+# dictlist_words updates it in the same transaction, and the check constraint
+# rejects writes that would go over max_words_limit.
+WORD_COUNT_SQLITE_DDL = (
+    """
+    CREATE TRIGGER dictlist_words_count_insert AFTER INSERT ON dictlist_words
+    BEGIN
+        UPDATE dictlist SET word_count = word_count + 1 WHERE id = NEW.dictlist_id;
+    END
+    """,
+    """
+    CREATE TRIGGER dictlist_words_count_delete AFTER DELETE ON dictlist_words
+    BEGIN
+        UPDATE dictlist SET word_count = word_count - 1 WHERE id = OLD.dictlist_id;
+    END
+    """,
+)
+
+# PostgreSQL uses statement-level triggers, so a multi-row insert or delete
+# updates each affected dictlist once.
+WORD_COUNT_POSTGRESQL_DDL = (
+    """
+    CREATE FUNCTION dictlist_words_count_insert() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE dictlist SET word_count = dictlist.word_count + changed.n
+        FROM (
+            SELECT dictlist_id, count(*) AS n FROM new_rows GROUP BY dictlist_id
+        ) AS changed
+        WHERE dictlist.id = changed.dictlist_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE FUNCTION dictlist_words_count_delete() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE dictlist SET word_count = dictlist.word_count - changed.n
+        FROM (
+            SELECT dictlist_id, count(*) AS n FROM old_rows GROUP BY dictlist_id
+        ) AS changed
+        WHERE dictlist.id = changed.dictlist_id;
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER dictlist_words_count_insert AFTER INSERT ON dictlist_words
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dictlist_words_count_insert()
+    """,
+    """
+    CREATE TRIGGER dictlist_words_count_delete AFTER DELETE ON dictlist_words
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dictlist_words_count_delete()
+    """,
+)
+
+for statement in WORD_COUNT_SQLITE_DDL:
+    event.listen(
+        dictlist_words, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in WORD_COUNT_POSTGRESQL_DDL:
+    event.listen(
+        dictlist_words, "after_create", DDL(statement).execute_if(dialect="postgresql")
+    )
+event.listen(
+    dictlist_words,
+    "after_drop",
+    DDL(
+        "DROP FUNCTION IF EXISTS dictlist_words_count_insert(), "
+        "dictlist_words_count_delete()"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+# Re-indexes one word, with its contexts joined by newlines
+_WORD_FTS_REFRESH = """
+        DELETE FROM word_fts WHERE rowid = {word_id};
+        INSERT INTO word_fts (rowid, new_word, translation, note, contexts)
+        SELECT id, new_word, translation, note, (
+            SELECT group_concat(context, char(10)) FROM wordcontext
+            WHERE word_id = word.id
+        )
+        FROM word WHERE id = {word_id};
+"""
+
+WORD_SEARCH_SQLITE_DDL = (
+    """
+    CREATE VIRTUAL TABLE word_fts USING fts5(new_word, translation, note, contexts)
+    """,
+    f"""
+    CREATE TRIGGER word_fts_insert AFTER INSERT ON word
+    BEGIN {_WORD_FTS_REFRESH.format(word_id="NEW.id")} END
+    """,
+    f"""
+    CREATE TRIGGER word_fts_update
+    AFTER UPDATE OF new_word, translation, note ON word
+    BEGIN {_WORD_FTS_REFRESH.format(word_id="NEW.id")} END
+    """,
+    """
+    CREATE TRIGGER word_fts_delete AFTER DELETE ON word
+    BEGIN
+        DELETE FROM word_fts WHERE rowid = OLD.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER wordcontext_fts_insert AFTER INSERT ON wordcontext
+    BEGIN {_WORD_FTS_REFRESH.format(word_id="NEW.word_id")} END
+    """,
+    f"""
+    CREATE TRIGGER wordcontext_fts_update
+    AFTER UPDATE OF word_id, context ON wordcontext
+    BEGIN {_WORD_FTS_REFRESH.format(word_id="NEW.word_id")} END
+    """,
+    f"""
+    CREATE TRIGGER wordcontext_fts_delete AFTER DELETE ON wordcontext
+    BEGIN {_WORD_FTS_REFRESH.format(word_id="OLD.word_id")} END
+    """,
+)
+
+# The document is weighted word > translation > note > contexts. Context
+# changes refresh each affected word once per statement.
+WORD_SEARCH_POSTGRESQL_DDL = (
+    """
+    CREATE FUNCTION word_search_document(
+        word_id integer, new_word text, translation text, note text
+    ) RETURNS tsvector
+    LANGUAGE sql STABLE AS $$
+        SELECT setweight(to_tsvector('simple', coalesce(new_word, '')), 'A')
+            || setweight(to_tsvector('simple', coalesce(translation, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(note, '')), 'C')
+            || setweight(to_tsvector('simple', coalesce((
+                SELECT string_agg(context, ' ') FROM wordcontext
+                WHERE wordcontext.word_id = word_search_document.word_id
+            ), '')), 'D')
+    $$
+    """,
+    """
+    CREATE FUNCTION word_search_vector_refresh() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        NEW.search_vector := word_search_document(
+            NEW.id, NEW.new_word, NEW.translation, NEW.note
+        );
+        RETURN NEW;
+    END
+    $$
+    """,
+    """
+    CREATE FUNCTION wordcontext_search_vector_refresh() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        UPDATE word SET search_vector = word_search_document(
+            word.id, word.new_word, word.translation, word.note
+        )
+        WHERE word.id IN (SELECT word_id FROM changed_rows);
+        RETURN NULL;
+    END
+    $$
+    """,
+    """
+    CREATE TRIGGER word_search_vector
+    BEFORE INSERT OR UPDATE OF new_word, translation, note ON word
+    FOR EACH ROW EXECUTE FUNCTION word_search_vector_refresh()
+    """,
+    """
+    CREATE TRIGGER wordcontext_search_vector_insert AFTER INSERT ON wordcontext
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION wordcontext_search_vector_refresh()
+    """,
+    """
+    CREATE TRIGGER wordcontext_search_vector_update AFTER UPDATE ON wordcontext
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION wordcontext_search_vector_refresh()
+    """,
+    """
+    CREATE TRIGGER wordcontext_search_vector_delete AFTER DELETE ON wordcontext
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION wordcontext_search_vector_refresh()
+    """,
+)
+
+# The trigram index of word needs both, btree_gin for its user_id column
+for extension in ("pg_trgm", "btree_gin"):
+    event.listen(
+        Word.__table__,
+        "before_create",
+        DDL(f"CREATE EXTENSION IF NOT EXISTS {extension}").execute_if(
+            dialect="postgresql"
+        ),
+    )
+
+# Both sets read wordcontext, so they are created with it
+for statement in WORD_SEARCH_SQLITE_DDL:
+    event.listen(
+        WordContext.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+for statement in WORD_SEARCH_POSTGRESQL_DDL:
+    event.listen(
+        WordContext.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+event.listen(
+    WordContext.__table__,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS word_fts").execute_if(dialect="sqlite"),
+)
+event.listen(
+    WordContext.__table__,
+    "after_drop",
+    DDL(
+        "DROP FUNCTION IF EXISTS wordcontext_search_vector_refresh(), "
+        "word_search_vector_refresh(), "
+        "word_search_document(integer, text, text, text) CASCADE"
+    ).execute_if(dialect="postgresql"),
+)
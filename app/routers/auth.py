@@ -3,7 +3,7 @@ from fastapi import APIRouter, HTTPException, status
 from app import models, schemas
 from app.constants import ACCESS_TOKEN_EXPIRE_MINUTES
 from app.dependencies import DbSessionDep
-from app.exceptions import NotFoundError
+from app.exceptions import NotFoundError, ServiceUnavailableError
 from app.services import users as user_service
 from app.utils.auth_utils import create_access_token, jwt_decode
 
@@ -22,7 +22,13 @@ def login(
             status_code=status.HTTP_404_NOT_FOUND,
         ) from None
 
-    if not user.verify_password(form_data.password):
+    try:
+        verified = user.verify_password(form_data.password)
+    except ServiceUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        ) from None
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
         )
@@ -37,6 +43,9 @@ def email_verify(token: str, db: DbSessionDep) -> None:
         email = jwt_decode(token)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+    # Tokens without a subject, such as profiling tokens, decode to their claims
+    if not isinstance(email, str):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
 
     try:
         user = user_service.get_user_by_email(email, db)
@@ -54,6 +63,8 @@ def email_change_verify(token: str, db: DbSessionDep) -> None:
         token_data = jwt_decode(token)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+    if not isinstance(token_data, dict) or "new_email" not in token_data:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
 
     try:
         user = user_service.get_user_by_id(token_data["user_id"], db)
@@ -1,11 +1,22 @@
+import shutil
+import tempfile
+from pathlib import Path
+
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 
 from app import models, schemas
-from app.dependencies import CurrentUserDep, DbSessionDep, DictlistFiltersDep
+from app.dependencies import (
+    CurrentUserDep,
+    DbSessionDep,
+    DictlistFiltersDep,
+    PageParamsDep,
+)
 from app.exceptions import ForbiddenError, NotFoundError
+from app.services import anki as anki_service
 from app.services import dictlists as dictlist_service
 from app.services import languages as lang_service
-from app.services import words as word_service
 
 router = APIRouter(prefix="/dictlists", tags=["dictlists"])
 
@@ -29,13 +40,22 @@ def create_dictlist(
 
 @router.get(
     "/",
-    response_model=list[schemas.DictListResponse],
+    response_model=schemas.Page[schemas.DictListResponse],
     status_code=status.HTTP_200_OK,
 )
 def get_all_dictlists(
-    filters: DictlistFiltersDep, db: DbSessionDep, current_user: CurrentUserDep
-) -> list[models.DictList]:
-    return dictlist_service.get_all_dictlists_with_filters(filters, current_user.id, db)
+    filters: DictlistFiltersDep,
+    page: PageParamsDep,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+) -> dict:
+    try:
+        dictlists, next_cursor = dictlist_service.get_all_dictlists_with_filters(
+            filters, page, current_user.id, db
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+    return {"items": dictlists, "next_cursor": next_cursor}
 
 
 @router.get(
@@ -47,7 +67,7 @@ def get_user_dictlist_by_id(
     dictlist_id: int, db: DbSessionDep, current_user: CurrentUserDep
 ) -> models.DictList:
     try:
-        dictlist = dictlist_service.get_dictlist_by_id(dictlist_id, db)
+        dictlist = dictlist_service.get_dictlist_by_id(dictlist_id, db, eager=True)
         if dictlist.user_id != current_user.id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN) from None
     except NotFoundError:
@@ -123,13 +143,9 @@ def assign_word_to_dictlist(
         dictlist = dictlist_service.get_own_dictlist_by_id(
             dictlist_id, current_user.id, db
         )
-        words = [
-            word_service.get_own_word_by_id(word_id, current_user.id, db)
-            for word_id in words_body.word_ids
-        ]
-
-        dictlist.add_words(words)
-        db.commit()
+        dictlist_service.assign_words(
+            dictlist, words_body.word_ids, current_user.id, db
+        )
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -155,13 +171,9 @@ def unassign_words_from_dictlist(
         dictlist = dictlist_service.get_own_dictlist_by_id(
             dictlist_id, current_user.id, db
         )
-        words = [
-            word_service.get_own_word_by_id(word_id, current_user.id, db)
-            for word_id in words_body.word_ids
-        ]
-
-        dictlist.remove_words(words)
-        db.commit()
+        dictlist_service.unassign_words(
+            dictlist, words_body.word_ids, current_user.id, db
+        )
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -174,3 +186,32 @@ def unassign_words_from_dictlist(
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
         ) from None
+
+
+@router.get("/{dictlist_id}/export/anki", response_class=FileResponse)
+def export_dictlist_to_anki(
+    dictlist_id: int, db: DbSessionDep, current_user: CurrentUserDep
+) -> FileResponse:
+    try:
+        dictlist = dictlist_service.get_own_dictlist_by_id(
+            dictlist_id, current_user.id, db
+        )
+    except ForbiddenError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN) from None
+    except NotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND) from None
+
+    # The package is built on disk in one pass and removed once it is sent.
+    workdir = Path(tempfile.mkdtemp())
+    package_path = workdir / "deck.apkg"
+    try:
+        anki_service.export_package(dictlist, package_path, workdir, db)
+    except Exception:
+        shutil.rmtree(workdir, ignore_errors=True)
+        raise
+    return FileResponse(
+        package_path,
+        media_type="application/octet-stream",
+        filename=f"dictlist-{dictlist.id}.apkg",
+        background=BackgroundTask(shutil.rmtree, workdir, ignore_errors=True),
+    )
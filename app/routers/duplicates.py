@@ -0,0 +1,73 @@
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from sqlalchemy.orm import sessionmaker
+
+from app import models, schemas
+from app.dependencies import CurrentUserDep, DbSessionDep, PageParamsDep
+from app.routers.jobs import get_own_job
+from app.services import duplicates as duplicate_service
+from app.services import jobs as job_service
+
+router = APIRouter(prefix="/duplicates", tags=["duplicates"])
+
+
+def get_own_scan(job_id: int, current_user: models.User, db) -> models.Job:
+    job = get_own_job(job_id, current_user, db)
+    if job.kind != models.JobKind.DuplicateScan:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return job
+
+
+@router.post(
+    "/scans", response_model=schemas.JobResponse, status_code=status.HTTP_202_ACCEPTED
+)
+def start_duplicate_scan(
+    background_tasks: BackgroundTasks, db: DbSessionDep, current_user: CurrentUserDep
+) -> models.Job:
+    job = job_service.create_job(models.JobKind.DuplicateScan, current_user.id, db)
+    background_tasks.add_task(
+        duplicate_service.run_duplicate_scan,
+        job.id,
+        sessionmaker(bind=db.get_bind()),
+    )
+    return job
+
+
+@router.get(
+    "/scans/{job_id}/clusters",
+    response_model=schemas.Page[schemas.DuplicateCluster],
+    status_code=status.HTTP_200_OK,
+)
+def get_duplicate_clusters(
+    job_id: int, page: PageParamsDep, db: DbSessionDep, current_user: CurrentUserDep
+) -> dict:
+    job = get_own_scan(job_id, current_user, db)
+    try:
+        clusters, next_cursor = duplicate_service.get_clusters(job, page, db)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+    return {"items": clusters, "next_cursor": next_cursor}
+
+
+@router.post(
+    "/scans/{job_id}/merge",
+    response_model=schemas.JobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def merge_duplicates(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+) -> models.Job:
+    scan = get_own_scan(job_id, current_user, db)
+    if scan.status != models.JobStatus.Done:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+
+    job = job_service.create_job(models.JobKind.DuplicateMerge, current_user.id, db)
+    background_tasks.add_task(
+        duplicate_service.run_duplicate_merge,
+        job.id,
+        scan.id,
+        sessionmaker(bind=db.get_bind()),
+    )
+    return job
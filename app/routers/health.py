@@ -0,0 +1,51 @@
+import logging
+import time
+
+from fastapi import APIRouter, Response, status
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from app import database, schemas
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+def ping() -> float:
+    started = time.perf_counter()
+    with database.engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    return time.perf_counter() - started
+
+
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def ready(response: Response) -> schemas.ReadinessResponse:
+    """Whether the database answers and a connection is free for requests.
+
+    The round trip is only measured when the pool has a connection to spare,
+    so that probes never queue with real traffic for a saturated pool.
+    """
+    pools = {
+        name: stats
+        for name, stats in database.pool_stats.items()
+        if stats.pool is not None
+    }
+    readiness = schemas.ReadinessResponse(
+        status="ready",
+        pools={name: stats.snapshot() for name, stats in pools.items()},
+    )
+    if any(stats.saturation >= 1 for stats in pools.values()):
+        readiness.status = "saturated"
+    else:
+        try:
+            latency = await run_in_threadpool(ping)
+        except Exception as err:
+            logger.warning("Database ping failed: %s", err)
+            readiness.status = "unavailable"
+        else:
+            readiness.db_latency_ms = latency * 1000
+
+    if readiness.status != "ready":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
@@ -0,0 +1,107 @@
+import tempfile
+from pathlib import Path
+from typing import Literal
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, UploadFile, status
+from sqlalchemy.orm import sessionmaker
+
+from app import constants, models, schemas
+from app.dependencies import CurrentUserDep, DbSessionDep
+from app.exceptions import ForbiddenError, NotFoundError
+from app.services import anki as anki_service
+from app.services import dictlists as dictlist_service
+from app.services import imports as import_service
+from app.services import jobs as job_service
+
+router = APIRouter(prefix="/imports", tags=["imports"])
+
+DELIMITERS = {"csv": ",", "tsv": "\t"}
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _save_upload(file: UploadFile, target) -> None:
+    """Copy an upload chunk by chunk, refusing it once over IMPORT_MAX_BYTES."""
+    size = 0
+    while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > constants.IMPORT_MAX_BYTES:
+            raise HTTPException(status_code=status.HTTP_413_CONTENT_TOO_LARGE)
+        target.write(chunk)
+
+
+@router.post(
+    "/words", response_model=schemas.JobResponse, status_code=status.HTTP_202_ACCEPTED
+)
+def import_words(
+    file: UploadFile,
+    background_tasks: BackgroundTasks,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+    file_format: Literal["csv", "tsv"] | None = None,
+    dictlist_id: int | None = None,
+) -> models.Job:
+    if dictlist_id is not None:
+        try:
+            dictlist_service.get_own_dictlist_by_id(dictlist_id, current_user.id, db)
+        except ForbiddenError:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN) from None
+        except NotFoundError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND) from None
+
+    if file_format is None:
+        is_tsv = (file.filename or "").lower().endswith(".tsv")
+        file_format = "tsv" if is_tsv else "csv"
+
+    # The upload is spooled to disk chunk by chunk, so the background task can
+    # stream it after the request is finished.
+    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{file_format}") as tmp:
+        path = Path(tmp.name)
+        try:
+            _save_upload(file, tmp)
+        except HTTPException:
+            path.unlink()
+            raise
+
+    job = job_service.create_job(
+        models.JobKind.WordImport,
+        current_user.id,
+        db,
+        dictlist_id=dictlist_id,
+        size_bytes=path.stat().st_size,
+    )
+    background_tasks.add_task(
+        import_service.run_word_import,
+        job.id,
+        path,
+        DELIMITERS[file_format],
+        sessionmaker(bind=db.get_bind()),
+    )
+    return job
+
+
+@router.post(
+    "/anki",
+    response_model=schemas.AnkiImportResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def import_anki_deck(
+    file: UploadFile,
+    lang_code: str,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+    deck: str | None = None,
+) -> dict:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        workdir = Path(tmpdir)
+        package_path = workdir / "upload.apkg"
+        with package_path.open("wb") as tmp:
+            _save_upload(file, tmp)
+        try:
+            dictlist, imported, skipped = anki_service.import_package(
+                package_path, workdir, lang_code, current_user, db, deck=deck
+            )
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+        except NotFoundError:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND) from None
+    return {"dictlist": dictlist, "imported": imported, "skipped": skipped}
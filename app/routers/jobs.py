@@ -0,0 +1,55 @@
+import csv
+import io
+
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from app import models, schemas
+from app.dependencies import CurrentUserDep, DbSessionDep
+from app.exceptions import ForbiddenError, NotFoundError
+from app.services import jobs as job_service
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def get_own_job(job_id: int, current_user: models.User, db) -> models.Job:
+    try:
+        return job_service.get_own_job_by_id(job_id, current_user.id, db)
+    except ForbiddenError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN) from None
+    except NotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND) from None
+
+
+@router.get(
+    "/{job_id}", response_model=schemas.JobResponse, status_code=status.HTTP_200_OK
+)
+def get_job(job_id: int, db: DbSessionDep, current_user: CurrentUserDep) -> models.Job:
+    return get_own_job(job_id, current_user, db)
+
+
+@router.get("/{job_id}/errors", status_code=status.HTTP_200_OK)
+def download_job_errors(
+    job_id: int, db: DbSessionDep, current_user: CurrentUserDep
+) -> StreamingResponse:
+    job = get_own_job(job_id, current_user, db)
+
+    def generate_report():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(("row", "error"))
+        for row in job_service.iter_job_errors(job.id, db):
+            writer.writerow(row)
+            if buffer.tell() >= 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    return StreamingResponse(
+        generate_report(),
+        media_type="text/csv",
+        headers={
+            "Content-Disposition": f'attachment; filename="job-{job.id}-errors.csv"'
+        },
+    )
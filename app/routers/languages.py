@@ -42,7 +42,7 @@ def delete_language(
 @router.get(
     "/", response_model=list[schemas.LanguageSchema], status_code=status.HTTP_200_OK
 )
-def get_all_languages(db: DbSessionDep) -> list[models.Language]:
+def get_all_languages(db: DbSessionDep) -> list[schemas.LanguageSchema]:
     return lang_service.get_all_languages(db)
 
 
@@ -67,13 +67,11 @@ def update_lang_name(
     db: DbSessionDep,
 ) -> None:
     try:
-        lang = lang_service.get_language_by_code(lang_code, db)
-        if lang.name == body.name:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-            )
-        lang.name = body.name
-        db.commit()
+        lang_service.update_language_name(lang_code, body.name, db)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+        ) from None
     except NotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response, status
+
+from app.dependencies import DbSessionDep
+from app.services import emails as email_service
+from app.services import jobs as job_service
+from app.utils import metrics
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", status_code=status.HTTP_200_OK, include_in_schema=False)
+def get_metrics(db: DbSessionDep) -> Response:
+    """The metrics of this worker, or of all of them in multiprocess mode.
+
+    The queue depths are counted on each scrape, from indexes of the rows
+    still waiting.
+    """
+    metrics.QUEUE_DEPTH.labels("jobs").set(job_service.get_pending_job_count(db))
+    metrics.QUEUE_DEPTH.labels("email_outbox").set(email_service.get_outbox_depth(db))
+    content, media_type = metrics.render_metrics()
+    return Response(content, media_type=media_type)
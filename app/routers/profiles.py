@@ -0,0 +1,39 @@
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Path, status
+from fastapi.responses import FileResponse
+
+from app import schemas
+from app.constants import PROFILE_TOKEN_EXPIRE_MINUTES
+from app.dependencies import AdminRoleDep
+from app.utils import profiling_utils
+
+router = APIRouter(prefix="/profiles", tags=["profiles"])
+
+
+@router.post("/token", status_code=status.HTTP_201_CREATED)
+def create_profile_token(
+    current_user: AdminRoleDep,
+) -> schemas.ProfileTokenResponse:
+    """A token that profiles the requests sending it in the X-Profile header."""
+    return schemas.ProfileTokenResponse(
+        token=profiling_utils.create_profile_token(current_user.id),
+        expires_in_minutes=PROFILE_TOKEN_EXPIRE_MINUTES,
+    )
+
+
+@router.get("/{profile_id}", status_code=status.HTTP_200_OK)
+def download_profile(
+    profile_id: Annotated[str, Path(pattern="^[0-9a-f]{32}$")],
+    current_user: AdminRoleDep,
+) -> FileResponse:
+    """The speedscope file of a profiled request.
+
+    Profiles are stored on the replica that handled the request, in its
+    PROFILE_DIR: with several replicas the download has to be routed to that
+    one, or it is a 404.
+    """
+    path = profiling_utils.profile_path(profile_id)
+    if not path.is_file():
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return FileResponse(path, media_type="application/json", filename=path.name)
@@ -1,14 +1,24 @@
+from typing import Literal
 from uuid import UUID
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 
 from app import models, schemas
 from app.constants import VERIFY_TOKEN_EXPIRE_MINUTES
-from app.dependencies import AdminRoleDep, CurrentUserDep, DbSessionDep, UserFiltersDep
-from app.exceptions import AlreadyExistsError, NotFoundError
+from app.dependencies import (
+    AdminRoleDep,
+    CurrentUserDep,
+    DbSessionDep,
+    PageParamsDep,
+    UserFiltersDep,
+)
+from app.exceptions import AlreadyExistsError, NotFoundError, ServiceUnavailableError
+from app.services import emails as email_service
+from app.services import exports as export_service
 from app.services import users as user_service
-from app.utils.auth_utils import create_access_token, pwd_context
-from app.utils.email_utils import send_verification_email
+from app.utils.auth_utils import create_access_token
+from app.utils.password_utils import hash_password
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -18,12 +28,11 @@ router = APIRouter(prefix="/users", tags=["users"])
 )
 def create_user(
     user: schemas.UserCreate,
-    background_tasks: BackgroundTasks,
     request: Request,
     db: DbSessionDep,
 ) -> models.User:
     try:
-        user = user_service.create_user(user, db)
+        user = user_service.create_user(user, db, verify_base_url=str(request.base_url))
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -32,15 +41,10 @@ def create_user(
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
         ) from None
-
-    verify_token = create_access_token({"sub": user.email}, VERIFY_TOKEN_EXPIRE_MINUTES)
-    background_tasks.add_task(
-        send_verification_email,
-        request=request,
-        email=user.email,
-        token=verify_token,
-        action="email_verify",
-    )
+    except ServiceUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        ) from None
     return user
 
 
@@ -63,15 +67,19 @@ def update_username(
             status_code=status.HTTP_409_CONFLICT,
         )
     except NotFoundError:
-        current_user.username = body.username
-        db.commit()
+        pass
+
+    current_user.username = body.username
+    try:
+        user_service.commit_user_change(current_user, db)
+    except NotFoundError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
 
 
 @router.patch("/me/change_email", status_code=status.HTTP_202_ACCEPTED)
 def update_email(
     body: schemas.UserUpdateEmail,
     request: Request,
-    background_tasks: BackgroundTasks,
     current_user: CurrentUserDep,
     db: DbSessionDep,
 ) -> None:
@@ -92,13 +100,14 @@ def update_email(
 
     token_data = {"new_email": body.email, "user_id": str(current_user.id)}
     verify_token = create_access_token(token_data, VERIFY_TOKEN_EXPIRE_MINUTES)
-    background_tasks.add_task(
-        send_verification_email,
-        request=request,
-        email=current_user.email,
-        token=verify_token,
-        action="email_change_verify",
+    email_service.queue_verification_email(
+        current_user.email,
+        verify_token,
+        "email_change_verify",
+        str(request.base_url),
+        db,
     )
+    db.commit()
 
 
 @router.patch("/me/change_password", status_code=status.HTTP_200_OK)
@@ -107,10 +116,40 @@ def update_password(
     current_user: CurrentUserDep,
     db: DbSessionDep,
 ) -> None:
-    if not current_user.verify_password(body.old_password.get_secret_value()):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
-    current_user.password = pwd_context.hash(body.new_password.get_secret_value())
-    db.commit()
+    try:
+        if not current_user.verify_password(body.old_password.get_secret_value()):
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST)
+        current_user.password = hash_password(body.new_password.get_secret_value())
+    except ServiceUnavailableError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        ) from None
+    try:
+        user_service.commit_user_change(current_user, db)
+    except NotFoundError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+
+
+@router.get("/me/export", status_code=status.HTTP_200_OK)
+def export_current_user_data(
+    current_user: CurrentUserDep,
+    db: DbSessionDep,
+    export_format: Literal["ndjson", "csv"] = "ndjson",
+) -> StreamingResponse:
+    if export_format == "ndjson":
+        content = export_service.export_ndjson(current_user.id, db)
+        media_type = "application/x-ndjson"
+        filename = "vocabulary.ndjson"
+    else:
+        content = export_service.export_zipped_csv(current_user.id, db)
+        media_type = "application/zip"
+        filename = "vocabulary.zip"
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
@@ -119,12 +158,21 @@ def delete_current_user(current_user: CurrentUserDep, db: DbSessionDep) -> None:
 
 
 @router.get(
-    "/", response_model=list[schemas.UserResponse], status_code=status.HTTP_200_OK
+    "/",
+    response_model=schemas.Page[schemas.UserResponse],
+    status_code=status.HTTP_200_OK,
 )
 def get_all_users(
-    filters: UserFiltersDep, db: DbSessionDep, current_user: AdminRoleDep
-) -> list[models.User]:
-    return user_service.get_all_users(filters, db)
+    filters: UserFiltersDep,
+    page: PageParamsDep,
+    db: DbSessionDep,
+    current_user: AdminRoleDep,
+) -> dict:
+    try:
+        users, next_cursor = user_service.get_all_users(filters, page, db)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+    return {"items": users, "next_cursor": next_cursor}
 
 
 @router.get(
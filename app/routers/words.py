@@ -1,8 +1,16 @@
-from fastapi import APIRouter, HTTPException, status
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, status
 
 from app import models, schemas
-from app.dependencies import CurrentUserDep, DbSessionDep, WordFiltersDep
-from app.exceptions import NotFoundError
+from app.dependencies import (
+    CurrentUserDep,
+    DbSessionDep,
+    PageParamsDep,
+    SearchParamsDep,
+    WordFiltersDep,
+)
+from app.exceptions import AlreadyExistsError, ForbiddenError, NotFoundError
 from app.services import languages as lang_service
 from app.services import words as word_service
 
@@ -10,20 +18,152 @@ router = APIRouter(prefix="/words", tags=["words"])
 
 
 @router.post(
-    "/", response_model=schemas.WordResponse, status_code=status.HTTP_201_CREATED
+    "/",
+    response_model=schemas.WordCreateResponse,
+    status_code=status.HTTP_201_CREATED,
 )
 def create_word(
     word: schemas.WordCreate,
     db: DbSessionDep,
     current_user: CurrentUserDep,
-) -> models.Word:
+    check_similar: bool = False,
+    reject_duplicates: bool = False,
+) -> schemas.WordCreateResponse:
+    similar_words = []
+    if check_similar:
+        similar_words = word_service.find_similar_words(
+            word.new_word, current_user.id, db
+        )
     try:
-        word = word_service.create_word(word, current_user, db)
+        word = word_service.create_word(
+            word, current_user, db, reject_duplicates=reject_duplicates
+        )
     except (ValueError, NotFoundError):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
         ) from None
-    return word
+    except AlreadyExistsError:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT) from None
+    response = schemas.WordCreateResponse.model_validate(word)
+    response.similar_words = similar_words
+    return response
+
+
+@router.post(
+    "/bulk",
+    response_model=schemas.WordBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+)
+def create_words_bulk(
+    body: schemas.WordBulkCreate,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+) -> dict:
+    results = word_service.create_words_bulk(body.words, current_user.id, db)
+    created = sum(result.id is not None for result in results)
+    return {"created": created, "results": results}
+
+
+@router.patch(
+    "/bulk",
+    response_model=schemas.WordBulkUpdateResponse,
+    status_code=status.HTTP_200_OK,
+)
+def update_words_bulk(
+    body: schemas.WordBulkUpdate,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+) -> dict:
+    try:
+        updated = word_service.update_words_bulk(
+            body.word_ids, body.changes, current_user.id, db
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+    except ForbiddenError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN) from None
+    except NotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND) from None
+    return {"updated": updated}
+
+
+@router.delete("/bulk", status_code=status.HTTP_204_NO_CONTENT)
+def delete_words_bulk(
+    body: schemas.WordBulkDelete,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+) -> None:
+    try:
+        word_service.delete_words_bulk(body.word_ids, current_user.id, db)
+    except ForbiddenError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN) from None
+    except NotFoundError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND) from None
+
+
+@router.get(
+    "/lookup",
+    response_model=list[schemas.WordResponse],
+    status_code=status.HTTP_200_OK,
+)
+def lookup_words(
+    new_word: Annotated[str, Query(min_length=1)],
+    lang_code: str,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+) -> list[models.Word]:
+    return word_service.lookup_words(new_word, lang_code, current_user.id, db)
+
+
+@router.get(
+    "/autocomplete",
+    response_model=list[schemas.WordAutocompleteItem],
+    status_code=status.HTTP_200_OK,
+)
+def autocomplete_words(
+    prefix: Annotated[str, Query(min_length=1, max_length=100)],
+    lang_code: str,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> list[schemas.WordAutocompleteItem]:
+    return word_service.autocomplete_words(
+        prefix, lang_code, current_user.id, db, limit=limit
+    )
+
+
+@router.get(
+    "/similar",
+    response_model=list[schemas.SimilarWord],
+    status_code=status.HTTP_200_OK,
+)
+def get_similar_words(
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> list[schemas.SimilarWord]:
+    return word_service.find_similar_words(q, current_user.id, db, limit=limit)
+
+
+@router.get(
+    "/search",
+    response_model=schemas.Page[schemas.WordSearchResult],
+    status_code=status.HTTP_200_OK,
+)
+def search_words(
+    params: SearchParamsDep,
+    filters: WordFiltersDep,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+) -> dict:
+    try:
+        results, next_cursor = word_service.search_words(
+            params.q, filters, params, current_user.id, db
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+    return {"items": results, "next_cursor": next_cursor}
 
 
 @router.get(
@@ -35,7 +175,7 @@ def get_user_word_by_id(
     word_id: int, db: DbSessionDep, current_user: CurrentUserDep
 ) -> models.Word:
     try:
-        word = word_service.get_word_by_id(word_id, db)
+        word = word_service.get_word_by_id(word_id, db, eager=True)
         if word.user_id != current_user.id:
             raise HTTPException(status_code=status.HTTP_403_FORBIDDEN) from None
     except NotFoundError:
@@ -45,13 +185,22 @@ def get_user_word_by_id(
 
 @router.get(
     "/",
-    response_model=list[schemas.WordResponse],
+    response_model=schemas.Page[schemas.WordResponse],
     status_code=status.HTTP_200_OK,
 )
 def get_all_words(
-    filters: WordFiltersDep, db: DbSessionDep, current_user: CurrentUserDep
-) -> list[models.Word]:
-    return word_service.get_all_words_with_filters(filters, current_user.id, db)
+    filters: WordFiltersDep,
+    page: PageParamsDep,
+    db: DbSessionDep,
+    current_user: CurrentUserDep,
+) -> dict:
+    try:
+        words, next_cursor = word_service.get_all_words_with_filters(
+            filters, page, current_user.id, db
+        )
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST) from None
+    return {"items": words, "next_cursor": next_cursor}
 
 
 @router.delete("/{word_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -75,6 +224,7 @@ def update_word(
     body: schemas.WordUpdate,
     db: DbSessionDep,
     current_user: CurrentUserDep,
+    reject_duplicates: bool = False,
 ) -> models.Word:
     try:
         word = word_service.get_word_by_id(word_id, db)
@@ -84,6 +234,15 @@ def update_word(
             )
         update_data = body.model_dump(exclude_unset=True)
 
+        if reject_duplicates and word_service.find_duplicate_word(
+            update_data.get("new_word") or word.new_word,
+            update_data.get("lang_code") or word.lang_code,
+            current_user.id,
+            db,
+            exclude_id=word.id,
+        ):
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT)
+
         if "new_word" in update_data:
             if update_data["new_word"] is None:
                 raise HTTPException(
@@ -110,10 +269,13 @@ def update_word(
 
         if "contexts" in update_data:
             if update_data["contexts"] is not None:
-                word.contexts_list = update_data["contexts"]
+                word_service.sync_word_contexts(word, update_data["contexts"], db)
 
         db.commit()
         db.refresh(word)
+        word_service.update_similarity_index(
+            current_user.id, added=[(word.id, word.new_word)]
+        )
     except NotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Generic, Literal, TypeVar
 from uuid import UUID
 
 from pydantic import (
@@ -13,7 +13,23 @@ from pydantic import (
 )
 
 from app import models
-from app.models import UserRole
+from app.models import JobKind, JobStatus, UserRole
+
+T = TypeVar("T")
+
+
+class PageParams(BaseModel):
+    cursor: str | None = None
+    limit: Annotated[int, Field(ge=1, le=200)] = 50
+
+
+class SearchParams(PageParams):
+    q: Annotated[str, Field(min_length=1, max_length=200)]
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
 
 
 class TokenResponse(BaseModel):
@@ -94,6 +110,13 @@ class DictListResponse(BaseModel):
     name: DictListName
     created_at: datetime
     max_words_limit: PositiveInt | None = None
+    word_count: int = 0
+
+
+class AnkiImportResponse(BaseModel):
+    dictlist: DictListResponse
+    imported: int
+    skipped: int
 
 
 class DictListUpdate(BaseModel):
@@ -120,6 +143,43 @@ class WordCreate(BaseModel):
         return [v.strip() for v in values if v.strip()]
 
 
+class WordBulkCreate(BaseModel):
+    words: list[WordCreate] = Field(min_length=1, max_length=5000)
+
+
+class BulkItemResult(BaseModel):
+    index: int
+    id: int | None = None
+    error: str | None = None
+
+
+class WordBulkCreateResponse(BaseModel):
+    created: int
+    results: list[BulkItemResult]
+
+
+class WordBulkChanges(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    new_word: WordFieldConstraint | None = None
+    translation: WordFieldConstraint | None = None
+    note: WordNote | None = None
+    lang_code: LanguageCode | None = None
+
+
+class WordBulkUpdate(BaseModel):
+    word_ids: list[int] = Field(min_length=1, max_length=5000)
+    changes: WordBulkChanges
+
+
+class WordBulkUpdateResponse(BaseModel):
+    updated: int
+
+
+class WordBulkDelete(BaseModel):
+    word_ids: list[int] = Field(min_length=1, max_length=5000)
+
+
 class WordResponse(BaseModel):
     id: int
     user_id: UUID
@@ -138,6 +198,34 @@ class WordResponse(BaseModel):
         return v
 
 
+class SimilarWord(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    new_word: str
+    similarity: float
+
+
+class WordAutocompleteItem(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    new_word: str
+    translation: str | None = None
+
+
+class WordCreateResponse(WordResponse):
+    model_config = ConfigDict(from_attributes=True)
+
+    similar_words: list[SimilarWord] = []
+
+
+class WordSearchResult(BaseModel):
+    word: WordResponse
+    rank: float
+    matched_context: str | None = None
+
+
 class WordUpdate(BaseModel):
     model_config = ConfigDict(extra="ignore")
 
@@ -155,4 +243,56 @@ class WordUpdate(BaseModel):
 
 class AssignWordsRequest(BaseModel):
     # word_ids: list[int]
-    word_ids: list[int] = Field(min_length=1)
+    word_ids: list[int] = Field(min_length=1, max_length=5000)
+
+
+class JobResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    kind: JobKind
+    status: JobStatus
+    dictlist_id: int | None = None
+    progress: float
+    processed_rows: int
+    imported_rows: int
+    failed_rows: int
+    created_at: datetime
+    finished_at: datetime | None = None
+
+
+class DuplicateClusterWord(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    new_word: str
+    translation: str | None = None
+
+
+class DuplicateCluster(BaseModel):
+    keeper_id: int
+    words: list[DuplicateClusterWord]
+
+
+class PoolStatus(BaseModel):
+    size: int
+    max_overflow: int
+    timeout: float
+    connections: int
+    in_use: int
+    idle: int
+    saturation: float
+    checkout_waits: int
+    checkout_wait_seconds: float
+    checkout_timeouts: int
+
+
+class ReadinessResponse(BaseModel):
+    status: Literal["ready", "saturated", "unavailable"]
+    db_latency_ms: float | None = None
+    pools: dict[str, PoolStatus] = {}
+
+
+class ProfileTokenResponse(BaseModel):
+    token: str
+    expires_in_minutes: int
@@ -0,0 +1,162 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+from pydantic import ValidationError
+from sqlalchemy import null, select
+from sqlalchemy.orm import Session
+
+from app import constants, models, schemas
+from app.services import dictlists as dictlist_service
+from app.services import languages as lang_service
+from app.services import words as word_service
+from app.utils.anki_utils import (
+    AnkiNote,
+    AnkiPackageReader,
+    ExportNote,
+    html_to_lines,
+    html_to_text,
+    write_package,
+)
+
+EXPORT_BATCH_SIZE = 5000
+
+
+def _note_to_word(note: AnkiNote, lang_code: str) -> schemas.WordCreate:
+    """Map a note onto a word.
+
+    Fields named Front/Back/Note are used when present, otherwise the first two
+    fields are the word and its translation. Every other field becomes contexts.
+    """
+    fields = dict(note.fields)
+    by_name = {name.lower(): name for name in fields}
+    positional = [name for name in fields if name.lower() != "note"]
+
+    front = by_name.get("front") or (positional[0] if positional else None)
+    back = by_name.get("back") or (positional[1] if len(positional) > 1 else None)
+    new_word = html_to_text(fields.pop(front, "")) if front else ""
+    translation = html_to_text(fields.pop(back, "")) if back else ""
+    note_text = html_to_text(fields.pop(by_name.get("note", ""), ""))
+
+    return schemas.WordCreate(
+        new_word=new_word,
+        translation=translation or None,
+        note=note_text or None,
+        lang_code=lang_code,
+        contexts=[line for value in fields.values() for line in html_to_lines(value)],
+    )
+
+
+def import_package(
+    package_path: Path,
+    workdir: Path,
+    lang_code: str,
+    user: models.User,
+    db: Session,
+    *,
+    deck: str | None = None,
+) -> tuple[models.DictList, int, int]:
+    """Create a dictlist with a word per note of the package.
+
+    With `deck`, only the notes with a card in that deck or one nested in it
+    are imported, and the dictlist is named after it. Everything is written
+    in one transaction, so a failed import leaves nothing behind. Returns the
+    dictlist and the numbers of imported and skipped notes.
+    """
+    language = lang_service.get_language_by_code(lang_code, db)
+
+    with AnkiPackageReader(
+        package_path,
+        workdir,
+        max_uncompressed_bytes=constants.ANKI_MAX_UNCOMPRESSED_BYTES,
+    ) as reader:
+        deck_ids = reader.deck_ids(deck) if deck is not None else None
+        dictlist = models.DictList(
+            name=(deck or reader.deck_name() or package_path.stem)[:120],
+            language=language,
+            user=user,
+            # Decks are imported whole, so the list is not limited
+            max_words_limit=null(),
+        )
+        db.add(dictlist)
+
+        imported = skipped = 0
+        added = []
+        try:
+            db.flush()
+            for batch in reader.iter_note_batches(deck_ids=deck_ids):
+                words = []
+                for note in batch:
+                    try:
+                        words.append(_note_to_word(note, lang_code))
+                    except ValidationError:
+                        skipped += 1
+                if not words:
+                    continue
+
+                results = word_service.insert_words(words, user.id, db)
+                created = [
+                    (result.id, word.new_word)
+                    for result, word in zip(results, words, strict=True)
+                    if result.id is not None
+                ]
+                dictlist_service.insert_dictlist_words(
+                    dictlist.id, [word_id for word_id, _ in created], db
+                )
+                added.extend(created)
+                imported += len(created)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+    word_service.update_similarity_index(user.id, added=added)
+    db.refresh(dictlist)
+    return dictlist, imported, skipped
+
+
+def _iter_export_batches(dictlist_id: int, db: Session) -> Iterator[list[ExportNote]]:
+    query = (
+        select(
+            models.Word.id,
+            models.Word.new_word,
+            models.Word.translation,
+            models.Word.note,
+        )
+        .join(
+            models.dictlist_words,
+            models.dictlist_words.c.word_id == models.Word.id,
+        )
+        .where(models.dictlist_words.c.dictlist_id == dictlist_id)
+        .order_by(models.Word.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for partition in db.execute(query).partitions():
+        contexts = {}
+        for word_id, context in db.execute(
+            select(models.WordContext.word_id, models.WordContext.context)
+            .where(models.WordContext.word_id.in_([row.id for row in partition]))
+            .order_by(models.WordContext.position, models.WordContext.id)
+        ):
+            contexts.setdefault(word_id, []).append(context)
+
+        yield [
+            ExportNote(
+                guid=f"vocabularynotes-{row.id}",
+                front=row.new_word,
+                back=row.translation or "",
+                note=row.note or "",
+                contexts=tuple(contexts.get(row.id, ())),
+            )
+            for row in partition
+        ]
+
+
+def export_package(
+    dictlist: models.DictList, package_path: Path, workdir: Path, db: Session
+) -> int:
+    return write_package(
+        package_path,
+        workdir,
+        dictlist.name,
+        _iter_export_batches(dictlist.id, db),
+    )
@@ -1,13 +1,20 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
 from app import models, schemas
 from app.exceptions import AlreadyExistsError, ForbiddenError, NotFoundError
 from app.filters_schemas import DictListFilter
 from app.services import languages as lang_service
+from app.services import words as word_service
+from app.utils.orm_utils import dialect_insert, read_options
+from app.utils.pagination_utils import paginate
+
+
+def dictlist_options():
+    return read_options(joinedload(models.DictList.language))
 
 
 def create_dictlist(dictlist: schemas.DictListCreate, user: models.User, db: Session):
@@ -31,8 +38,16 @@ def create_dictlist(dictlist: schemas.DictListCreate, user: models.User, db: Ses
         raise AlreadyExistsError from None
 
 
-def get_dictlist_by_id(dictlist_id: int, db: Session):
-    dictlist = db.get(models.DictList, dictlist_id)
+def get_dictlist_by_id(dictlist_id: int, db: Session, *, eager: bool = False):
+    if eager:
+        dictlist = db.get(
+            models.DictList,
+            dictlist_id,
+            options=dictlist_options(),
+            populate_existing=True,
+        )
+    else:
+        dictlist = db.get(models.DictList, dictlist_id)
     if not dictlist:
         raise NotFoundError
     return dictlist
@@ -47,7 +62,9 @@ def get_own_dictlist_by_id(
     return dictlist
 
 
-def get_all_dictlists_with_filters(filters: DictListFilter, user_id: UUID, db: Session):
+def get_all_dictlists_with_filters(
+    filters: DictListFilter, page: schemas.PageParams, user_id: UUID, db: Session
+):
     query = select(models.DictList).where(models.DictList.user_id == user_id)
 
     if filters.lang_code:
@@ -57,7 +74,56 @@ def get_all_dictlists_with_filters(filters: DictListFilter, user_id: UUID, db: S
         query = query.where(
             models.DictList.words.any(models.Word.id == filters.word_id)
         )
-    return db.scalars(query).all()
+    query = query.options(*dictlist_options()).execution_options(populate_existing=True)
+    return paginate(query, models.DictList, page.limit, page.cursor, db)
+
+
+def assign_words(
+    dictlist: models.DictList, word_ids: list[int], user_id: UUID, db: Session
+) -> None:
+    word_ids = set(word_ids)
+    word_service.check_own_words(word_ids, user_id, db)
+
+    try:
+        # The word_count trigger fails the check constraint on the dictlist
+        # row when the insert would exceed max_words_limit.
+        insert_dictlist_words(dictlist.id, word_ids, db)
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise ValueError from None
+
+
+def insert_dictlist_words(dictlist_id: int, word_ids, db: Session) -> None:
+    """Add words to a dictlist, skipping the ones in it; the caller commits."""
+    db.execute(
+        dialect_insert(models.dictlist_words, db)
+        .values(
+            [
+                {"dictlist_id": dictlist_id, "word_id": word_id}
+                for word_id in sorted(word_ids)
+            ]
+        )
+        .on_conflict_do_nothing()
+    )
+
+
+def unassign_words(
+    dictlist: models.DictList, word_ids: list[int], user_id: UUID, db: Session
+) -> None:
+    word_ids = set(word_ids)
+    word_service.check_own_words(word_ids, user_id, db)
+
+    result = db.execute(
+        delete(models.dictlist_words).where(
+            models.dictlist_words.c.dictlist_id == dictlist.id,
+            models.dictlist_words.c.word_id.in_(word_ids),
+        )
+    )
+    if result.rowcount != len(word_ids):
+        db.rollback()
+        raise ValueError
+    db.commit()
 
 
 def delete_dictlist(dictlist_id: int, db: Session):
@@ -0,0 +1,265 @@
+import html
+import logging
+import random
+import threading
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import Integer, case, cast, func, insert, or_, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models
+from app.constants import DIGEST_HOUR
+from app.utils.datetime_utils import utc_now
+
+logger = logging.getLogger(__name__)
+
+DIGEST_USER_BATCH_SIZE = 1000
+DIGEST_NEW_WORDS = 20
+DIGEST_REVIEW_WORDS = 5
+DIGEST_RETRY_DELAY = timedelta(minutes=15)
+
+VERIFIED_ROLES = [
+    role for role in models.UserRole if role >= models.UserRole.AuthorizedUser
+]
+
+
+def _new_words(
+    user_ids: list[UUID], start: datetime, end: datetime, db: Session
+) -> dict[UUID, list]:
+    """The first words each user added in [start, end), with a context each.
+
+    Every row also carries the user's total number of words in the range.
+    """
+    ranked = (
+        select(
+            models.Word.id,
+            models.Word.user_id,
+            models.Word.new_word,
+            models.Word.translation,
+            func.row_number()
+            .over(partition_by=models.Word.user_id, order_by=models.Word.id)
+            .label("position"),
+            func.count().over(partition_by=models.Word.user_id).label("total"),
+        )
+        .where(
+            models.Word.user_id.in_(user_ids),
+            models.Word.created_at >= start,
+            models.Word.created_at < end,
+        )
+        .subquery()
+    )
+    first_context = (
+        select(models.WordContext.context)
+        .where(models.WordContext.word_id == ranked.c.id)
+        .order_by(models.WordContext.position, models.WordContext.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    words = defaultdict(list)
+    for row in db.execute(
+        select(
+            ranked.c.user_id,
+            ranked.c.new_word,
+            ranked.c.translation,
+            ranked.c.total,
+            first_context.label("context"),
+        )
+        .where(ranked.c.position <= DIGEST_NEW_WORDS)
+        .order_by(ranked.c.user_id, ranked.c.position)
+    ):
+        words[row.user_id].append(row)
+    return words
+
+
+def _review_words(
+    user_ids: list[UUID], before: datetime, db: Session
+) -> dict[UUID, list]:
+    """A few random words each user added before `before`.
+
+    The range of ids of each user's words is cut in DIGEST_REVIEW_WORDS
+    parts, and each part gives the first word added before `before` at or
+    after a random id of it: probes of the (user_id, id) index rather than a
+    sort of all the words. A part without such words gives the word of the
+    next one, or none past the last, and words picked twice are shown once,
+    so a user may get fewer words. Each user has an offset of their own in
+    the parts.
+    """
+    offsets = {user_id: random.random() for user_id in user_ids}
+    of_user = models.Word.user_id == models.User.id
+    ranges = (
+        select(
+            models.User.id.label("user_id"),
+            case(offsets, value=models.User.id).label("offset"),
+            select(func.min(models.Word.id))
+            .where(of_user)
+            .scalar_subquery()
+            .label("first_id"),
+            select(func.max(models.Word.id))
+            .where(of_user)
+            .scalar_subquery()
+            .label("last_id"),
+        )
+        .where(models.User.id.in_(user_ids))
+        .subquery()
+    )
+    size = ranges.c.last_id - ranges.c.first_id + 1
+    picks = [
+        select(models.Word.id)
+        .where(
+            models.Word.user_id == ranges.c.user_id,
+            models.Word.created_at < before,
+            models.Word.id
+            >= ranges.c.first_id
+            + cast(size * ((part + ranges.c.offset) / DIGEST_REVIEW_WORDS), Integer),
+        )
+        .order_by(models.Word.id)
+        .limit(1)
+        .scalar_subquery()
+        for part in range(DIGEST_REVIEW_WORDS)
+    ]
+    picked = {}
+    for user_id, *word_ids in db.execute(
+        select(ranges.c.user_id, *picks).where(ranges.c.first_id.is_not(None))
+    ):
+        word_ids = list(dict.fromkeys(word_id for word_id in word_ids if word_id))
+        if word_ids:
+            picked[user_id] = word_ids
+    if not picked:
+        return {}
+
+    rows = {
+        row.id: row
+        for row in db.execute(
+            select(
+                models.Word.id,
+                models.Word.user_id,
+                models.Word.new_word,
+                models.Word.translation,
+            ).where(models.Word.id.in_([i for ids in picked.values() for i in ids]))
+        )
+    }
+    return {
+        user_id: [rows[word_id] for word_id in word_ids]
+        for user_id, word_ids in picked.items()
+    }
+
+
+def _word_item(row) -> str:
+    item = f"<b>{html.escape(row.new_word)}</b>"
+    if row.translation:
+        item += f" — {html.escape(row.translation)}"
+    if getattr(row, "context", None):
+        item += f"<br><i>{html.escape(row.context)}</i>"
+    return f"<li>{item}</li>"
+
+
+def render_digest(username: str, day: date, new_words: list, review_words: list) -> str:
+    parts = [f"<p>Hi {html.escape(username)},</p>"]
+    if new_words:
+        total = new_words[0].total
+        parts.append(f"<p>You added {total} words on {day.isoformat()}:</p>")
+        parts.append(f"<ul>{''.join(_word_item(row) for row in new_words)}</ul>")
+        if total > len(new_words):
+            parts.append(f"<p>…and {total - len(new_words)} more.</p>")
+    if review_words:
+        parts.append("<p>Words to review:</p>")
+        parts.append(f"<ul>{''.join(_word_item(row) for row in review_words)}</ul>")
+    return "".join(parts)
+
+
+def queue_daily_digests(
+    session_factory: sessionmaker,
+    day: date,
+    *,
+    batch_size: int = DIGEST_USER_BATCH_SIZE,
+) -> tuple[int, int]:
+    """Queue in the email outbox the digest of `day` for every verified user.
+
+    Users are walked in keyset batches; each batch costs four queries, one
+    multi-row insert into the outbox and one update marking its users, in a
+    single transaction. Marked users are skipped, so a run that stopped
+    halfway can be started again. Returns the numbers of users processed
+    and of emails queued.
+    """
+    start = datetime.combine(day, time(), tzinfo=timezone.utc)
+    end = start + timedelta(days=1)
+    processed = queued = 0
+    after = None
+
+    with session_factory() as db:
+        while True:
+            users = select(
+                models.User.id, models.User.username, models.User.email
+            ).where(
+                models.User.role.in_(VERIFIED_ROLES),
+                or_(
+                    models.User.last_digest_on.is_(None),
+                    models.User.last_digest_on < day,
+                ),
+            )
+            if after is not None:
+                users = users.where(models.User.id > after)
+            users = db.execute(users.order_by(models.User.id).limit(batch_size)).all()
+            if not users:
+                break
+
+            user_ids = [user.id for user in users]
+            new_words = _new_words(user_ids, start, end, db)
+            review_words = _review_words(user_ids, start, db)
+            now = utc_now()
+            emails = [
+                {
+                    "recipient": user.email,
+                    "subject": f"Your vocabulary for {day.isoformat()}",
+                    "body": render_digest(
+                        user.username,
+                        day,
+                        new_words.get(user.id, []),
+                        review_words.get(user.id, []),
+                    ),
+                    "created_at": now,
+                    "next_attempt_at": now,
+                }
+                for user in users
+                if user.id in new_words or user.id in review_words
+            ]
+            if emails:
+                db.execute(insert(models.EmailOutbox), emails)
+            db.execute(
+                update(models.User)
+                .where(models.User.id.in_(user_ids))
+                .values(last_digest_on=day)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+
+            processed += len(users)
+            queued += len(emails)
+            after = user_ids[-1]
+
+    logger.info("Queued %d digests of %s for %d users", queued, day, processed)
+    return processed, queued
+
+
+def run_digest_scheduler(
+    session_factory: sessionmaker, stop: threading.Event, *, hour: int = DIGEST_HOUR
+) -> None:
+    """Queue the previous day's digests every day at `hour` UTC until `stop`.
+
+    A scheduler started after that hour catches up at once, and a failed run
+    is retried; users already sent the day's digest are skipped.
+    """
+    while not stop.is_set():
+        now = utc_now()
+        scheduled = now.replace(hour=hour, minute=0, second=0, microsecond=0)
+        if now >= scheduled:
+            try:
+                queue_daily_digests(session_factory, now.date() - timedelta(days=1))
+            except Exception:
+                logger.exception("Daily digest run failed")
+                stop.wait(DIGEST_RETRY_DELAY.total_seconds())
+                continue
+            scheduled += timedelta(days=1)
+        stop.wait((scheduled - utc_now()).total_seconds())
@@ -0,0 +1,264 @@
+import logging
+from uuid import UUID
+
+from sqlalchemy import and_, delete, exists, func, literal, select, tuple_, update
+from sqlalchemy.orm import Session, aliased, sessionmaker
+
+from app import models, schemas
+from app.services import jobs as job_service
+from app.services import words as word_service
+
+logger = logging.getLogger(__name__)
+
+
+def run_duplicate_scan(job_id: int, session_factory: sessionmaker) -> None:
+    """Record the user's clusters of words sharing language and normalized key.
+
+    One grouped query over the (user_id, lang_code, normalized_key) index
+    feeds an INSERT ... SELECT, so no word is loaded into Python.
+    """
+    with session_factory() as db:
+        job = job_service.get_job_by_id(job_id, db)
+        job.status = models.JobStatus.Running
+        db.commit()
+
+        try:
+            groups = (
+                select(
+                    models.Word.lang_code,
+                    models.Word.normalized_key,
+                    func.min(models.Word.id).label("keeper_id"),
+                )
+                .where(models.Word.user_id == job.user_id)
+                .group_by(models.Word.lang_code, models.Word.normalized_key)
+                .having(func.count() > 1)
+                .subquery()
+            )
+            result = db.execute(
+                models.DuplicateWord.__table__.insert().from_select(
+                    ["job_id", "word_id", "keeper_id"],
+                    select(literal(job.id), models.Word.id, groups.c.keeper_id)
+                    .join(
+                        groups,
+                        and_(
+                            models.Word.lang_code == groups.c.lang_code,
+                            models.Word.normalized_key == groups.c.normalized_key,
+                        ),
+                    )
+                    .where(models.Word.user_id == job.user_id),
+                )
+            )
+            job.processed_rows = result.rowcount
+            job_service.finish_job(job, models.JobStatus.Done, db)
+        except Exception:
+            logger.exception("Duplicate scan job %s failed", job_id)
+            db.rollback()
+            job_service.finish_job(job, models.JobStatus.Failed, db)
+
+
+def get_clusters(
+    job: models.Job, page: schemas.PageParams, db: Session
+) -> tuple[list[dict], str | None]:
+    """Clusters found by a scan job, keyset-paginated over the keeper id."""
+    keepers = (
+        select(models.DuplicateWord.keeper_id)
+        .where(models.DuplicateWord.job_id == job.id)
+        .distinct()
+        .order_by(models.DuplicateWord.keeper_id)
+        .limit(page.limit + 1)
+    )
+    if page.cursor is not None:
+        try:
+            after = int(page.cursor)
+        except ValueError as err:
+            raise ValueError("Invalid cursor") from err
+        keepers = keepers.where(models.DuplicateWord.keeper_id > after)
+    keeper_ids = db.scalars(keepers).all()
+
+    next_cursor = None
+    if len(keeper_ids) > page.limit:
+        keeper_ids = keeper_ids[: page.limit]
+        next_cursor = str(keeper_ids[-1])
+
+    clusters = {keeper_id: [] for keeper_id in keeper_ids}
+    rows = db.execute(
+        select(
+            models.DuplicateWord.keeper_id,
+            models.Word.id,
+            models.Word.new_word,
+            models.Word.translation,
+        )
+        .join(models.Word, models.Word.id == models.DuplicateWord.word_id)
+        .where(
+            models.DuplicateWord.job_id == job.id,
+            models.DuplicateWord.keeper_id.in_(keeper_ids),
+        )
+        .order_by(models.Word.id)
+    )
+    for row in rows:
+        clusters[row.keeper_id].append(row)
+    return [
+        {"keeper_id": keeper_id, "words": words}
+        for keeper_id, words in clusters.items()
+    ], next_cursor
+
+
+def _drop_stale_duplicates(scan_job_id: int, user_id: UUID, db: Session) -> None:
+    """Forget scanned words that changed or disappeared since the scan."""
+    word = aliased(models.Word)
+    keeper = aliased(models.Word)
+    db.execute(
+        delete(models.DuplicateWord).where(
+            models.DuplicateWord.job_id == scan_job_id,
+            ~exists()
+            .where(
+                word.id == models.DuplicateWord.word_id,
+                keeper.id == models.DuplicateWord.keeper_id,
+                word.user_id == user_id,
+                keeper.user_id == user_id,
+                word.lang_code == keeper.lang_code,
+                word.normalized_key == keeper.normalized_key,
+            )
+            .correlate(models.DuplicateWord),
+        )
+    )
+
+
+def merge_duplicates(scan_job_id: int, user_id: UUID, db: Session) -> list[int]:
+    """Merge every cluster of a scan into its keeper, in set-based statements.
+
+    Keepers take over the losers' contexts (without repeating a sentence),
+    their dictlist memberships and, where they have none, their translation
+    and note. Returns the ids of the deleted words; the caller commits.
+    """
+    _drop_stale_duplicates(scan_job_id, user_id, db)
+
+    duplicates = models.DuplicateWord
+    in_scan = duplicates.job_id == scan_job_id
+    losers = select(duplicates.word_id).where(
+        in_scan, duplicates.word_id != duplicates.keeper_id
+    )
+    keepers = select(duplicates.keeper_id).where(
+        in_scan, duplicates.word_id != duplicates.keeper_id
+    )
+
+    def keeper_of(word_id):
+        return (
+            select(duplicates.keeper_id)
+            .where(in_scan, duplicates.word_id == word_id)
+            .scalar_subquery()
+        )
+
+    loser = aliased(models.Word)
+    for field in ("translation", "note"):
+        loser_value = getattr(loser, field)
+        db.execute(
+            update(models.Word)
+            .where(models.Word.id.in_(keepers), getattr(models.Word, field).is_(None))
+            .values(
+                {
+                    field: select(loser_value)
+                    .join(duplicates, duplicates.word_id == loser.id)
+                    .where(
+                        in_scan,
+                        duplicates.keeper_id == models.Word.id,
+                        loser_value.is_not(None),
+                    )
+                    .order_by(loser.id)
+                    .limit(1)
+                    .scalar_subquery()
+                }
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    # A dictlist keeps the membership of the cluster's oldest word it holds;
+    # the others are dropped, then the remaining loser rows are repointed.
+    # Dropping first means no dictlist ever goes above its word limit.
+    memberships = models.dictlist_words
+    other = memberships.alias("other")
+    own_duplicate = aliased(duplicates)
+    other_duplicate = aliased(duplicates)
+    db.execute(
+        delete(memberships).where(
+            memberships.c.word_id.in_(losers),
+            exists()
+            .where(
+                own_duplicate.job_id == scan_job_id,
+                own_duplicate.word_id == memberships.c.word_id,
+                other.c.dictlist_id == memberships.c.dictlist_id,
+                other.c.word_id < memberships.c.word_id,
+                other_duplicate.job_id == scan_job_id,
+                other_duplicate.word_id == other.c.word_id,
+                other_duplicate.keeper_id == own_duplicate.keeper_id,
+            )
+            .correlate(memberships),
+        )
+    )
+    db.execute(
+        update(memberships)
+        .where(memberships.c.word_id.in_(losers))
+        .values(word_id=keeper_of(memberships.c.word_id))
+    )
+
+    # Loser contexts go after the keeper's own, so they are shifted past its
+    # last position before being repointed. Losers of one keeper can share
+    # positions, the older context comes first then.
+    contexts = models.WordContext.__table__
+    other_context = contexts.alias("other_context")
+    db.execute(
+        update(contexts)
+        .where(contexts.c.word_id.in_(losers))
+        .values(
+            position=contexts.c.position
+            + select(func.coalesce(func.max(other_context.c.position) + 1, 0))
+            .where(other_context.c.word_id == keeper_of(contexts.c.word_id))
+            .scalar_subquery()
+        )
+    )
+    db.execute(
+        update(contexts)
+        .where(contexts.c.word_id.in_(losers))
+        .values(word_id=keeper_of(contexts.c.word_id))
+    )
+    db.execute(
+        delete(contexts).where(
+            contexts.c.word_id.in_(keepers),
+            exists()
+            .where(
+                other_context.c.word_id == contexts.c.word_id,
+                other_context.c.context == contexts.c.context,
+                tuple_(other_context.c.position, other_context.c.id)
+                < tuple_(contexts.c.position, contexts.c.id),
+            )
+            .correlate(contexts),
+        )
+    )
+
+    loser_ids = db.scalars(losers).all()
+    db.execute(
+        delete(models.Word)
+        .where(models.Word.id.in_(losers), models.Word.user_id == user_id)
+        .execution_options(synchronize_session=False)
+    )
+    return loser_ids
+
+
+def run_duplicate_merge(
+    job_id: int, scan_job_id: int, session_factory: sessionmaker
+) -> None:
+    """Merge the clusters of a finished scan job in a single transaction."""
+    with session_factory() as db:
+        job = job_service.get_job_by_id(job_id, db)
+        job.status = models.JobStatus.Running
+        db.commit()
+
+        try:
+            loser_ids = merge_duplicates(scan_job_id, job.user_id, db)
+            job.processed_rows = len(loser_ids)
+            job_service.finish_job(job, models.JobStatus.Done, db)
+            word_service.update_similarity_index(job.user_id, removed=loser_ids)
+        except Exception:
+            logger.exception("Duplicate merge job %s failed", job_id)
+            db.rollback()
+            job_service.finish_job(job, models.JobStatus.Failed, db)
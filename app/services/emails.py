@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models
+from app.utils.datetime_utils import utc_now
+from app.utils.email_utils import REFUSED_ERRORS, SMTPSender, build_message
+
+logger = logging.getLogger(__name__)
+
+EMAIL_BATCH_SIZE = 100
+EMAIL_MAX_ATTEMPTS = 8
+# Waits after the 1st, 2nd, ... failure double from this, up to the maximum
+EMAIL_RETRY_DELAY = timedelta(seconds=30)
+EMAIL_MAX_RETRY_DELAY = timedelta(hours=6)
+
+
+def queue_email(recipient: str, subject: str, body: str, db: Session) -> None:
+    """Add an email to the outbox; the caller commits."""
+    db.add(models.EmailOutbox(recipient=recipient, subject=subject, body=body))
+
+
+def queue_verification_email(
+    email: str, token: str, action: str, base_url: str, db: Session
+) -> None:
+    verify_link = f"{base_url}auth/{action}?token={token}"
+    queue_email(
+        email,
+        "Verify your email",
+        f"Click the link to verify your account: {verify_link}",
+        db,
+    )
+
+
+def get_outbox_depth(db: Session) -> int:
+    """Number of emails still to be sent, including ones waiting for a retry."""
+    return db.scalar(
+        select(func.count()).where(models.EmailOutbox.next_attempt_at.is_not(None))
+    )
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return min(EMAIL_RETRY_DELAY * 2 ** (attempts - 1), EMAIL_MAX_RETRY_DELAY)
+
+
+def deliver_pending(
+    sender: SMTPSender, db: Session, *, batch_size: int = EMAIL_BATCH_SIZE
+) -> tuple[int, int]:
+    """Send one batch of due emails and commit the outcome.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED where the database has it,
+    so several workers can drain the same outbox. Sent rows are deleted and
+    failed ones rescheduled with exponential backoff. A connection failure
+    ends the batch early. Returns the numbers of sent and failed emails.
+    """
+    now = utc_now()
+    emails = db.scalars(
+        select(models.EmailOutbox)
+        .where(models.EmailOutbox.next_attempt_at <= now)
+        .order_by(models.EmailOutbox.next_attempt_at, models.EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not emails:
+        return 0, 0
+
+    sent_ids = []
+    failed = 0
+    started = time.perf_counter()
+    for email in emails:
+        try:
+            sender.send(build_message(email.recipient, email.subject, email.body))
+        except Exception as err:
+            failed += 1
+            email.attempts += 1
+            email.last_error = str(err)[:500] or type(err).__name__
+            if email.attempts >= EMAIL_MAX_ATTEMPTS:
+                email.next_attempt_at = None
+                logger.error("Giving up on email %s: %s", email.id, err)
+            else:
+                email.next_attempt_at = now + _retry_delay(email.attempts)
+            if not isinstance(err, REFUSED_ERRORS):
+                # The server is unreachable, so the rest of the batch would
+                # fail the same way; it stays due for the next batch
+                break
+        else:
+            sent_ids.append(email.id)
+    elapsed = time.perf_counter() - started
+
+    if sent_ids:
+        db.execute(
+            delete(models.EmailOutbox).where(models.EmailOutbox.id.in_(sent_ids)),
+            execution_options={"synchronize_session": False},
+        )
+    db.commit()
+    logger.info(
+        "Sent %d emails, %d failed, %.1f ms per email, %d queued",
+        len(sent_ids),
+        failed,
+        elapsed * 1000 / (len(sent_ids) + failed),
+        get_outbox_depth(db),
+    )
+    return len(sent_ids), failed
+
+
+def run_outbox_worker(
+    session_factory: sessionmaker,
+    sender: SMTPSender,
+    stop: threading.Event,
+    *,
+    poll_interval: float = 5.0,
+    batch_size: int = EMAIL_BATCH_SIZE,
+) -> None:
+    """Drain the outbox until `stop` is set, waiting between empty polls."""
+    try:
+        while not stop.is_set():
+            try:
+                with session_factory() as db:
+                    sent, failed = deliver_pending(sender, db, batch_size=batch_size)
+            except Exception:
+                logger.exception("Email outbox batch failed")
+                sent = failed = 0
+            if sent + failed < batch_size:
+                stop.wait(poll_interval)
+    finally:
+        sender.close()
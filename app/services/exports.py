@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+import zipfile
+from collections import defaultdict
+from collections.abc import Iterator
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models
+
+EXPORT_BATCH_SIZE = 1000
+CONTEXTS_SEPARATOR = "|"
+
+WORD_CSV_COLUMNS = (
+    "id",
+    "new_word",
+    "translation",
+    "note",
+    "lang_code",
+    "contexts",
+    "dictlist_ids",
+    "created_at",
+)
+DICTLIST_CSV_COLUMNS = ("id", "name", "lang_code", "max_words_limit", "created_at")
+
+
+def iter_dictlists(user_id: UUID, db: Session) -> Iterator[dict]:
+    query = (
+        select(
+            models.DictList.id,
+            models.DictList.name,
+            models.DictList.lang_code,
+            models.DictList.max_words_limit,
+            models.DictList.created_at,
+        )
+        .where(models.DictList.user_id == user_id)
+        .order_by(models.DictList.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for row in db.execute(query):
+        yield {**row._asdict(), "created_at": row.created_at.isoformat()}
+
+
+def iter_word_batches(user_id: UUID, db: Session) -> Iterator[list[dict]]:
+    """Yield the user's words with their contexts and dictlist memberships.
+
+    Words are read through a server-side cursor one partition at a time, and
+    contexts and memberships are fetched per partition, so memory use does
+    not depend on the size of the account.
+    """
+    query = (
+        select(
+            models.Word.id,
+            models.Word.new_word,
+            models.Word.translation,
+            models.Word.note,
+            models.Word.lang_code,
+            models.Word.created_at,
+        )
+        .where(models.Word.user_id == user_id)
+        .order_by(models.Word.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    for partition in db.execute(query).partitions():
+        word_ids = [row.id for row in partition]
+
+        contexts = defaultdict(list)
+        for word_id, context in db.execute(
+            select(models.WordContext.word_id, models.WordContext.context)
+            .where(models.WordContext.word_id.in_(word_ids))
+            .order_by(models.WordContext.position, models.WordContext.id)
+        ):
+            contexts[word_id].append(context)
+
+        dictlist_ids = defaultdict(list)
+        for word_id, dictlist_id in db.execute(
+            select(
+                models.dictlist_words.c.word_id, models.dictlist_words.c.dictlist_id
+            ).where(models.dictlist_words.c.word_id.in_(word_ids))
+        ):
+            dictlist_ids[word_id].append(dictlist_id)
+
+        yield [
+            {
+                **row._asdict(),
+                "created_at": row.created_at.isoformat(),
+                "contexts": contexts[row.id],
+                "dictlist_ids": sorted(dictlist_ids[row.id]),
+            }
+            for row in partition
+        ]
+
+
+def export_ndjson(user_id: UUID, db: Session) -> Iterator[bytes]:
+    for dictlist in iter_dictlists(user_id, db):
+        yield (
+            json.dumps({"type": "dictlist", **dictlist}, ensure_ascii=False) + "\n"
+        ).encode()
+    for batch in iter_word_batches(user_id, db):
+        yield "".join(
+            json.dumps({"type": "word", **word}, ensure_ascii=False) + "\n"
+            for word in batch
+        ).encode()
+
+
+class _ZipStream(io.RawIOBase):
+    """Write-only, unseekable sink that zipfile can stream entries into."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def export_zipped_csv(user_id: UUID, db: Session) -> Iterator[bytes]:
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("dictlists.csv", "w", force_zip64=True) as entry:
+            text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+            writer = csv.DictWriter(text, DICTLIST_CSV_COLUMNS)
+            writer.writeheader()
+            writer.writerows(iter_dictlists(user_id, db))
+            text.flush()
+            text.detach()
+        yield stream.drain()
+
+        with archive.open("words.csv", "w", force_zip64=True) as entry:
+            text = io.TextIOWrapper(entry, encoding="utf-8", newline="")
+            writer = csv.DictWriter(text, WORD_CSV_COLUMNS)
+            writer.writeheader()
+            for batch in iter_word_batches(user_id, db):
+                writer.writerows(
+                    {
+                        **word,
+                        "contexts": CONTEXTS_SEPARATOR.join(word["contexts"]),
+                        "dictlist_ids": " ".join(map(str, word["dictlist_ids"])),
+                    }
+                    for word in batch
+                )
+                text.flush()
+                yield stream.drain()
+            text.detach()
+    yield stream.drain()
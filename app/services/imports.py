@@ -0,0 +1,150 @@
+import csv
+import io
+import logging
+from pathlib import Path
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, sessionmaker
+
+from app import models, schemas
+from app.services import dictlists as dictlist_service
+from app.services import jobs as job_service
+from app.services import words as word_service
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 5000
+CONTEXTS_SEPARATOR = "|"
+REQUIRED_COLUMNS = {"new_word", "lang_code"}
+
+
+def _parse_row(row: dict) -> schemas.WordCreate:
+    contexts = row.get("contexts") or ""
+    return schemas.WordCreate(
+        new_word=row.get("new_word") or "",
+        translation=row.get("translation") or None,
+        note=row.get("note") or None,
+        lang_code=row.get("lang_code") or "",
+        contexts=contexts.split(CONTEXTS_SEPARATOR),
+    )
+
+
+def _validation_message(err: ValidationError) -> str:
+    error = err.errors()[0]
+    field = ".".join(str(part) for part in error["loc"])
+    return f"{field}: {error['msg']}" if field else error["msg"]
+
+
+def _import_batch(
+    job: models.Job, batch: list[tuple[int, schemas.WordCreate]], db: Session
+) -> tuple[list[tuple[int, str]], list[tuple[int, str]]]:
+    """Insert a batch of words and add them to the job's dictlist.
+
+    Both are done in one savepoint, so a batch that would take the dictlist
+    over its word limit is not imported at all and its rows only count as
+    failed. Returns the row errors and the (id, new_word) pairs of the created
+    words; the caller commits.
+    """
+    savepoint = db.begin_nested()
+    results = word_service.insert_words([word for _, word in batch], job.user_id, db)
+    errors = [
+        (row_number, result.error)
+        for (row_number, _), result in zip(batch, results, strict=True)
+        if result.error
+    ]
+    created = [
+        (row_number, result.id, word.new_word)
+        for (row_number, word), result in zip(batch, results, strict=True)
+        if result.id is not None
+    ]
+
+    if job.dictlist_id is not None and created:
+        try:
+            dictlist_service.insert_dictlist_words(
+                job.dictlist_id, [word_id for _, word_id, _ in created], db
+            )
+        except IntegrityError:
+            # The word_count trigger fails the check constraint on the
+            # dictlist row when the insert would exceed max_words_limit
+            savepoint.rollback()
+            errors.extend(
+                (row_number, "The dictlist word limit was reached")
+                for row_number, _, _ in created
+            )
+            return errors, []
+
+    savepoint.commit()
+    job.imported_rows += len(created)
+    return errors, [(word_id, new_word) for _, word_id, new_word in created]
+
+
+def _flush(
+    job: models.Job,
+    batch: list[tuple[int, schemas.WordCreate]],
+    errors: list[tuple[int, str]],
+    db: Session,
+) -> list[tuple[int, str]]:
+    added = []
+    if batch:
+        batch_errors, added = _import_batch(job, batch, db)
+        errors = errors + batch_errors
+    job_service.add_job_errors(job, errors, db)
+    return added
+
+
+def run_word_import(
+    job_id: int, path: Path, delimiter: str, session_factory: sessionmaker
+) -> None:
+    """Stream a CSV/TSV file of words into the database in batches.
+
+    Meant to run as a background task: it opens its own session and keeps the
+    job row updated so clients can poll its progress.
+    """
+    with session_factory() as db:
+        job = job_service.get_job_by_id(job_id, db)
+        job.status = models.JobStatus.Running
+        db.commit()
+
+        try:
+            with path.open("rb") as raw:
+                reader = csv.DictReader(
+                    io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""),
+                    delimiter=delimiter,
+                )
+                missing = REQUIRED_COLUMNS - set(reader.fieldnames or ())
+                if missing:
+                    job_service.add_job_errors(
+                        job, [(1, f"Missing columns: {', '.join(sorted(missing))}")], db
+                    )
+                    job_service.finish_job(job, models.JobStatus.Failed, db)
+                    return
+
+                batch = []
+                errors = []
+                # Row numbers are 1-based and count the header row
+                for row_number, row in enumerate(reader, start=2):
+                    try:
+                        batch.append((row_number, _parse_row(row)))
+                    except ValidationError as err:
+                        errors.append((row_number, _validation_message(err)))
+                    job.processed_rows += 1
+
+                    if len(batch) + len(errors) >= IMPORT_BATCH_SIZE:
+                        added = _flush(job, batch, errors, db)
+                        job.processed_bytes = raw.tell()
+                        db.commit()
+                        word_service.update_similarity_index(job.user_id, added=added)
+                        batch = []
+                        errors = []
+
+                added = _flush(job, batch, errors, db)
+                job.processed_bytes = job.size_bytes
+            job_service.finish_job(job, models.JobStatus.Done, db)
+            word_service.update_similarity_index(job.user_id, added=added)
+        except Exception:
+            logger.exception("Word import job %s failed", job_id)
+            db.rollback()
+            job_service.finish_job(job, models.JobStatus.Failed, db)
+        finally:
+            path.unlink(missing_ok=True)
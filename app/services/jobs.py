@@ -0,0 +1,76 @@
+from collections.abc import Iterator
+from uuid import UUID
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.exceptions import ForbiddenError, NotFoundError
+from app.utils.datetime_utils import utc_now
+
+
+def create_job(
+    kind: models.JobKind,
+    user_id: UUID,
+    db: Session,
+    *,
+    dictlist_id: int | None = None,
+    size_bytes: int = 0,
+) -> models.Job:
+    job = models.Job(
+        user_id=user_id, kind=kind, dictlist_id=dictlist_id, size_bytes=size_bytes
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_pending_job_count(db: Session) -> int:
+    """Number of jobs waiting for a worker."""
+    return db.scalar(
+        select(func.count()).where(models.Job.status == models.JobStatus.Pending)
+    )
+
+
+def get_job_by_id(job_id: int, db: Session) -> models.Job:
+    job = db.get(models.Job, job_id)
+    if not job:
+        raise NotFoundError
+    return job
+
+
+def get_own_job_by_id(job_id: int, user_id: UUID, db: Session) -> models.Job:
+    job = get_job_by_id(job_id, db)
+    if job.user_id != user_id:
+        raise ForbiddenError
+    return job
+
+
+def add_job_errors(job: models.Job, errors: list[tuple[int, str]], db: Session):
+    """Store row errors of a job; the caller commits."""
+    if errors:
+        db.execute(
+            insert(models.JobError),
+            [
+                {"job_id": job.id, "row_number": row_number, "message": message}
+                for row_number, message in errors
+            ],
+        )
+        job.failed_rows += len(errors)
+
+
+def finish_job(job: models.Job, status: models.JobStatus, db: Session):
+    job.status = status
+    job.finished_at = utc_now()
+    db.commit()
+
+
+def iter_job_errors(job_id: int, db: Session) -> Iterator[tuple[int, str]]:
+    query = (
+        select(models.JobError.row_number, models.JobError.message)
+        .where(models.JobError.job_id == job_id)
+        .order_by(models.JobError.row_number)
+        .execution_options(yield_per=1000)
+    )
+    yield from db.execute(query).tuples()
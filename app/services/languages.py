@@ -1,10 +1,52 @@
+import threading
+import time
+
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app import models, schemas
 from app.exceptions import AlreadyExistsError, NotFoundError
 
+# Languages are few and change only through the admin functions below, so
+# each process keeps all of them in memory. Those functions drop the cache;
+# changes made by another process are picked up once it is older than
+# LANGUAGE_CACHE_TTL seconds.
+LANGUAGE_CACHE_TTL = 300.0
+
+_languages: dict[str, schemas.LanguageSchema] | None = None
+_languages_loaded_at = 0.0
+_languages_lock = threading.Lock()
+
+
+def _cached_languages(db: Session) -> dict[str, schemas.LanguageSchema]:
+    global _languages, _languages_loaded_at
+
+    with _languages_lock:
+        if (
+            _languages is None
+            or time.monotonic() - _languages_loaded_at > LANGUAGE_CACHE_TTL
+        ):
+            _languages = {
+                lang.code: schemas.LanguageSchema.model_validate(lang)
+                for lang in db.scalars(
+                    select(models.Language).order_by(models.Language.code)
+                )
+            }
+            _languages_loaded_at = time.monotonic()
+        return _languages
+
+
+def clear_language_cache() -> None:
+    global _languages
+
+    with _languages_lock:
+        _languages = None
+
+
+def has_language(code: str, db: Session) -> bool:
+    return code in _cached_languages(db)
+
 
 def create_language(lang: schemas.LanguageSchema, db: Session):
     try:
@@ -16,20 +58,35 @@ def create_language(lang: schemas.LanguageSchema, db: Session):
     except IntegrityError:
         db.rollback()
         raise AlreadyExistsError from None
+    finally:
+        clear_language_cache()
 
 
 def get_language_by_code(code: str, db: Session):
-    lang = db.get(models.Language, code)
-    if not lang:
+    """The language as an object of `db`, built from the cache without a query."""
+    cached = _cached_languages(db).get(code)
+    if not cached:
         raise NotFoundError
-    return lang
+    lang = models.Language(code=cached.code, name=cached.name)
+    make_transient_to_detached(lang)
+    return db.merge(lang, load=False)
+
 
+def get_all_languages(db: Session) -> list[schemas.LanguageSchema]:
+    return list(_cached_languages(db).values())
 
-def get_all_languages(db: Session):
-    return db.scalars(select(models.Language)).all()
+
+def update_language_name(lang_code: str, name: str, db: Session):
+    lang = get_language_by_code(lang_code, db)
+    if lang.name == name:
+        raise ValueError
+    lang.name = name
+    db.commit()
+    clear_language_cache()
 
 
 def delete_language(lang_code: str, db: Session):
     lang = get_language_by_code(lang_code, db)
     db.delete(lang)
     db.commit()
+    clear_language_cache()
@@ -1,21 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.exc import StaleDataError
 
 from app import models, schemas
+from app.constants import VERIFY_TOKEN_EXPIRE_MINUTES
 from app.exceptions import AlreadyExistsError, NotFoundError
 from app.filters_schemas import UserFilter
-from app.utils.auth_utils import pwd_context
+from app.services import emails as email_service
+from app.utils.auth_utils import create_access_token
+from app.utils.pagination_utils import paginate
+from app.utils.password_utils import hash_password
 
+# Column values of recently authenticated users, least recently used first.
+# Commits that change or delete a user drop its entry; entries are also
+# dropped after USER_CACHE_TTL seconds, which bounds how long another process
+# can act on a role or account that has since changed.
+USER_CACHE_MAX_SIZE = 10_000
+USER_CACHE_TTL = 60.0
 
-def create_user(user: schemas.UserCreate, db: Session):
+_users: OrderedDict[UUID, tuple[float, dict]] = OrderedDict()
+_users_lock = threading.Lock()
+_users_generation = 0
+
+
+def invalidate_cached_users(user_ids) -> None:
+    global _users_generation
+
+    with _users_lock:
+        for user_id in user_ids:
+            _users.pop(user_id, None)
+            _users_generation += 1
+
+
+def clear_user_cache() -> None:
+    with _users_lock:
+        _users.clear()
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = session.info.setdefault("changed_user_ids", set())
+    changed.update(
+        obj.id
+        for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, models.User)
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_changed_users(session):
+    invalidate_cached_users(session.info.pop("changed_user_ids", ()))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_changed_users(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop("changed_user_ids", None)
+
+
+def create_user(
+    user: schemas.UserCreate, db: Session, *, verify_base_url: str | None = None
+):
+    """Create a user.
+
+    With `verify_base_url`, the verification email is queued in the same
+    transaction, so it goes out if and only if the user is created.
+    """
     try:
-        hashed_password = pwd_context.hash(user.password)
+        hashed_password = hash_password(user.password)
         user.password = hashed_password
         db_user = models.User(**user.model_dump())
         db.add(db_user)
+        if verify_base_url is not None:
+            verify_token = create_access_token(
+                {"sub": db_user.email}, VERIFY_TOKEN_EXPIRE_MINUTES
+            )
+            email_service.queue_verification_email(
+                db_user.email, verify_token, "email_verify", verify_base_url, db
+            )
         db.commit()
         db.refresh(db_user)
         return db_user
@@ -31,6 +99,64 @@ def get_user_by_id(user_id: UUID, db: Session):
     return user
 
 
+def get_cached_user(user_id: UUID, db: Session) -> models.User:
+    """The user as an object of `db`, built from the cache without a query."""
+    with _users_lock:
+        cached = _users.get(user_id)
+        if cached and time.monotonic() - cached[0] > USER_CACHE_TTL:
+            del _users[user_id]
+            cached = None
+        if cached:
+            _users.move_to_end(user_id)
+        generation = _users_generation
+
+    if cached:
+        values = cached[1]
+        user = models.User(
+            username=values["username"],
+            email=values["email"],
+            password=values["password"],
+            role=values["role"],
+        )
+        for key, value in values.items():
+            setattr(user, key, value)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+
+    user = get_user_by_id(user_id, db)
+    values = {
+        attr.key: getattr(user, attr.key)
+        for attr in models.User.__mapper__.column_attrs
+    }
+    with _users_lock:
+        # A commit that changed the user while it was being read has already
+        # invalidated it, so the values read may be stale
+        if generation == _users_generation:
+            _users[user_id] = (time.monotonic(), values)
+            if len(_users) > USER_CACHE_MAX_SIZE:
+                _users.popitem(last=False)
+    return user
+
+
+def commit_user_change(user: models.User, db: Session) -> None:
+    """Commit a change of a user got from get_cached_user.
+
+    The cached values may outlive the row, deleted by another process: the
+    UPDATE then matches no row and fails with StaleDataError. The entry is
+    dropped and the user read again, which raises NotFoundError when it is
+    gone; the StaleDataError is raised again otherwise.
+    """
+    user_id = user.id
+    try:
+        db.commit()
+    except StaleDataError:
+        db.rollback()
+        db.expunge(user)
+        invalidate_cached_users([user_id])
+        get_cached_user(user_id, db)
+        raise
+
+
 def get_user_by_username(username: str, db: Session):
     user = db.scalar(select(models.User).where(models.User.username == username))
     if not user:
@@ -45,11 +171,11 @@ def get_user_by_email(email: str, db: Session):
     return user
 
 
-def get_all_users(filters: UserFilter, db: Session):
+def get_all_users(filters: UserFilter, page: schemas.PageParams, db: Session):
     query = select(models.User)
     if filters.role:
         query = query.where(models.User.role == filters.role)
-    return db.scalars(query).all()
+    return paginate(query, models.User, page.limit, page.cursor, db)
 
 
 def delete_user(user, db: Session):
@@ -1,16 +1,108 @@
+import threading
+from collections import OrderedDict, defaultdict
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    Integer,
+    Select,
+    and_,
+    bindparam,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from app import models, schemas
 from app.exceptions import AlreadyExistsError, ForbiddenError, NotFoundError
 from app.filters_schemas import WordFilter
 from app.services import languages as lang_services
+from app.utils.datetime_utils import utc_now
+from app.utils.orm_utils import read_options
+from app.utils.pagination_utils import (
+    decode_rank_cursor,
+    encode_rank_cursor,
+    paginate,
+)
+from app.utils.search_utils import matching_context, search_terms, word_key
+from app.utils.trigram_utils import SIMILARITY_THRESHOLD, TrigramIndex, similarity
 
+# Per-user trigram indexes for databases without pg_trgm, least recently
+# used first
+SIMILARITY_INDEX_MAX_USERS = 64
+_similarity_indexes: OrderedDict[UUID, TrigramIndex] = OrderedDict()
+_similarity_indexes_lock = threading.Lock()
 
-def create_word(word: schemas.WordCreate, user: models.User, db: Session):
+
+def word_list_options():
+    return read_options(
+        joinedload(models.Word.language), selectinload(models.Word.contexts)
+    )
+
+
+def word_detail_options():
+    return read_options(
+        joinedload(models.Word.language), joinedload(models.Word.contexts)
+    )
+
+
+def find_duplicate_word(
+    new_word: str,
+    lang_code: str,
+    user_id: UUID,
+    db: Session,
+    *,
+    exclude_id: int | None = None,
+) -> int | None:
+    """Id of a word of the user with the same normalized key, if any."""
+    query = select(models.Word.id).where(
+        models.Word.user_id == user_id,
+        models.Word.lang_code == lang_code,
+        models.Word.normalized_key == word_key(new_word),
+    )
+    if exclude_id is not None:
+        query = query.where(models.Word.id != exclude_id)
+    return db.scalars(query.limit(1)).first()
+
+
+def lookup_words(
+    new_word: str, lang_code: str, user_id: UUID, db: Session
+) -> list[models.Word]:
+    """The user's words equal to `new_word` up to normalization."""
+    return db.scalars(
+        select(models.Word)
+        .where(
+            models.Word.user_id == user_id,
+            models.Word.lang_code == lang_code,
+            models.Word.normalized_key == word_key(new_word),
+        )
+        .options(*word_list_options())
+        .execution_options(populate_existing=True)
+        .order_by(models.Word.id)
+    ).all()
+
+
+def create_word(
+    word: schemas.WordCreate,
+    user: models.User,
+    db: Session,
+    *,
+    reject_duplicates: bool = False,
+):
+    if reject_duplicates and find_duplicate_word(
+        word.new_word, word.lang_code, user.id, db
+    ):
+        raise AlreadyExistsError
     try:
         language = lang_services.get_language_by_code(word.lang_code, db)
 
@@ -28,6 +120,7 @@ def create_word(word: schemas.WordCreate, user: models.User, db: Session):
         db.add(db_word)
         db.commit()
         db.refresh(db_word)
+        update_similarity_index(user.id, added=[(db_word.id, db_word.new_word)])
         return db_word
 
     except IntegrityError:
@@ -35,6 +128,74 @@ def create_word(word: schemas.WordCreate, user: models.User, db: Session):
         raise AlreadyExistsError from None
 
 
+def create_words_bulk(
+    words: list[schemas.WordCreate], user_id: UUID, db: Session
+) -> list[schemas.BulkItemResult]:
+    """Create many words with batched multi-row inserts and a single commit.
+
+    Items that cannot be created are reported by their index in `words`.
+    """
+    results = insert_words(words, user_id, db)
+    db.commit()
+    update_similarity_index(
+        user_id,
+        added=[
+            (result.id, word.new_word)
+            for result, word in zip(results, words, strict=True)
+            if result.id is not None
+        ],
+    )
+    return results
+
+
+def insert_words(
+    words: list[schemas.WordCreate], user_id: UUID, db: Session
+) -> list[schemas.BulkItemResult]:
+    """Insert words as create_words_bulk does, without committing.
+
+    The caller commits, then passes the new words to update_similarity_index.
+    """
+    results = [schemas.BulkItemResult(index=index) for index in range(len(words))]
+    valid = []
+    for index, word in enumerate(words):
+        if lang_services.has_language(word.lang_code, db):
+            valid.append((index, word))
+        else:
+            results[index].error = "Unknown language code"
+
+    if not valid:
+        return results
+
+    created_at = utc_now()
+    word_ids = db.scalars(
+        insert(models.Word).returning(models.Word.id, sort_by_parameter_order=True),
+        [
+            {
+                "user_id": user_id,
+                "lang_code": word.lang_code,
+                "new_word": word.new_word,
+                "normalized_key": word_key(word.new_word),
+                "translation": word.translation,
+                "note": word.note,
+                "created_at": created_at,
+            }
+            for _, word in valid
+        ],
+    ).all()
+
+    contexts = [
+        {"word_id": word_id, "context": context, "position": position}
+        for word_id, (_, word) in zip(word_ids, valid, strict=True)
+        for position, context in enumerate(word.contexts or ())
+    ]
+    if contexts:
+        db.execute(insert(models.WordContext), contexts)
+
+    for word_id, (index, _) in zip(word_ids, valid, strict=True):
+        results[index].id = word_id
+    return results
+
+
 def get_own_word_by_id(word_id: int, user_id: UUID, db: Session) -> models.Word:
     word = get_word_by_id(word_id, db)
     if word.user_id != user_id:
@@ -42,9 +203,21 @@ def get_own_word_by_id(word_id: int, user_id: UUID, db: Session) -> models.Word:
     return word
 
 
-def get_all_words_with_filters(filters: WordFilter, user_id: UUID, db: Session):
-    query = select(models.Word).where(models.Word.user_id == user_id)
+def check_own_words(word_ids: set[int], user_id: UUID, db: Session) -> None:
+    owners = dict(
+        db.execute(
+            select(models.Word.id, models.Word.user_id).where(
+                models.Word.id.in_(word_ids)
+            )
+        ).all()
+    )
+    if len(owners) != len(word_ids):
+        raise NotFoundError
+    if any(owner != user_id for owner in owners.values()):
+        raise ForbiddenError
+
 
+def _apply_filters(query: Select, filters: WordFilter) -> Select:
     if filters.lang_code:
         query = query.where(models.Word.lang_code == filters.lang_code)
 
@@ -52,12 +225,153 @@ def get_all_words_with_filters(filters: WordFilter, user_id: UUID, db: Session):
         query = query.where(
             models.Word.dict_lists.any(models.DictList.id == filters.dictlist_id)
         )
+    return query
+
+
+def get_all_words_with_filters(
+    filters: WordFilter, page: schemas.PageParams, user_id: UUID, db: Session
+):
+    query = select(models.Word).where(models.Word.user_id == user_id)
+    query = _apply_filters(query, filters)
+
+    query = query.options(*word_list_options()).execution_options(
+        populate_existing=True
+    )
+    return paginate(query, models.Word, page.limit, page.cursor, db)
+
+
+def _search_match(query: Select, terms: list[str], db: Session):
+    """Restrict `query` to words matching all terms and build their rank.
+
+    Higher ranks are better on both backends.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        fts = table("word_fts", column("rowid", Integer))
+        match = " ".join(f'"{term}"' for term in terms)
+        # bm25 is lower for better matches; the weights follow the columns
+        rank = -func.bm25(literal_column("word_fts"), 8.0, 4.0, 2.0, 1.0)
+        query = query.join(fts, fts.c.rowid == models.Word.id).where(
+            literal_column("word_fts").op("MATCH")(match)
+        )
+        return query, rank
 
-    return db.scalars(query).all()
+    tsquery = func.plainto_tsquery(literal("simple", REGCONFIG), " ".join(terms))
+    rank = func.ts_rank_cd(models.Word.search_vector, tsquery)
+    return query.where(models.Word.search_vector.op("@@")(tsquery)), rank
 
 
-def get_word_by_id(word_id: int, db: Session):
-    word = db.get(models.Word, word_id)
+def _escape_like(value: str) -> str:
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+def autocomplete_words(
+    prefix: str, lang_code: str, user_id: UUID, db: Session, *, limit: int = 10
+) -> list[schemas.WordAutocompleteItem]:
+    """Words whose new_word or translation starts with `prefix`, ignoring case.
+
+    Each side is one range scan of its (user_id, lang_code, lower(...)) index.
+    The pattern is rendered inline so PostgreSQL can plan the LIKE as a range.
+    """
+    pattern = bindparam(
+        "pattern", _escape_like(prefix.lower()) + "%", literal_execute=True
+    )
+    matches = []
+    for field in (models.Word.new_word, models.Word.translation):
+        key = func.lower(field)
+        subquery = (
+            select(
+                models.Word.id,
+                models.Word.new_word,
+                models.Word.translation,
+                key.label("key"),
+            )
+            .where(
+                models.Word.user_id == user_id,
+                models.Word.lang_code == lang_code,
+                key.like(pattern, escape="/"),
+            )
+            .order_by(key, models.Word.id)
+            .limit(limit)
+            .subquery()
+        )
+        matches.append(select(subquery))
+    rows = db.execute(union_all(*matches)).all()
+
+    results = {}
+    for row in sorted(rows, key=lambda row: (row.key, row.id)):
+        if row.id not in results:
+            results[row.id] = schemas.WordAutocompleteItem.model_validate(row)
+    return list(results.values())[:limit]
+
+
+def search_words(
+    q: str,
+    filters: WordFilter,
+    page: schemas.PageParams,
+    user_id: UUID,
+    db: Session,
+) -> tuple[list[dict], str | None]:
+    """Ranked full-text search over words, translations, notes and contexts.
+
+    Pages are keyset-paginated over (rank, id).
+    """
+    terms = search_terms(q)
+    if not terms:
+        raise ValueError("Empty search query")
+
+    query = select(models.Word).where(models.Word.user_id == user_id)
+    query, rank = _search_match(_apply_filters(query, filters), terms, db)
+
+    if page.cursor is not None:
+        cursor_rank, word_id = decode_rank_cursor(page.cursor)
+        try:
+            word_id = int(word_id)
+        except ValueError as err:
+            raise ValueError("Invalid cursor") from err
+        query = query.where(
+            or_(
+                rank < cursor_rank,
+                and_(rank == cursor_rank, models.Word.id < word_id),
+            )
+        )
+
+    query = (
+        query.add_columns(rank.label("rank"))
+        .options(*word_list_options())
+        .execution_options(populate_existing=True)
+        .order_by(rank.desc(), models.Word.id.desc())
+        .limit(page.limit + 1)
+    )
+    rows = db.execute(query).all()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        next_cursor = encode_rank_cursor(rows[-1].rank, rows[-1].Word.id)
+
+    results = [
+        {
+            "word": word,
+            "rank": word_rank,
+            "matched_context": matching_context(
+                [context.context for context in word.contexts], terms
+            ),
+        }
+        for word, word_rank in rows
+    ]
+    return results, next_cursor
+
+
+def get_word_by_id(word_id: int, db: Session, *, eager: bool = False):
+    if eager:
+        word = db.get(
+            models.Word,
+            word_id,
+            options=word_detail_options(),
+            populate_existing=True,
+        )
+    else:
+        word = db.get(models.Word, word_id)
     if not word:
         raise NotFoundError
     return word
@@ -67,3 +381,202 @@ def delete_word(word_id: int, db: Session):
     word = get_word_by_id(word_id, db)
     db.delete(word)
     db.commit()
+    update_similarity_index(word.user_id, removed=[word_id])
+
+
+def sync_word_contexts(word: models.Word, contexts: list[str], db: Session) -> None:
+    """Make the word's contexts equal to `contexts`, touching only what changed.
+
+    Old rows are matched to the new sentences by text, preferring a row at the
+    same position, so only sentences that are really new are inserted and only
+    those that are gone are deleted. Rows that moved get their new position in
+    one batched UPDATE. The caller commits.
+    """
+    unmatched: dict[str, list[tuple[int, int]]] = defaultdict(list)
+    for context_id, context, position in db.execute(
+        select(
+            models.WordContext.id,
+            models.WordContext.context,
+            models.WordContext.position,
+        )
+        .where(models.WordContext.word_id == word.id)
+        .order_by(models.WordContext.position, models.WordContext.id)
+    ):
+        unmatched[context].append((context_id, position))
+
+    # Rows already in place first, then the oldest row left with that text
+    matched: dict[int, tuple[int, int]] = {}
+    for position, context in enumerate(contexts):
+        rows = unmatched.get(context, [])
+        for row in rows:
+            if row[1] == position:
+                matched[position] = row
+                rows.remove(row)
+                break
+    added = []
+    for position, context in enumerate(contexts):
+        if position in matched:
+            continue
+        if rows := unmatched.get(context):
+            matched[position] = rows.pop(0)
+        else:
+            added.append({"word_id": word.id, "context": context, "position": position})
+
+    stale_ids = [context_id for rows in unmatched.values() for context_id, _ in rows]
+    moved = [
+        {"id": context_id, "position": position}
+        for position, (context_id, old_position) in matched.items()
+        if old_position != position
+    ]
+    if stale_ids:
+        db.execute(
+            delete(models.WordContext).where(models.WordContext.id.in_(stale_ids)),
+            execution_options={"synchronize_session": False},
+        )
+    if moved:
+        db.execute(update(models.WordContext), moved)
+    if added:
+        db.execute(insert(models.WordContext), added)
+    if stale_ids or moved or added:
+        db.expire(word, ["contexts"])
+
+
+def update_words_bulk(
+    word_ids: list[int], changes: schemas.WordBulkChanges, user_id: UUID, db: Session
+) -> int:
+    """Apply the same changes to all given words of the user in one UPDATE.
+
+    Nothing is changed unless every word exists and belongs to the user.
+    """
+    word_ids = set(word_ids)
+    values = changes.model_dump(exclude_unset=True)
+    if not values or any(
+        values.get(field, "") is None for field in ("new_word", "lang_code")
+    ):
+        raise ValueError
+    if "new_word" in values:
+        values["normalized_key"] = word_key(values["new_word"])
+    if "lang_code" in values and not lang_services.has_language(
+        values["lang_code"], db
+    ):
+        raise ValueError
+
+    result = db.execute(
+        update(models.Word)
+        .where(models.Word.id.in_(word_ids), models.Word.user_id == user_id)
+        .values(**values)
+        .execution_options(synchronize_session="fetch")
+    )
+    if result.rowcount != len(word_ids):
+        db.rollback()
+        check_own_words(word_ids, user_id, db)
+        raise NotFoundError
+    db.commit()
+    if "new_word" in values:
+        update_similarity_index(
+            user_id, added=[(word_id, values["new_word"]) for word_id in word_ids]
+        )
+    return len(word_ids)
+
+
+def delete_words_bulk(word_ids: list[int], user_id: UUID, db: Session) -> None:
+    """Delete the given words of the user in one DELETE.
+
+    Contexts and dictlist memberships go with them through ON DELETE CASCADE.
+    Nothing is deleted unless every word exists and belongs to the user.
+    """
+    word_ids = set(word_ids)
+    result = db.execute(
+        delete(models.Word)
+        .where(models.Word.id.in_(word_ids), models.Word.user_id == user_id)
+        .execution_options(synchronize_session="fetch")
+    )
+    if result.rowcount != len(word_ids):
+        db.rollback()
+        check_own_words(word_ids, user_id, db)
+        raise NotFoundError
+    db.commit()
+    update_similarity_index(user_id, removed=word_ids)
+
+
+def update_similarity_index(user_id: UUID, *, added=(), removed=()) -> None:
+    """Keep the user's in-process trigram index, if one is loaded, current.
+
+    `added` holds (id, new_word) pairs of created or renamed words.
+    """
+    with _similarity_indexes_lock:
+        index = _similarity_indexes.get(user_id)
+    if index is not None:
+        index.remove(removed)
+        index.add(added)
+
+
+def clear_similarity_indexes() -> None:
+    with _similarity_indexes_lock:
+        _similarity_indexes.clear()
+
+
+def _similarity_index(user_id: UUID, db: Session) -> TrigramIndex:
+    with _similarity_indexes_lock:
+        index = _similarity_indexes.get(user_id)
+        if index is not None:
+            _similarity_indexes.move_to_end(user_id)
+            return index
+
+    index = TrigramIndex(
+        db.execute(
+            select(models.Word.id, models.Word.new_word).where(
+                models.Word.user_id == user_id
+            )
+        ).all()
+    )
+    with _similarity_indexes_lock:
+        index = _similarity_indexes.setdefault(user_id, index)
+        while len(_similarity_indexes) > SIMILARITY_INDEX_MAX_USERS:
+            _similarity_indexes.popitem(last=False)
+    return index
+
+
+def find_similar_words(
+    query: str, user_id: UUID, db: Session, *, limit: int = 10
+) -> list[schemas.SimilarWord]:
+    """The user's words most similar to `query` by trigram similarity.
+
+    PostgreSQL answers from the GIN index on (user_id, new_word). Other databases
+    use a per-user in-process index, whose hits are re-read from the table.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        score = func.similarity(models.Word.new_word, query)
+        rows = db.execute(
+            select(models.Word.id, models.Word.new_word, score.label("similarity"))
+            .where(
+                models.Word.user_id == user_id,
+                models.Word.new_word.op("%")(query),
+            )
+            .order_by(score.desc(), models.Word.id)
+            .limit(limit)
+        ).all()
+        return [schemas.SimilarWord.model_validate(row) for row in rows]
+
+    hits = _similarity_index(user_id, db).search(query, limit)
+    if not hits:
+        return []
+    # Looked up by primary key alone: with user_id in the WHERE clause, SQLite
+    # may scan all of the user's words through an index on user_id instead
+    rows = db.execute(
+        select(models.Word.id, models.Word.new_word, models.Word.user_id).where(
+            models.Word.id.in_([word_id for word_id, _ in hits])
+        )
+    ).all()
+    results = [
+        schemas.SimilarWord(
+            id=row.id,
+            new_word=row.new_word,
+            similarity=similarity(row.new_word, query),
+        )
+        for row in rows
+        if row.user_id == user_id
+    ]
+    results = [word for word in results if word.similarity >= SIMILARITY_THRESHOLD]
+    results.sort(key=lambda word: (-word.similarity, word.id))
+    return results
@@ -1,23 +1,55 @@
+import threading
 from typing import Any, Generator
 
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
-from sqlalchemy import StaticPool, create_engine
+from sqlalchemy import StaticPool, create_engine, event
 from sqlalchemy.orm import Session
 
-from app import models, schemas
+from app import constants, models, schemas
 from app.constants import ACCESS_TOKEN_EXPIRE_MINUTES
 from app.models import Base
 from app.services import dictlists as dictlist_service
 from app.services import languages as lang_service
 from app.services import users as user_service
 from app.services import words as word_service
+from app.utils import password_utils
 from app.utils.auth_utils import create_access_token
 
 TEST_DATABASE_URL = "sqlite:///:memory:"
 
 
+@pytest.fixture(scope="session", autouse=True)
+def strict_loading():
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(constants, "SQL_STRICT_LOADING", True)
+        yield
+
+
+@pytest.fixture(autouse=True)
+def similarity_indexes():
+    yield
+    word_service.clear_similarity_indexes()
+
+
+@pytest.fixture(autouse=True)
+def language_cache():
+    yield
+    lang_service.clear_language_cache()
+
+
+@pytest.fixture(autouse=True)
+def user_cache():
+    yield
+    user_service.clear_user_cache()
+
+
+@pytest.fixture
+def accents_stripped(monkeypatch):
+    monkeypatch.setattr(constants, "WORD_KEY_STRIP_ACCENTS", True)
+
+
 @pytest.fixture(scope="session")
 def app() -> Generator[FastAPI, Any, None]:
     from app.main import app
@@ -33,6 +65,12 @@ def db_session() -> Generator[Session]:
         poolclass=StaticPool,
     )
 
+    # SQLite leaves foreign keys unenforced unless asked, so the ON DELETE
+    # CASCADE rules would not run
+    @event.listens_for(test_engine, "connect")
+    def _enable_foreign_keys(dbapi_connection, connection_record):
+        dbapi_connection.execute("PRAGMA foreign_keys=ON")
+
     Base.metadata.create_all(test_engine)
 
     with Session(bind=test_engine) as db:
@@ -41,6 +79,19 @@ def db_session() -> Generator[Session]:
     Base.metadata.drop_all(test_engine)
 
 
+@pytest.fixture
+def sql_statements(db_session) -> Generator[list[str]]:
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = db_session.get_bind()
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
 @pytest.fixture
 def client(app: FastAPI, db_session: Session) -> Generator[TestClient, Any, None]:
     from app.database import get_db
@@ -87,8 +138,11 @@ def admin(user, db_session):
 
 
 @pytest.fixture
-def mock_send_verification_email(mocker):
-    return mocker.patch("app.routers.users.send_verification_email")
+def saturated_password_hasher(monkeypatch):
+    # Every slot taken, as during a burst of logins
+    monkeypatch.setattr(
+        password_utils.password_hasher, "_slots", threading.Semaphore(0)
+    )
 
 
 @pytest.fixture
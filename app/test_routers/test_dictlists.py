@@ -3,6 +3,8 @@ import pytest
 from app import schemas
 from app.exceptions import NotFoundError
 from app.services import dictlists as dictlist_service
+from app.services import words as word_service
+from app.utils.anki_utils import AnkiPackageReader
 
 
 class TestCreateDictList:
@@ -25,6 +27,7 @@ class TestCreateDictList:
             "name": dictlist_data["name"],
             "created_at": data["created_at"],
             "max_words_limit": dictlist_data["max_words_limit"],
+            "word_count": 0,
         }
         assert data == expected_data
 
@@ -59,16 +62,36 @@ class TestGetAllDictLists:
     def test_get_all_user_dictlists(self, authorized_client, another_user_dictlist):
         response = authorized_client.get("/dictlists/")
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json()["items"] == []
 
     def test_get_all_user_dictlists_unauthorized(self, client):
         response = client.get("/dictlists/")
         assert response.status_code == 403
 
+    def test_get_all_dictlists_fixed_query_count(
+        self, authorized_client, user, language, db_session, sql_statements
+    ):
+        for i in range(5):
+            dictlist_service.create_dictlist(
+                schemas.DictListCreate(name=f"List {i}", lang_code="en-UK"),
+                user,
+                db_session,
+            )
+        db_session.expunge_all()
+        sql_statements.clear()
+
+        response = authorized_client.get("/dictlists/")
+        assert response.status_code == 200
+        data = response.json()["items"]
+        assert len(data) == 5
+        assert all(item["language"]["code"] == "en-UK" for item in data)
+        # The current user and the dictlists joined with languages
+        assert len(sql_statements) == 2
+
     def test_get_dictlists_filter_by_lang_code(self, authorized_client, dictlist):
         response = authorized_client.get(f"/dictlists/?lang_code={dictlist.lang_code}")
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["id"] == dictlist.id
 
@@ -77,7 +100,7 @@ class TestGetAllDictLists:
     ):
         response = authorized_client.get("/dictlists/?lang_code=fr-FR")
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json()["items"] == []
 
     def test_get_dictlists_filter_by_word(
         self, authorized_client, word, dictlist, db_session
@@ -87,7 +110,7 @@ class TestGetAllDictLists:
 
         response = authorized_client.get(f"/dictlists/?word_id={word.id}")
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["id"] == dictlist.id
 
@@ -96,7 +119,7 @@ class TestGetAllDictLists:
     ):
         response = authorized_client.get("/dictlists/?word_id=9999")
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json()["items"] == []
 
 
 class TestGetDictListById:
@@ -109,6 +132,16 @@ class TestGetDictListById:
         assert data["name"] == "My Vocabulary"
         assert data["user_id"] == str(dictlist.user_id)
 
+    def test_get_dictlist_word_count(
+        self, authorized_client, dictlist, word, db_session
+    ):
+        dictlist.words.append(word)
+        db_session.commit()
+
+        response = authorized_client.get(f"/dictlists/{dictlist.id}")
+        assert response.status_code == 200
+        assert response.json()["word_count"] == 1
+
     def test_get_dictlist_by_id_not_found(self, authorized_client):
         response = authorized_client.get("/dictlists/123")
         assert response.status_code == 404
@@ -200,6 +233,80 @@ class TestAssignDictListToWords:
         assert len(db_dictlist.words) == 1
         assert db_dictlist.words[0].id == word.id
 
+    def test_assign_many_words_fixed_query_count(
+        self, authorized_client, user, language, dictlist, db_session, sql_statements
+    ):
+        word_ids = [
+            word_service.create_word(
+                schemas.WordCreate(new_word=f"word{i}", lang_code="en-UK"),
+                user,
+                db_session,
+            ).id
+            for i in range(20)
+        ]
+        sql_statements.clear()
+
+        response = authorized_client.post(
+            f"/dictlists/{dictlist.id}/assign-words", json={"word_ids": word_ids}
+        )
+        assert response.status_code == 204
+        assert sum("FROM word" in sql for sql in sql_statements) == 1
+        assert sum("INSERT INTO dictlist_words" in sql for sql in sql_statements) == 1
+        db_dictlist = dictlist_service.get_dictlist_by_id(dictlist.id, db_session)
+        assert {w.id for w in db_dictlist.words} == set(word_ids)
+        assert db_dictlist.word_count == len(word_ids)
+
+    def test_assign_already_assigned_word(
+        self, authorized_client, dictlist, word, db_session
+    ):
+        dictlist.words.append(word)
+        db_session.commit()
+
+        response = authorized_client.post(
+            f"/dictlists/{dictlist.id}/assign-words", json={"word_ids": [word.id]}
+        )
+        assert response.status_code == 204
+        db_dictlist = dictlist_service.get_dictlist_by_id(dictlist.id, db_session)
+        assert len(db_dictlist.words) == 1
+        assert db_dictlist.word_count == 1
+
+    def test_assign_nonexistent_word(self, authorized_client, dictlist, word):
+        response = authorized_client.post(
+            f"/dictlists/{dictlist.id}/assign-words",
+            json={"word_ids": [word.id, 9999]},
+        )
+        assert response.status_code == 404
+
+    def test_assign_other_user_word(
+        self, authorized_client, dictlist, word, another_user_word, db_session
+    ):
+        response = authorized_client.post(
+            f"/dictlists/{dictlist.id}/assign-words",
+            json={"word_ids": [word.id, another_user_word.id]},
+        )
+        assert response.status_code == 403
+        db_dictlist = dictlist_service.get_dictlist_by_id(dictlist.id, db_session)
+        assert len(db_dictlist.words) == 0
+
+    def test_assign_over_words_limit(
+        self, authorized_client, user, language, word, db_session
+    ):
+        limited = dictlist_service.create_dictlist(
+            schemas.DictListCreate(name="Limited", max_words_limit=1), user, db_session
+        )
+        another_word = word_service.create_word(
+            schemas.WordCreate(new_word="plant", lang_code="en-UK"), user, db_session
+        )
+
+        response = authorized_client.post(
+            f"/dictlists/{limited.id}/assign-words",
+            json={"word_ids": [word.id, another_word.id]},
+        )
+        assert response.status_code == 400
+        db_dictlist = dictlist_service.get_dictlist_by_id(limited.id, db_session)
+        assert len(db_dictlist.words) == 0
+        assert db_dictlist.word_count == 0
+
     def test_assign_empty_wordlist(self, authorized_client, dictlist, db_session):
         response = authorized_client.post(
             f"/dictlists/{dictlist.id}/assign-words", json={"word_ids": []}
@@ -208,6 +315,15 @@ class TestAssignDictListToWords:
         db_dictlist = dictlist_service.get_dictlist_by_id(dictlist.id, db_session)
         assert len(db_dictlist.words) == 0
 
+    def test_assign_too_many_words(self, authorized_client, dictlist, sql_statements):
+        sql_statements.clear()
+        response = authorized_client.post(
+            f"/dictlists/{dictlist.id}/assign-words",
+            json={"word_ids": list(range(1, 5002))},
+        )
+        assert response.status_code == 422
+        assert not any("dictlist_words" in statement for statement in sql_statements)
+
 
 class TestUnassignDictListFromWords:
     """POST /dictlists/{dictlist_id}/unassign-words"""
@@ -225,6 +341,16 @@ class TestUnassignDictListFromWords:
         assert response.status_code == 204
         db_dictlist = dictlist_service.get_dictlist_by_id(dictlist.id, db_session)
         assert len(db_dictlist.words) == 0
+        assert db_dictlist.word_count == 0
+
+    def test_unassign_not_assigned_word(
+        self, authorized_client, dictlist, word, db_session
+    ):
+        response = authorized_client.post(
+            f"/dictlists/{dictlist.id}/unassign-words",
+            json={"word_ids": [word.id]},
+        )
+        assert response.status_code == 400
 
     def test_unassign_empty_wordlist(
         self,
@@ -239,3 +365,37 @@ class TestUnassignDictListFromWords:
         assert response.status_code == 422
         db_dictlist = dictlist_service.get_dictlist_by_id(dictlist.id, db_session)
         assert len(db_dictlist.words) == 0
+
+
+class TestExportDictListToAnki:
+    """GET /dictlists/{dictlist_id}/export/anki"""
+
+    def test_export_round_trip(self, authorized_client, dictlist, word, tmp_path):
+        authorized_client.post(
+            f"/dictlists/{dictlist.id}/assign-words", json={"word_ids": [word.id]}
+        )
+        response = authorized_client.get(f"/dictlists/{dictlist.id}/export/anki")
+        assert response.status_code == 200
+        package_path = tmp_path / "export.apkg"
+        package_path.write_bytes(response.content)
+
+        with AnkiPackageReader(package_path, tmp_path) as reader:
+            assert reader.deck_name() == "My Vocabulary"
+            notes = [note for batch in reader.iter_note_batches() for note in batch]
+        assert len(notes) == 1
+        assert notes[0].fields["Front"] == "animal"
+        assert notes[0].fields["Context"] == (
+            "Wild animals live in the forest<br>My favorite animal is a dog"
+        )
+
+    def test_export_another_user_dictlist(
+        self, authorized_client, another_user_dictlist
+    ):
+        response = authorized_client.get(
+            f"/dictlists/{another_user_dictlist.id}/export/anki"
+        )
+        assert response.status_code == 403
+
+    def test_export_dictlist_not_found(self, authorized_client):
+        response = authorized_client.get("/dictlists/999/export/anki")
+        assert response.status_code == 404
@@ -0,0 +1,179 @@
+from datetime import date, datetime, timezone
+from itertools import cycle
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.orm import sessionmaker
+
+from app import models, schemas
+from app.services import digests as digest_service
+from app.services import users as user_service
+from app.services import words as word_service
+
+DAY = date(2026, 10, 16)
+
+
+def set_role(user, role, db_session):
+    user.role = role
+    db_session.commit()
+
+
+def add_words(user, db_session, created_at, *words):
+    results = word_service.create_words_bulk(
+        [schemas.WordCreate(lang_code="en-UK", **word) for word in words],
+        user.id,
+        db_session,
+    )
+    db_session.execute(
+        update(models.Word)
+        .where(models.Word.id.in_([result.id for result in results]))
+        .values(created_at=created_at)
+    )
+    db_session.commit()
+
+
+def outbox(db_session) -> dict[str, str]:
+    return {
+        email.recipient: email.body
+        for email in db_session.scalars(select(models.EmailOutbox))
+    }
+
+
+@pytest.fixture
+def session_factory(db_session):
+    return sessionmaker(bind=db_session.get_bind())
+
+
+class TestQueueDailyDigests:
+    def test_digest_of_verified_users(
+        self, user, another_user, language, db_session, session_factory
+    ):
+        set_role(user, models.UserRole.AuthorizedUser, db_session)
+        add_words(
+            user,
+            db_session,
+            datetime(2026, 10, 16, 9, tzinfo=timezone.utc),
+            {"new_word": "dawn", "translation": "світанок", "contexts": ["At dawn"]},
+            {"new_word": "dusk"},
+        )
+        add_words(
+            user,
+            db_session,
+            datetime(2026, 10, 1, tzinfo=timezone.utc),
+            {"new_word": "noon"},
+        )
+        add_words(
+            user,
+            db_session,
+            datetime(2026, 10, 17, tzinfo=timezone.utc),
+            {"new_word": "midnight"},
+        )
+        add_words(
+            another_user,
+            db_session,
+            datetime(2026, 10, 16, tzinfo=timezone.utc),
+            {"new_word": "unverified"},
+        )
+
+        processed, queued = digest_service.queue_daily_digests(session_factory, DAY)
+        assert (processed, queued) == (1, 1)
+
+        body = outbox(db_session)[user.email]
+        assert "You added 2 words on 2026-10-16" in body
+        assert "<b>dawn</b> — світанок<br><i>At dawn</i>" in body
+        assert "<b>dusk</b>" in body
+        assert "Words to review:</p><ul><li><b>noon</b></li></ul>" in body
+        assert "midnight" not in body
+
+        db_session.refresh(user)
+        assert user.last_digest_on == DAY
+
+    def test_review_words_picked_from_all_words(
+        self, user, language, db_session, session_factory, sql_statements
+    ):
+        set_role(user, models.UserRole.AuthorizedUser, db_session)
+        old_words = [f"word{i:02}" for i in range(20)]
+        add_words(
+            user,
+            db_session,
+            datetime(2026, 10, 1, tzinfo=timezone.utc),
+            *({"new_word": word} for word in old_words),
+        )
+        sql_statements.clear()
+
+        digest_service.queue_daily_digests(session_factory, DAY)
+
+        body = outbox(db_session)[user.email]
+        reviewed = [word for word in old_words if f"<b>{word}</b>" in body]
+        assert len(reviewed) == digest_service.DIGEST_REVIEW_WORDS
+        assert not any("random()" in statement for statement in sql_statements)
+
+    def test_review_words_offset_per_user(
+        self, user, another_user, language, db_session, session_factory, monkeypatch
+    ):
+        offsets = cycle([0.0, 0.99])
+        monkeypatch.setattr(
+            digest_service, "random", SimpleNamespace(random=lambda: next(offsets))
+        )
+        count = 2 * digest_service.DIGEST_REVIEW_WORDS
+        reviewed = []
+        for owner in (user, another_user):
+            set_role(owner, models.UserRole.AuthorizedUser, db_session)
+            add_words(
+                owner,
+                db_session,
+                datetime(2026, 10, 1, tzinfo=timezone.utc),
+                *({"new_word": f"word{i:02}"} for i in range(count)),
+            )
+
+        digest_service.queue_daily_digests(session_factory, DAY)
+
+        for owner in (user, another_user):
+            body = outbox(db_session)[owner.email]
+            reviewed.append([i for i in range(count) if f"<b>word{i:02}</b>" in body])
+        # One user gets the first word of each part, the other a later one
+        assert list(range(0, count, 2)) in reviewed
+        assert reviewed[0] != reviewed[1]
+
+    def test_rerun_skips_users_done(self, user, language, db_session, session_factory):
+        set_role(user, models.UserRole.AuthorizedUser, db_session)
+        add_words(
+            user,
+            db_session,
+            datetime(2026, 10, 16, tzinfo=timezone.utc),
+            {"new_word": "dawn"},
+        )
+
+        assert digest_service.queue_daily_digests(session_factory, DAY) == (1, 1)
+        assert digest_service.queue_daily_digests(session_factory, DAY) == (0, 0)
+        assert len(outbox(db_session)) == 1
+
+    def test_users_without_words_get_no_email(
+        self, user, language, db_session, session_factory
+    ):
+        set_role(user, models.UserRole.Admin, db_session)
+
+        assert digest_service.queue_daily_digests(session_factory, DAY) == (1, 0)
+        assert outbox(db_session) == {}
+
+    def test_users_walked_in_batches(self, language, db_session, session_factory):
+        for i in range(5):
+            user = user_service.create_user(
+                schemas.UserCreate(
+                    username=f"user{i}", email=f"user{i}@example.com", password="secret"
+                ),
+                db_session,
+            )
+            set_role(user, models.UserRole.AuthorizedUser, db_session)
+            add_words(
+                user,
+                db_session,
+                datetime(2026, 10, 16, tzinfo=timezone.utc),
+                {"new_word": f"word{i}"},
+            )
+
+        assert digest_service.queue_daily_digests(
+            session_factory, DAY, batch_size=2
+        ) == (5, 5)
+        assert sorted(outbox(db_session)) == [f"user{i}@example.com" for i in range(5)]
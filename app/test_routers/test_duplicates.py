@@ -0,0 +1,197 @@
+import pytest
+
+from app import models, schemas
+from app.services import dictlists as dictlist_service
+from app.services import jobs as job_service
+from app.services import words as word_service
+
+
+@pytest.fixture
+def duplicate_words(accents_stripped, user, language, db_session):
+    """Three spellings of "apple", one of them only when accents are stripped."""
+    results = word_service.create_words_bulk(
+        [
+            schemas.WordCreate(
+                new_word="Apple", lang_code="en-UK", contexts=["I ate an apple"]
+            ),
+            schemas.WordCreate(
+                new_word="apple ",
+                translation="яблуко",
+                lang_code="en-UK",
+                contexts=["I ate an apple", "Green apple"],
+            ),
+            schemas.WordCreate(new_word="ápple", note="fruit", lang_code="en-UK"),
+            schemas.WordCreate(new_word="pear", lang_code="en-UK"),
+        ],
+        user.id,
+        db_session,
+    )
+    return [result.id for result in results]
+
+
+def start_scan(client) -> int:
+    response = client.post("/duplicates/scans")
+    assert response.status_code == 202
+    return response.json()["id"]
+
+
+class TestDuplicateScan:
+    """POST /duplicates/scans and GET /duplicates/scans/{job_id}/clusters"""
+
+    def test_scan_finds_clusters(
+        self, authorized_client, duplicate_words, another_user_word
+    ):
+        job_id = start_scan(authorized_client)
+
+        job = authorized_client.get(f"/jobs/{job_id}").json()
+        assert job["kind"] == models.JobKind.DuplicateScan
+        assert job["status"] == models.JobStatus.Done
+        assert job["processed_rows"] == 3
+
+        response = authorized_client.get(f"/duplicates/scans/{job_id}/clusters")
+        assert response.status_code == 200
+        apple, apple_dup, apple_accent, _ = duplicate_words
+        assert response.json() == {
+            "items": [
+                {
+                    "keeper_id": apple,
+                    "words": [
+                        {"id": apple, "new_word": "Apple", "translation": None},
+                        {
+                            "id": apple_dup,
+                            "new_word": "apple ",
+                            "translation": "яблуко",
+                        },
+                        {"id": apple_accent, "new_word": "ápple", "translation": None},
+                    ],
+                }
+            ],
+            "next_cursor": None,
+        }
+
+    def test_accents_tell_words_apart(
+        self, authorized_client, user, language, db_session
+    ):
+        ano, _, ano_dup = word_service.create_words_bulk(
+            [
+                schemas.WordCreate(new_word="ano", lang_code="en-UK"),
+                schemas.WordCreate(new_word="año", lang_code="en-UK"),
+                schemas.WordCreate(new_word="Ano", lang_code="en-UK"),
+            ],
+            user.id,
+            db_session,
+        )
+        job_id = start_scan(authorized_client)
+
+        response = authorized_client.get(f"/duplicates/scans/{job_id}/clusters")
+        assert [
+            [word["id"] for word in cluster["words"]]
+            for cluster in response.json()["items"]
+        ] == [[ano.id, ano_dup.id]]
+
+    def test_clusters_paginated(
+        self, authorized_client, duplicate_words, user, db_session
+    ):
+        word_service.create_words_bulk(
+            [
+                schemas.WordCreate(new_word="Pear", lang_code="en-UK"),
+            ],
+            user.id,
+            db_session,
+        )
+        job_id = start_scan(authorized_client)
+
+        response = authorized_client.get(
+            f"/duplicates/scans/{job_id}/clusters", params={"limit": 1}
+        )
+        data = response.json()
+        assert [cluster["keeper_id"] for cluster in data["items"]] == [
+            duplicate_words[0]
+        ]
+
+        response = authorized_client.get(
+            f"/duplicates/scans/{job_id}/clusters",
+            params={"limit": 1, "cursor": data["next_cursor"]},
+        )
+        data = response.json()
+        assert [cluster["keeper_id"] for cluster in data["items"]] == [
+            duplicate_words[3]
+        ]
+        assert data["next_cursor"] is None
+
+    def test_clusters_of_other_job_kind(self, authorized_client, user, db_session):
+        job = job_service.create_job(models.JobKind.WordImport, user.id, db_session)
+        response = authorized_client.get(f"/duplicates/scans/{job.id}/clusters")
+        assert response.status_code == 404
+
+
+class TestDuplicateMerge:
+    """POST /duplicates/scans/{job_id}/merge"""
+
+    def test_merge_duplicates(
+        self, authorized_client, duplicate_words, user, language, db_session
+    ):
+        apple, apple_dup, apple_accent, pear = duplicate_words
+        first = dictlist_service.create_dictlist(
+            schemas.DictListCreate(name="First", max_words_limit=2), user, db_session
+        )
+        second = dictlist_service.create_dictlist(
+            schemas.DictListCreate(name="Second"), user, db_session
+        )
+        dictlist_service.assign_words(
+            first, [apple_dup, apple_accent], user.id, db_session
+        )
+        dictlist_service.assign_words(
+            second, [apple, apple_dup, pear], user.id, db_session
+        )
+        job_id = start_scan(authorized_client)
+
+        response = authorized_client.post(f"/duplicates/scans/{job_id}/merge")
+        assert response.status_code == 202
+        job = authorized_client.get(f"/jobs/{response.json()['id']}").json()
+        assert job["kind"] == models.JobKind.DuplicateMerge
+        assert job["status"] == models.JobStatus.Done
+        assert job["processed_rows"] == 2
+
+        response = authorized_client.get("/words/")
+        words = {word["id"]: word for word in response.json()["items"]}
+        assert set(words) == {apple, pear}
+        assert words[apple]["translation"] == "яблуко"
+        assert words[apple]["note"] == "fruit"
+        assert words[apple]["contexts"] == ["I ate an apple", "Green apple"]
+
+        for dictlist, expected in ((first, {apple}), (second, {apple, pear})):
+            response = authorized_client.get(
+                "/words/", params={"dictlist_id": dictlist.id}
+            )
+            assert {word["id"] for word in response.json()["items"]} == expected
+            db_session.refresh(dictlist)
+            assert dictlist.word_count == len(expected)
+
+    def test_merge_skips_changed_words(
+        self, authorized_client, duplicate_words, db_session
+    ):
+        apple, apple_dup, apple_accent, _ = duplicate_words
+        job_id = start_scan(authorized_client)
+        authorized_client.patch(f"/words/{apple_dup}", json={"new_word": "orange"})
+
+        response = authorized_client.post(f"/duplicates/scans/{job_id}/merge")
+        job = authorized_client.get(f"/jobs/{response.json()['id']}").json()
+        assert job["processed_rows"] == 1
+
+        response = authorized_client.get("/words/")
+        ids = {word["id"] for word in response.json()["items"]}
+        assert {apple, apple_dup} <= ids
+        assert apple_accent not in ids
+
+    def test_merge_unfinished_scan(self, authorized_client, user, db_session):
+        job = job_service.create_job(models.JobKind.DuplicateScan, user.id, db_session)
+        response = authorized_client.post(f"/duplicates/scans/{job.id}/merge")
+        assert response.status_code == 400
+
+    def test_merge_other_user_scan(self, authorized_client, another_user, db_session):
+        job = job_service.create_job(
+            models.JobKind.DuplicateScan, another_user.id, db_session
+        )
+        response = authorized_client.post(f"/duplicates/scans/{job.id}/merge")
+        assert response.status_code == 403
@@ -0,0 +1,156 @@
+import socket
+import time
+from datetime import timedelta
+
+import pytest
+from aiosmtpd.controller import Controller
+from sqlalchemy import select
+
+from app import models
+from app.services import emails as email_service
+from app.utils.datetime_utils import utc_now
+from app.utils.email_utils import SMTPSender
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class RecordingHandler:
+    def __init__(self):
+        self.connections = 0
+        self.messages = []
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):  # noqa: N802
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):  # noqa: N802
+        if address.startswith("refused@"):
+            return "550 Mailbox unavailable"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):  # noqa: N802
+        self.messages.append(envelope)
+        return "250 Message accepted"
+
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    server = Controller(handler, hostname="127.0.0.1", port=free_port())
+    server.start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def sender(smtp_server):
+    sender = SMTPSender(smtp_server.hostname, smtp_server.port, timeout=5)
+    yield sender
+    sender.close()
+
+
+def queue(db_session, *recipients):
+    for recipient in recipients:
+        email_service.queue_email(recipient, "Subject", "<p>Body</p>", db_session)
+    db_session.commit()
+
+
+def outbox(db_session) -> list[models.EmailOutbox]:
+    db_session.expire_all()
+    return db_session.scalars(
+        select(models.EmailOutbox).order_by(models.EmailOutbox.id)
+    ).all()
+
+
+class TestDeliverPending:
+    def test_batch_sent_over_one_connection(self, smtp_server, sender, db_session):
+        queue(db_session, "a@example.com", "b@example.com", "c@example.com")
+
+        assert email_service.deliver_pending(sender, db_session) == (3, 0)
+        queue(db_session, "d@example.com")
+        assert email_service.deliver_pending(sender, db_session) == (1, 0)
+
+        handler = smtp_server.handler
+        assert [message.rcpt_tos for message in handler.messages] == [
+            ["a@example.com"],
+            ["b@example.com"],
+            ["c@example.com"],
+            ["d@example.com"],
+        ]
+        assert handler.connections == 1
+        assert outbox(db_session) == []
+        assert email_service.get_outbox_depth(db_session) == 0
+
+    def test_batch_size(self, smtp_server, sender, db_session):
+        queue(db_session, "a@example.com", "b@example.com", "c@example.com")
+
+        sent, failed = email_service.deliver_pending(sender, db_session, batch_size=2)
+        assert (sent, failed) == (2, 0)
+        assert email_service.get_outbox_depth(db_session) == 1
+
+    def test_refused_email_retried_later(self, smtp_server, sender, db_session):
+        queue(db_session, "refused@example.com", "a@example.com")
+
+        assert email_service.deliver_pending(sender, db_session) == (1, 1)
+        (email,) = outbox(db_session)
+        assert email.recipient == "refused@example.com"
+        assert email.attempts == 1
+        assert email.last_error
+        assert email.next_attempt_at > utc_now().replace(tzinfo=None)
+        assert email_service.get_outbox_depth(db_session) == 1
+        assert email_service.deliver_pending(sender, db_session) == (0, 0)
+
+    def test_gives_up_after_max_attempts(self, smtp_server, sender, db_session):
+        queue(db_session, "refused@example.com")
+        (email,) = outbox(db_session)
+        email.attempts = email_service.EMAIL_MAX_ATTEMPTS - 1
+        db_session.commit()
+
+        assert email_service.deliver_pending(sender, db_session) == (0, 1)
+        (email,) = outbox(db_session)
+        assert email.attempts == email_service.EMAIL_MAX_ATTEMPTS
+        assert email.next_attempt_at is None
+        assert email_service.get_outbox_depth(db_session) == 0
+
+    def test_unreachable_server_ends_batch(self, db_session):
+        queue(db_session, "a@example.com", "b@example.com")
+        sender = SMTPSender("127.0.0.1", free_port(), timeout=5)
+
+        assert email_service.deliver_pending(sender, db_session) == (0, 1)
+        first, second = outbox(db_session)
+        assert first.attempts == 1
+        assert second.attempts == 0
+        assert second.next_attempt_at <= utc_now().replace(tzinfo=None)
+
+    def test_reconnects_after_dropped_connection(self, smtp_server, sender, db_session):
+        queue(db_session, "a@example.com")
+        email_service.deliver_pending(sender, db_session)
+        sender._smtp.close()
+
+        queue(db_session, "b@example.com")
+        assert email_service.deliver_pending(sender, db_session) == (1, 0)
+        assert smtp_server.handler.connections == 2
+
+    def test_rate_limit(self, smtp_server, db_session):
+        queue(db_session, "a@example.com", "b@example.com", "c@example.com")
+        sender = SMTPSender(smtp_server.hostname, smtp_server.port, max_rate=20)
+
+        started = time.monotonic()
+        assert email_service.deliver_pending(sender, db_session) == (3, 0)
+        assert time.monotonic() - started >= 0.1
+        sender.close()
+
+    def test_retry_delay_backs_off(self):
+        delays = [email_service._retry_delay(attempts) for attempts in (1, 2, 3, 30)]
+        assert delays == [
+            timedelta(seconds=30),
+            timedelta(seconds=60),
+            timedelta(seconds=120),
+            email_service.EMAIL_MAX_RETRY_DELAY,
+        ]
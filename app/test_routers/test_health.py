@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.pool import QueuePool
+
+from app import database
+from app.utils.pool_utils import (
+    PoolStats,
+    instrumented_pool_class,
+    listen_pool_events,
+)
+
+
+@pytest.fixture
+def pool_stats():
+    return PoolStats("sync", max_overflow=0)
+
+
+@pytest.fixture
+def pool_engine(pool_stats, tmp_path):
+    """An engine of a single connection, instrumented into `pool_stats`."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=instrumented_pool_class(QueuePool, pool_stats),
+        pool_size=1,
+        max_overflow=pool_stats.max_overflow,
+        pool_timeout=0.05,
+    )
+    listen_pool_events(engine, pool_stats)
+    yield engine
+    engine.dispose()
+
+
+class TestPoolStats:
+    def test_connections_in_use_and_idle(self, pool_stats, pool_engine):
+        with pool_engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            snapshot = pool_stats.snapshot()
+            assert (snapshot["in_use"], snapshot["idle"]) == (1, 0)
+            assert snapshot["saturation"] == 1
+
+        snapshot = pool_stats.snapshot()
+        assert snapshot["connections"] == 1
+        assert (snapshot["in_use"], snapshot["idle"]) == (0, 1)
+        assert snapshot["checkout_waits"] == 1
+
+    def test_checkout_timeout(self, pool_stats, pool_engine):
+        with pool_engine.connect():
+            with pytest.raises(exc.TimeoutError):
+                pool_engine.connect()
+
+        assert pool_stats.checkout_timeouts == 1
+        assert pool_stats.checkout_waits == 2
+        assert pool_stats.checkout_wait_seconds >= 0.05
+
+
+@pytest.fixture
+def ready_pool(pool_stats, pool_engine, monkeypatch):
+    """Readiness probes ping `pool_engine` instead of the configured database."""
+    monkeypatch.setattr(database, "engine", pool_engine)
+    monkeypatch.setattr(database, "pool_stats", {"sync": pool_stats})
+    return pool_engine
+
+
+class TestReadiness:
+    def test_ready(self, client, ready_pool):
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
+        assert response.json()["db_latency_ms"] >= 0
+
+    def test_saturated_pool_not_pinged(self, client, pool_stats, ready_pool):
+        with ready_pool.connect():
+            response = client.get("/health/ready")
+
+        assert response.status_code == 503
+        body = response.json()
+        assert body["status"] == "saturated"
+        assert body["db_latency_ms"] is None
+        assert body["pools"]["sync"]["in_use"] == 1
+        assert pool_stats.checkout_waits == 1
@@ -0,0 +1,294 @@
+import json
+import sqlite3
+import zipfile
+
+import pytest
+from sqlalchemy import func, select
+
+from app import constants, models, schemas
+from app.services import dictlists as dictlist_service
+from app.services import imports as import_service
+from app.services import jobs as job_service
+from app.utils.anki_utils import ExportNote, write_package
+
+
+def upload(client, content: str, filename="words.csv", **params):
+    return client.post(
+        "/imports/words",
+        params=params,
+        files={"file": (filename, content.encode(), "text/csv")},
+    )
+
+
+class TestImportWords:
+    """POST /imports/words"""
+
+    def test_import_words_success(self, authorized_client, language, db_session):
+        content = (
+            "new_word,translation,note,lang_code,contexts\n"
+            "animal,тварина,,en-UK,Wild animals live here|My favorite animal\n"
+            ",missing,,en-UK,\n"
+            "chien,dog,,fr-FR,\n"
+            "plant,рослина,a note,en-UK,\n"
+        )
+        response = upload(authorized_client, content)
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        response = authorized_client.get(f"/jobs/{job_id}")
+        assert response.status_code == 200
+        job = response.json()
+        assert job["status"] == models.JobStatus.Done
+        assert job["progress"] == 1.0
+        assert job["processed_rows"] == 4
+        assert job["imported_rows"] == 2
+        assert job["failed_rows"] == 2
+
+        response = authorized_client.get("/words/")
+        words = {word["new_word"]: word for word in response.json()["items"]}
+        assert set(words) == {"animal", "plant"}
+        assert words["animal"]["contexts"] == [
+            "Wild animals live here",
+            "My favorite animal",
+        ]
+        assert words["plant"]["note"] == "a note"
+
+        response = authorized_client.get(f"/jobs/{job_id}/errors")
+        assert response.status_code == 200
+        lines = response.text.splitlines()
+        assert lines[0] == "row,error"
+        assert [line.split(",")[0] for line in lines[1:]] == ["3", "4"]
+
+    def test_import_words_tsv_into_dictlist(
+        self, authorized_client, dictlist, db_session
+    ):
+        content = "new_word\tlang_code\nanimal\ten-UK\nplant\ten-UK\n"
+        response = upload(
+            authorized_client, content, filename="words.tsv", dictlist_id=dictlist.id
+        )
+        assert response.status_code == 202
+        job = job_service.get_job_by_id(response.json()["id"], db_session)
+        assert job.status == models.JobStatus.Done
+        assert job.imported_rows == 2
+
+        db_dictlist = dictlist_service.get_dictlist_by_id(dictlist.id, db_session)
+        assert db_dictlist.word_count == 2
+
+    def test_import_words_over_dictlist_limit(
+        self, authorized_client, user, language, db_session, monkeypatch
+    ):
+        monkeypatch.setattr(import_service, "IMPORT_BATCH_SIZE", 1)
+        limited = dictlist_service.create_dictlist(
+            schemas.DictListCreate(name="Limited", max_words_limit=1), user, db_session
+        )
+        content = "new_word,lang_code\nanimal,en-UK\nplant,en-UK\n"
+        response = upload(authorized_client, content, dictlist_id=limited.id)
+        assert response.status_code == 202
+
+        # The batch over the limit is not imported, and only counts as failed
+        job = authorized_client.get(f"/jobs/{response.json()['id']}").json()
+        assert job["status"] == models.JobStatus.Done
+        assert job["imported_rows"] == 1
+        assert job["failed_rows"] == 1
+        words = db_session.scalars(
+            select(models.Word.new_word).where(models.Word.user_id == user.id)
+        ).all()
+        assert words == ["animal"]
+        db_session.refresh(limited)
+        assert limited.word_count == 1
+
+    def test_import_words_too_large(
+        self, authorized_client, language, db_session, monkeypatch
+    ):
+        monkeypatch.setattr(constants, "IMPORT_MAX_BYTES", 16)
+        response = upload(authorized_client, "new_word,lang_code\nanimal,en-UK\n")
+        assert response.status_code == 413
+        assert db_session.scalars(select(models.Job)).all() == []
+
+    def test_import_words_missing_columns(self, authorized_client, language):
+        response = upload(authorized_client, "word,translation\nanimal,тварина\n")
+        assert response.status_code == 202
+
+        job = authorized_client.get(f"/jobs/{response.json()['id']}").json()
+        assert job["status"] == models.JobStatus.Failed
+        assert job["imported_rows"] == 0
+
+    def test_import_words_other_user_dictlist(
+        self, authorized_client, another_user_dictlist
+    ):
+        response = upload(
+            authorized_client,
+            "new_word,lang_code\nanimal,en-UK\n",
+            dictlist_id=another_user_dictlist.id,
+        )
+        assert response.status_code == 403
+
+    def test_import_words_unauthorized(self, client):
+        response = upload(client, "new_word,lang_code\nanimal,en-UK\n")
+        assert response.status_code == 403
+
+
+class TestGetJob:
+    """GET /jobs/{job_id}"""
+
+    def test_get_job_not_found(self, authorized_client):
+        response = authorized_client.get("/jobs/9999")
+        assert response.status_code == 404
+
+    def test_get_job_forbidden(self, authorized_client, another_user, db_session):
+        job = job_service.create_job(
+            models.JobKind.WordImport, another_user.id, db_session
+        )
+        response = authorized_client.get(f"/jobs/{job.id}")
+        assert response.status_code == 403
+
+
+def build_deck(tmp_path, notes) -> bytes:
+    package_path = tmp_path / "deck.apkg"
+    workdir = tmp_path / "build"
+    workdir.mkdir()
+    write_package(package_path, workdir, "Animals", [notes])
+    return package_path.read_bytes()
+
+
+def build_nested_decks(tmp_path) -> bytes:
+    """A package with a note in Animals, Animals::Birds and Plants each."""
+    notes = [
+        ExportNote(guid="a", front="animal"),
+        ExportNote(guid="b", front="bird"),
+        ExportNote(guid="c", front="plant"),
+    ]
+    workdir = tmp_path / "build"
+    workdir.mkdir()
+    write_package(tmp_path / "single.apkg", workdir, "Animals", [notes])
+
+    conn = sqlite3.connect(workdir / "collection.anki2")
+    (decks_json,) = conn.execute("SELECT decks FROM col").fetchone()
+    decks = json.loads(decks_json)
+    for deck_id, name in ((2, "Animals::Birds"), (3, "Plants")):
+        decks[str(deck_id)] = {**decks["1"], "id": deck_id, "name": name}
+    conn.execute("UPDATE col SET decks = ?", (json.dumps(decks),))
+    card_ids = [row[0] for row in conn.execute("SELECT id FROM cards ORDER BY id")]
+    for card_id, deck_id in zip(card_ids[1:], (2, 3), strict=True):
+        conn.execute("UPDATE cards SET did = ? WHERE id = ?", (deck_id, card_id))
+    conn.commit()
+    conn.close()
+
+    package_path = tmp_path / "decks.apkg"
+    with zipfile.ZipFile(package_path, "w") as archive:
+        archive.write(workdir / "collection.anki2", "collection.anki2")
+        archive.writestr("media", "{}")
+    return package_path.read_bytes()
+
+
+class TestImportAnki:
+    """POST /imports/anki"""
+
+    def test_import_anki_success(self, authorized_client, language, tmp_path):
+        notes = [
+            ExportNote(
+                guid="a",
+                front="animal",
+                back="тварина",
+                contexts=("Wild animals live here", "My favorite animal"),
+            ),
+            ExportNote(guid="b", front="plant", note="a note"),
+            ExportNote(guid="c", front=""),
+        ]
+        response = authorized_client.post(
+            "/imports/anki",
+            params={"lang_code": language.code},
+            files={"file": ("deck.apkg", build_deck(tmp_path, notes))},
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["skipped"] == 1
+        assert data["dictlist"]["name"] == "Animals"
+        assert data["dictlist"]["word_count"] == 2
+        assert data["dictlist"]["max_words_limit"] is None
+
+        response = authorized_client.get("/words/")
+        words = {word["new_word"]: word for word in response.json()["items"]}
+        assert words["animal"]["translation"] == "тварина"
+        assert words["animal"]["contexts"] == [
+            "Wild animals live here",
+            "My favorite animal",
+        ]
+        assert words["plant"]["note"] == "a note"
+
+    def test_import_anki_not_a_package(self, authorized_client, language):
+        response = authorized_client.post(
+            "/imports/anki",
+            params={"lang_code": language.code},
+            files={"file": ("deck.apkg", b"not a zip")},
+        )
+        assert response.status_code == 400
+
+    def test_import_anki_unknown_language(self, authorized_client, tmp_path):
+        notes = [ExportNote(guid="a", front="animal")]
+        response = authorized_client.post(
+            "/imports/anki",
+            params={"lang_code": "xx-XX"},
+            files={"file": ("deck.apkg", build_deck(tmp_path, notes))},
+        )
+        assert response.status_code == 404
+
+    def test_import_anki_deck(self, authorized_client, language, tmp_path):
+        response = authorized_client.post(
+            "/imports/anki",
+            params={"lang_code": language.code, "deck": "Animals"},
+            files={"file": ("decks.apkg", build_nested_decks(tmp_path))},
+        )
+        assert response.status_code == 201
+        data = response.json()
+        assert data["imported"] == 2
+        assert data["dictlist"]["name"] == "Animals"
+
+        response = authorized_client.get("/words/")
+        assert {word["new_word"] for word in response.json()["items"]} == {
+            "animal",
+            "bird",
+        }
+
+    def test_import_anki_unknown_deck(self, authorized_client, language, tmp_path):
+        response = authorized_client.post(
+            "/imports/anki",
+            params={"lang_code": language.code, "deck": "Minerals"},
+            files={"file": ("decks.apkg", build_nested_decks(tmp_path))},
+        )
+        assert response.status_code == 400
+
+    def test_import_anki_too_large_uncompressed(
+        self, authorized_client, language, tmp_path, monkeypatch
+    ):
+        monkeypatch.setattr(constants, "ANKI_MAX_UNCOMPRESSED_BYTES", 1024)
+        notes = [ExportNote(guid="a", front="animal")]
+        response = authorized_client.post(
+            "/imports/anki",
+            params={"lang_code": language.code},
+            files={"file": ("deck.apkg", build_deck(tmp_path, notes))},
+        )
+        assert response.status_code == 400
+
+    def test_import_anki_failure_leaves_nothing(
+        self, authorized_client, user, language, tmp_path, monkeypatch, db_session
+    ):
+        def fail(*args):
+            raise RuntimeError
+
+        monkeypatch.setattr(dictlist_service, "insert_dictlist_words", fail)
+        notes = [ExportNote(guid="a", front="animal")]
+
+        with pytest.raises(RuntimeError):
+            authorized_client.post(
+                "/imports/anki",
+                params={"lang_code": language.code},
+                files={"file": ("deck.apkg", build_deck(tmp_path, notes))},
+            )
+
+        for model in (models.Word, models.DictList):
+            count = db_session.scalar(
+                select(func.count()).where(model.user_id == user.id)
+            )
+            assert count == 0
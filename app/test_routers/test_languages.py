@@ -111,3 +111,32 @@ class TestUpdateLangName:
             f"/languages/{language.code}", json=new_name
         )
         assert response.status_code == 422
+
+
+class TestLanguageCache:
+    def test_lookups_do_not_query(self, client, language, db_session, sql_statements):
+        lang_service.get_all_languages(db_session)
+        sql_statements.clear()
+
+        response = client.get("/languages/")
+        assert response.json() == [{"code": "en-UK", "name": "English"}]
+        response = client.get(f"/languages/{language.code}")
+        assert response.status_code == 200
+        assert lang_service.has_language(language.code, db_session)
+        assert sql_statements == []
+
+    def test_cache_refreshed_on_change(
+        self, authorized_client_as_admin, language, db_session
+    ):
+        assert lang_service.get_all_languages(db_session)[0].name == "English"
+
+        authorized_client_as_admin.patch(
+            f"/languages/{language.code}", json={"name": "British English"}
+        )
+        response = authorized_client_as_admin.get(f"/languages/{language.code}")
+        assert response.json()["name"] == "British English"
+
+        authorized_client_as_admin.delete(f"/languages/{language.code}")
+        assert not lang_service.has_language(language.code, db_session)
+        response = authorized_client_as_admin.get(f"/languages/{language.code}")
+        assert response.status_code == 404
@@ -0,0 +1,107 @@
+import subprocess
+import sys
+
+from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+from sqlalchemy import create_engine, text
+
+from app import models
+from app.services import emails as email_service
+from app.services import jobs as job_service
+from app.utils import metrics
+
+
+def sample(name: str, registry=REGISTRY, **labels) -> float:
+    return registry.get_sample_value(name, labels) or 0.0
+
+
+def requests_total(route: str, status: str) -> float:
+    return sample("http_requests_total", method="GET", route=route, status=status)
+
+
+class TestMetrics:
+    def test_requests_by_route_template(self, authorized_client):
+        before = requests_total("/words/{word_id}", "404")
+
+        authorized_client.get("/words/1")
+        authorized_client.get("/words/2")
+
+        assert requests_total("/words/{word_id}", "404") == before + 2
+        labels = {"method": "GET", "route": "/words/{word_id}"}
+        assert sample("http_request_duration_seconds_count", **labels) >= 2
+        assert sample("http_requests_in_progress", **labels) == 0
+
+        response = authorized_client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert 'route="/words/{word_id}",status="404"' in response.text
+
+    def test_unmatched_paths_share_a_label(self, client):
+        before = requests_total(metrics.UNMATCHED_ROUTE, "404")
+
+        client.get("/no/such/path")
+        client.get("/no/other/path")
+
+        assert requests_total(metrics.UNMATCHED_ROUTE, "404") == before + 2
+
+    def test_queue_depth(self, client, db_session):
+        email_service.queue_email("a@example.com", "Subject", "Body", db_session)
+        db_session.commit()
+
+        client.get("/metrics")
+
+        assert sample("background_queue_depth", queue="email_outbox") == 1
+
+    def test_pending_jobs_counted_from_index(self, db_session, sql_statements):
+        job_service.get_pending_job_count(db_session)
+
+        (statement,) = sql_statements
+        plan = db_session.connection().exec_driver_sql(
+            f"EXPLAIN QUERY PLAN {statement}", (models.JobStatus.Pending.name,)
+        )
+        assert "USING INDEX ix_job_id_pending" in plan.one()[-1]
+        assert sample("background_queue_depth", queue="jobs") == 0
+
+    def test_queries_counted(self):
+        engine = create_engine("sqlite://")
+        metrics.count_queries(engine, "test")
+        before = sample("db_queries_total", engine="test")
+
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            connection.execute(text("SELECT 2"))
+
+        assert sample("db_queries_total", engine="test") == before + 2
+
+    def test_workers_aggregated(self, tmp_path):
+        script = (
+            "import os\n"
+            "from app.utils import metrics\n"
+            "metrics.HTTP_REQUESTS.labels('GET', '/words/', '200').inc()\n"
+            "metrics.HTTP_REQUESTS_IN_PROGRESS.labels('GET', '/words/').inc()\n"
+            "print(os.getpid())\n"
+        )
+        pids = [
+            int(
+                subprocess.run(
+                    [sys.executable, "-c", script],
+                    env={"PROMETHEUS_MULTIPROC_DIR": str(tmp_path)},
+                    capture_output=True,
+                    check=True,
+                    text=True,
+                ).stdout
+            )
+            for _ in range(2)
+        ]
+
+        def aggregated(name: str, **labels) -> float:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry, path=str(tmp_path))
+            return sample(name, registry, **labels)
+
+        labels = {"method": "GET", "route": "/words/"}
+        assert aggregated("http_requests_total", **labels, status="200") == 2
+        assert aggregated("http_requests_in_progress", **labels) == 2
+
+        multiprocess.mark_process_dead(pids[0], path=str(tmp_path))
+        assert aggregated("http_requests_total", **labels, status="200") == 2
+        assert aggregated("http_requests_in_progress", **labels) == 1
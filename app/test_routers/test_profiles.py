@@ -0,0 +1,162 @@
+import threading
+import time
+
+import anyio
+import pytest
+
+from app import constants
+from app.utils.auth_utils import create_access_token
+from app.utils.profiling_utils import Sampler
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(constants, "PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def profile_token(authorized_client_as_admin):
+    response = authorized_client_as_admin.post("/profiles/token")
+    assert response.status_code == 201
+    return response.json()["token"]
+
+
+def frame_names(profile: dict) -> set[str]:
+    return {frame["name"] for frame in profile["shared"]["frames"]}
+
+
+def spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+class TestProfiledRequests:
+    def test_header(self, authorized_client_as_admin, profile_token, word):
+        response = authorized_client_as_admin.get(
+            f"/words/{word.id}", headers={"X-Profile": profile_token}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["new_word"] == word.new_word
+        profile_id = response.headers["X-Profile-Id"]
+
+        download = authorized_client_as_admin.get(f"/profiles/{profile_id}")
+        assert download.status_code == 200
+        assert download.headers["content-disposition"].endswith(
+            f'"{profile_id}.speedscope.json"'
+        )
+        profile = download.json()
+        assert profile["name"] == f"GET /words/{word.id}"
+        assert profile["$schema"].startswith("https://www.speedscope.app/")
+        assert "ProfilingMiddleware.__call__" in frame_names(profile)
+        (event_loop, *_) = profile["profiles"]
+        assert len(event_loop["samples"]) == len(event_loop["weights"]) >= 1
+
+    def test_query_parameter(self, authorized_client_as_admin, profile_token):
+        response = authorized_client_as_admin.get(
+            "/words/", params={"profile": profile_token}
+        )
+
+        assert response.status_code == 200
+        profile_id = response.headers["X-Profile-Id"]
+        assert authorized_client_as_admin.get(f"/profiles/{profile_id}").is_success
+
+    def test_not_profiled_without_token(self, authorized_client, profile_dir):
+        response = authorized_client.get("/words/")
+
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response.headers
+        assert not list(profile_dir.iterdir())
+
+    def test_invalid_token(self, client, user):
+        access_token = create_access_token({"sub": str(user.id)}, 1)
+
+        for token in ("garbage", access_token):
+            response = client.get("/languages/", headers={"X-Profile": token})
+            assert response.status_code == 403
+
+    def test_token_not_an_access_token(self, client, profile_token):
+        response = client.get(
+            "/users/me", headers={"Authorization": f"Bearer {profile_token}"}
+        )
+        assert response.status_code == 401
+
+    def test_token_not_a_verification_token(self, client, user, profile_token):
+        for path in ("/auth/email_verify", "/auth/email_change_verify"):
+            response = client.get(path, params={"token": profile_token})
+            assert response.status_code == 400
+
+    def test_oldest_profiles_dropped(
+        self, authorized_client_as_admin, profile_token, profile_dir, monkeypatch
+    ):
+        monkeypatch.setattr(constants, "PROFILE_MAX_FILES", 2)
+
+        for _ in range(3):
+            authorized_client_as_admin.get(
+                "/words/", headers={"X-Profile": profile_token}
+            )
+
+        assert len(list(profile_dir.iterdir())) == 2
+
+
+class TestProfileAccess:
+    def test_token_admin_only(self, authorized_client):
+        response = authorized_client.post("/profiles/token")
+        assert response.status_code == 403
+
+    def test_download_admin_only(self, authorized_client):
+        response = authorized_client.get(f"/profiles/{'0' * 32}")
+        assert response.status_code == 403
+
+    def test_download_unknown(self, authorized_client_as_admin):
+        response = authorized_client_as_admin.get(f"/profiles/{'0' * 32}")
+        assert response.status_code == 404
+
+
+class TestSampler:
+    def test_busy_worker_threads_sampled(self):
+        sampler = Sampler(0.001, 1000)
+        sampler.add_thread(threading.get_ident())
+
+        async def request():
+            sampler.start()
+            await anyio.to_thread.run_sync(spin, 0.05)
+            sampler.stop()
+
+        anyio.run(request)
+
+        profile = sampler.speedscope("test")
+        names = {thread_profile["name"] for thread_profile in profile["profiles"]}
+        assert "AnyIO worker thread" in names
+        assert "spin" in frame_names(profile)
+
+    def test_idle_worker_threads_not_sampled(self):
+        sampler = Sampler(0.001, 1000)
+        sampler.add_thread(threading.get_ident())
+
+        async def request():
+            # Leaves a worker thread waiting for work
+            await anyio.to_thread.run_sync(time.sleep, 0)
+            await anyio.sleep(0.01)
+            sampler.start()
+            spin(0.02)
+            sampler.stop()
+
+        anyio.run(request)
+
+        (profile,) = sampler.speedscope("test")["profiles"]
+        assert profile["name"] == threading.current_thread().name
+
+    def test_samples_capped(self):
+        sampler = Sampler(0.001, 5)
+        sampler.add_thread(threading.get_ident())
+
+        sampler.start()
+        spin(0.05)
+        sampler.stop()
+
+        assert sampler.taken == 5
+        (profile,) = sampler.speedscope("test")["profiles"]
+        assert len(profile["samples"]) == 5
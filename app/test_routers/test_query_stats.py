@@ -0,0 +1,119 @@
+import logging
+
+import pytest
+from sqlalchemy import select, text
+
+from app import constants, models, schemas
+from app.services import words as word_service
+from app.utils.query_utils import track_queries
+
+
+@pytest.fixture(autouse=True)
+def tracked_engine(db_session):
+    track_queries(db_session.get_bind())
+
+
+@pytest.fixture
+def slow_queries(monkeypatch, caplog):
+    """Every statement counts as slow."""
+    monkeypatch.setattr(constants, "SLOW_QUERY_SECONDS", 0)
+    caplog.set_level(logging.WARNING, logger="app.utils.query_utils")
+    return caplog
+
+
+def add_words(user, db_session, count):
+    word_service.create_words_bulk(
+        [
+            schemas.WordCreate(
+                new_word=f"word{i}", lang_code="en-UK", contexts=[f"Context {i}"]
+            )
+            for i in range(count)
+        ],
+        user.id,
+        db_session,
+    )
+
+
+class TestQueryHeaders:
+    def test_headers(self, authorized_client, word):
+        response = authorized_client.get(f"/words/{word.id}")
+
+        assert response.status_code == 200
+        queries = int(response.headers["X-DB-Queries"])
+        assert queries >= 1
+        assert response.headers["Server-Timing"].startswith("db;dur=")
+        assert response.headers["Server-Timing"].endswith(f'desc="{queries} queries"')
+
+    def test_word_list_queries_do_not_grow_with_words(
+        self, authorized_client, user, language, db_session
+    ):
+        # Loads the user into the cache
+        authorized_client.get("/users/me")
+        add_words(user, db_session, 1)
+        few = authorized_client.get("/words/").headers["X-DB-Queries"]
+
+        add_words(user, db_session, 10)
+        many = authorized_client.get("/words/").headers["X-DB-Queries"]
+
+        assert few == many
+
+
+class TestSlowQueryLog:
+    def test_logged_with_parameters(self, slow_queries, db_session):
+        db_session.execute(
+            select(models.Word.id).where(models.Word.new_word == "needle")
+        )
+
+        (record,) = [r for r in slow_queries.records if "needle" in r.getMessage()]
+        assert "Slow query" in record.getMessage()
+        assert "FROM word" in record.getMessage()
+        assert "Plan:" not in record.getMessage()
+
+    def test_plan_in_debug_mode(self, slow_queries, monkeypatch, db_session):
+        monkeypatch.setattr(constants, "SQL_EXPLAIN_SLOW_QUERIES", True)
+
+        db_session.execute(
+            select(models.Word.id).where(models.Word.new_word == "needle")
+        )
+        db_session.execute(text("DELETE FROM word WHERE new_word = 'needle'"))
+
+        messages = [record.getMessage() for record in slow_queries.records]
+        (select_message,) = [m for m in messages if "SELECT" in m]
+        assert "Plan:\nSCAN word" in select_message
+        (delete_message,) = [m for m in messages if "DELETE" in m]
+        assert "Plan:" not in delete_message
+
+    def test_plan_of_select_with_cte(self, slow_queries, monkeypatch, db_session):
+        monkeypatch.setattr(constants, "SQL_EXPLAIN_SLOW_QUERIES", True)
+        needles = (
+            select(models.Word.id)
+            .where(models.Word.new_word == "needle")
+            .cte("needles")
+        )
+
+        db_session.execute(select(needles.c.id))
+
+        (message,) = [
+            record.getMessage()
+            for record in slow_queries.records
+            if "needles" in record.getMessage()
+        ]
+        assert message.split("): ", 1)[1].startswith("WITH needles")
+        assert "Plan:\n" in message
+        assert "EXPLAIN failed" not in message
+
+    def test_no_plan_of_locking_select(self, slow_queries, monkeypatch, db_session):
+        monkeypatch.setattr(constants, "SQL_EXPLAIN_SLOW_QUERIES", True)
+
+        db_session.execute(
+            select(models.Word.id)
+            .where(models.Word.new_word == "needle")
+            .with_for_update()
+        )
+
+        (message,) = [
+            record.getMessage()
+            for record in slow_queries.records
+            if "needle" in record.getMessage()
+        ]
+        assert "Plan:" not in message
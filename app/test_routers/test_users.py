@@ -1,17 +1,23 @@
+import csv
+import io
+import json
+import os
 import uuid
+import zipfile
 
 import pytest
+from sqlalchemy import delete, select
 
-from app.exceptions import NotFoundError
+from app import models
+from app.exceptions import NotFoundError, ServiceUnavailableError
 from app.services import users as user_service
+from app.utils import password_utils
 
 
 class TestCreateUser:
     """POST /users/"""
 
-    def test_create_user_success(
-        self, client, db_session, mock_send_verification_email
-    ):
+    def test_create_user_success(self, client, db_session):
         data = {
             "username": "user0",
             "email": "test1@example.com",
@@ -20,7 +26,9 @@ class TestCreateUser:
 
         response = client.post("/users", json=data)
         assert response.status_code == 201
-        mock_send_verification_email.assert_called_once()
+        (email,) = db_session.scalars(select(models.EmailOutbox)).all()
+        assert email.recipient == data["email"]
+        assert "auth/email_verify?token=" in email.body
 
         user = user_service.get_user_by_email(data["email"], db_session)
         expected_data = {
@@ -33,11 +41,30 @@ class TestCreateUser:
         assert response.json() == expected_data
         assert user.password != data["password"]
 
-    def test_create_user_missing_fields(self, client, mock_send_verification_email):
+    def test_create_user_hasher_saturated(
+        self, client, db_session, saturated_password_hasher
+    ):
+        data = {"username": "user0", "email": "a@example.com", "password": "password0"}
+        response = client.post("/users/", json=data)
+        assert response.status_code == 503
+        with pytest.raises(NotFoundError):
+            user_service.get_user_by_email(data["email"], db_session)
+
+    def test_create_user_missing_fields(self, client, db_session):
         incomplete_data = {"username": "testuser"}
         response = client.post("/users/", json=incomplete_data)
         assert response.status_code == 422
-        mock_send_verification_email.assert_not_called()
+        assert db_session.scalars(select(models.EmailOutbox)).all() == []
+
+    def test_create_user_duplicate_queues_no_email(self, client, user, db_session):
+        data = {
+            "username": user.username,
+            "email": "a@example.com",
+            "password": "password0",
+        }
+        response = client.post("/users/", json=data)
+        assert response.status_code == 409
+        assert db_session.scalars(select(models.EmailOutbox)).all() == []
 
 
 class TestLogin:
@@ -54,6 +81,23 @@ class TestLogin:
         assert token_data["token_type"] == "bearer"
         assert len(token_data["access_token"]) > 0
 
+    def test_login_hasher_saturated(self, client, user, saturated_password_hasher):
+        response = client.post(
+            "/auth/login",
+            json={"username": "testuser", "password": "securepassword123"},
+        )
+        assert response.status_code == 503
+
+    def test_login_after_hasher_worker_died(self, client, user):
+        # A worker exiting breaks the whole pool; the next call gets a new one
+        with pytest.raises(ServiceUnavailableError):
+            password_utils.password_hasher._run(os._exit, 1)
+        response = client.post(
+            "/auth/login",
+            json={"username": "testuser", "password": "securepassword123"},
+        )
+        assert response.status_code == 200
+
     def test_login_user_not_found(self, client):
         login_data = {"username": "nonexistentuser", "password": "anypassword"}
         response = client.post("/auth/login", json=login_data)
@@ -115,13 +159,13 @@ class TestUpdateUsername:
 class TestUpdateEmail:
     """PATCH /users/me/change_email"""
 
-    def test_update_email_success(
-        self, authorized_client, mock_send_verification_email
-    ):
+    def test_update_email_success(self, authorized_client, user, db_session):
         update_data = {"email": "new@example.com"}
         response = authorized_client.patch("/users/me/change_email", json=update_data)
         assert response.status_code == 202
-        mock_send_verification_email.assert_called_once()
+        (email,) = db_session.scalars(select(models.EmailOutbox)).all()
+        assert email.recipient == user.email
+        assert "auth/email_change_verify?token=" in email.body
 
     def test_update_email_invalid_format(self, authorized_client):
         update_data = {"email": "invalid-email"}
@@ -179,6 +223,61 @@ class TestUpdatePassword:
         assert response.status_code == 403
 
 
+class TestExportUserData:
+    """GET /users/me/export"""
+
+    def test_export_ndjson(self, authorized_client, word, dictlist, db_session):
+        dictlist.words.append(word)
+        db_session.commit()
+
+        response = authorized_client.get("/users/me/export")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+
+        records = [json.loads(line) for line in response.text.splitlines()]
+        assert [record["type"] for record in records] == ["dictlist", "word"]
+        assert records[0]["name"] == dictlist.name
+        assert records[1]["new_word"] == "animal"
+        assert records[1]["contexts"] == [
+            "Wild animals live in the forest",
+            "My favorite animal is a dog",
+        ]
+        assert records[1]["dictlist_ids"] == [dictlist.id]
+
+    def test_export_excludes_other_users(self, authorized_client, another_user_word):
+        response = authorized_client.get("/users/me/export")
+        assert response.status_code == 200
+        assert response.text == ""
+
+    def test_export_zipped_csv(self, authorized_client, word, dictlist, db_session):
+        dictlist.words.append(word)
+        db_session.commit()
+
+        response = authorized_client.get("/users/me/export?export_format=csv")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/zip"
+
+        with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+            assert archive.namelist() == ["dictlists.csv", "words.csv"]
+            words = list(
+                csv.DictReader(io.StringIO(archive.read("words.csv").decode()))
+            )
+            dictlists = list(
+                csv.DictReader(io.StringIO(archive.read("dictlists.csv").decode()))
+            )
+        assert len(words) == 1
+        assert words[0]["new_word"] == "animal"
+        assert words[0]["contexts"] == (
+            "Wild animals live in the forest|My favorite animal is a dog"
+        )
+        assert words[0]["dictlist_ids"] == str(dictlist.id)
+        assert dictlists[0]["name"] == dictlist.name
+
+    def test_export_unauthorized(self, client):
+        response = client.get("/users/me/export")
+        assert response.status_code == 403
+
+
 class TestDeleteUser:
     """DELETE /users/me"""
 
@@ -193,6 +292,52 @@ class TestDeleteUser:
         assert response.status_code == 403
 
 
+class TestCurrentUserCache:
+    def test_cached_user_needs_no_query(
+        self, authorized_client, user, db_session, sql_statements
+    ):
+        assert authorized_client.get("/users/me").status_code == 200
+        db_session.expunge_all()
+        sql_statements.clear()
+
+        response = authorized_client.get("/users/me")
+        assert response.status_code == 200
+        assert response.json()["username"] == user.username
+        assert sql_statements == []
+
+    def test_role_change_invalidates(self, authorized_client, user, db_session):
+        assert authorized_client.get("/users/").status_code == 403
+
+        user.role = models.UserRole.Admin
+        db_session.commit()
+        assert authorized_client.get("/users/").status_code == 200
+
+    def test_username_change_invalidates(self, authorized_client, db_session):
+        authorized_client.patch(
+            "/users/me/change_username", json={"username": "newname"}
+        )
+        db_session.expunge_all()
+        assert authorized_client.get("/users/me").json()["username"] == "newname"
+
+    def test_deleted_user_rejected(self, authorized_client):
+        assert authorized_client.get("/users/me").status_code == 200
+        authorized_client.delete("/users/me")
+        assert authorized_client.get("/users/me").status_code == 400
+
+    def test_user_deleted_by_another_process(self, authorized_client, user, db_session):
+        assert authorized_client.get("/users/me").status_code == 200
+        # A Core DELETE leaves the cache alone, as one from another process
+        db_session.execute(delete(models.User).where(models.User.id == user.id))
+        db_session.commit()
+        db_session.expunge_all()
+
+        response = authorized_client.patch(
+            "/users/me/change_username", json={"username": "newname"}
+        )
+        assert response.status_code == 400
+        assert authorized_client.get("/users/me").status_code == 400
+
+
 class TestGetUserById:
     """GET /users/{user_id}"""
 
@@ -231,17 +376,35 @@ class TestGetAllUsers:
     def test_admin_can_get_all_users(self, authorized_client_as_admin):
         response = authorized_client_as_admin.get("/users/")
         assert response.status_code == 200
-        assert isinstance(response.json(), list)
+        assert isinstance(response.json()["items"], list)
 
     def test_admin_can_get_users_filter_by_role(
         self, authorized_client_as_admin, another_user
     ):
         response = authorized_client_as_admin.get("/users/?role=1")
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["username"] == another_user.username
 
+    def test_admin_can_page_through_users(
+        self, authorized_client_as_admin, another_user
+    ):
+        response = authorized_client_as_admin.get("/users/?limit=1")
+        assert response.status_code == 200
+        first_page = response.json()
+        assert len(first_page["items"]) == 1
+        assert first_page["next_cursor"] is not None
+
+        response = authorized_client_as_admin.get(
+            "/users/", params={"limit": 1, "cursor": first_page["next_cursor"]}
+        )
+        assert response.status_code == 200
+        second_page = response.json()
+        assert len(second_page["items"]) == 1
+        assert second_page["next_cursor"] is None
+        assert second_page["items"][0]["id"] != first_page["items"][0]["id"]
+
     def test_non_admin_cannot_get_all_users(self, authorized_client):
         response = authorized_client.get("/users/")
         assert response.status_code == 403
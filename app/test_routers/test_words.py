@@ -1,7 +1,9 @@
 import pytest
+from sqlalchemy import select
 
-from app import schemas
+from app import models, schemas
 from app.exceptions import NotFoundError
+from app.services import languages as lang_service
 from app.services import words as word_service
 
 
@@ -36,6 +38,7 @@ class TestCreateWord:
                 "Wild animals live in the forest",
                 "My favorite animal is a dog",
             ],
+            "similar_words": [],
         }
         assert data == expected_data
 
@@ -71,6 +74,66 @@ class TestCreateWord:
         assert response.status_code == 403
 
 
+class TestCreateWordsBulk:
+    """POST /words/bulk"""
+
+    def test_create_words_bulk_success(
+        self, authorized_client, user, language, db_session
+    ):
+        words_data = [
+            {"new_word": "animal", "lang_code": "en-UK", "contexts": ["A wild animal"]},
+            {"new_word": "chien", "lang_code": "fr-FR"},
+            {
+                "new_word": "plant",
+                "translation": "рослина",
+                "lang_code": "en-UK",
+                "contexts": ["A green plant", " ", "Plant a tree"],
+            },
+        ]
+        response = authorized_client.post("/words/bulk", json={"words": words_data})
+        assert response.status_code == 201
+
+        data = response.json()
+        assert data["created"] == 2
+        assert [result["index"] for result in data["results"]] == [0, 1, 2]
+        assert data["results"][1]["id"] is None
+        assert data["results"][1]["error"] is not None
+
+        plant = word_service.get_word_by_id(data["results"][2]["id"], db_session)
+        assert plant.new_word == "plant"
+        assert plant.translation == "рослина"
+        assert plant.user_id == user.id
+        assert plant.contexts_list == ["A green plant", "Plant a tree"]
+
+    def test_create_words_bulk_fixed_query_count(
+        self, authorized_client, language, sql_statements
+    ):
+        words_data = [
+            {"new_word": f"word{i}", "lang_code": "en-UK", "contexts": ["context"]}
+            for i in range(50)
+        ]
+        response = authorized_client.post("/words/bulk", json={"words": words_data})
+        assert response.status_code == 201
+        assert response.json()["created"] == 50
+        # Words go out in one batch only where RETURNING order is guaranteed
+        # (PostgreSQL); SQLite falls back to a statement per row for them.
+        assert sum("INSERT INTO wordcontext" in sql for sql in sql_statements) == 1
+        assert sum("FROM language" in sql for sql in sql_statements) == 1
+
+    def test_create_words_bulk_invalid_item(self, authorized_client, language):
+        words_data = [
+            {"new_word": "animal", "lang_code": "en-UK"},
+            {"new_word": "", "lang_code": "en-UK"},
+        ]
+        response = authorized_client.post("/words/bulk", json={"words": words_data})
+        assert response.status_code == 422
+        assert response.json()["detail"][0]["loc"][:3] == ["body", "words", 1]
+
+    def test_create_words_bulk_empty(self, authorized_client):
+        response = authorized_client.post("/words/bulk", json={"words": []})
+        assert response.status_code == 422
+
+
 class TestGetWordById:
     """GET /words/{word_id}"""
 
@@ -81,6 +144,18 @@ class TestGetWordById:
         assert data["new_word"] == "animal"
         assert data["user_id"] == str(word.user_id)
 
+    def test_get_word_by_id_single_query(
+        self, authorized_client, word, db_session, sql_statements
+    ):
+        db_session.expunge_all()
+        sql_statements.clear()
+
+        response = authorized_client.get(f"/words/{word.id}")
+        assert response.status_code == 200
+        assert len(response.json()["contexts"]) == 2
+        # One query for the current user, one for the word with its relationships
+        assert len(sql_statements) == 2
+
     def test_get_word_by_id_not_found(self, authorized_client):
         response = authorized_client.get("/words/123")
         assert response.status_code == 404
@@ -96,23 +171,78 @@ class TestGetAllWords:
     def test_get_all_user_words(self, authorized_client, another_user_word):
         response = authorized_client.get("/words/")
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json()["items"] == []
 
     def test_get_all_user_words_unauthorized(self, client):
         response = client.get("/words/")
         assert response.status_code == 403
 
+    def test_get_all_words_fixed_query_count(
+        self, authorized_client, user, language, db_session, sql_statements
+    ):
+        for i in range(5):
+            word_service.create_word(
+                schemas.WordCreate(
+                    new_word=f"word{i}", lang_code="en-UK", contexts=[f"context {i}"]
+                ),
+                user,
+                db_session,
+            )
+        db_session.expunge_all()
+        sql_statements.clear()
+
+        response = authorized_client.get("/words/")
+        assert response.status_code == 200
+        data = response.json()["items"]
+        assert len(data) == 5
+        assert all(len(item["contexts"]) == 1 for item in data)
+        assert all(item["language"]["code"] == "en-UK" for item in data)
+        # The current user, the words joined with languages, and their contexts
+        assert len(sql_statements) == 3
+
+    def test_get_all_words_paginated(
+        self, authorized_client, user, language, db_session
+    ):
+        word_ids = [
+            word_service.create_word(
+                schemas.WordCreate(new_word=f"word{i}", lang_code="en-UK"),
+                user,
+                db_session,
+            ).id
+            for i in range(5)
+        ]
+
+        seen = []
+        cursor = None
+        for _ in range(3):
+            params = {"limit": 2} if cursor is None else {"limit": 2, "cursor": cursor}
+            response = authorized_client.get("/words/", params=params)
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(item["id"] for item in page["items"])
+            cursor = page["next_cursor"]
+        assert cursor is None
+        assert seen == list(reversed(word_ids))
+
+    def test_get_all_words_invalid_cursor(self, authorized_client):
+        response = authorized_client.get("/words/?cursor=not-a-cursor")
+        assert response.status_code == 400
+
+    def test_get_all_words_limit_too_large(self, authorized_client):
+        response = authorized_client.get("/words/?limit=1000")
+        assert response.status_code == 422
+
     def test_get_words_filter_by_lang_code(self, authorized_client, word):
         response = authorized_client.get(f"/words/?lang_code={word.lang_code}")
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["id"] == word.id
 
     def test_get_words_filter_by_nonexistent_lang_code(self, authorized_client, word):
         response = authorized_client.get("/words/?lang_code=fr-FR")
         assert response.status_code == 200
-        assert response.json() == []
+        assert response.json()["items"] == []
 
     def test_get_words_filter_by_dictlist(
         self, authorized_client, word, dictlist, db_session
@@ -122,15 +252,297 @@ class TestGetAllWords:
 
         response = authorized_client.get(f"/words/?dictlist_id={dictlist.id}")
         assert response.status_code == 200
-        data = response.json()
+        data = response.json()["items"]
         assert len(data) == 1
         assert data[0]["id"] == word.id
 
     def test_get_words_filter_by_nonexistent_dictlist(self, authorized_client, word):
         response = authorized_client.get("/words/?dictlist_id=9999")
         assert response.status_code == 200
+        assert response.json()["items"] == []
+
+
+class TestLookupWords:
+    """GET /words/lookup"""
+
+    def test_lookup_words_normalized(self, authorized_client, word, another_user_word):
+        response = authorized_client.get(
+            "/words/lookup", params={"new_word": " ANIMAL ", "lang_code": "en-UK"}
+        )
+        assert response.status_code == 200
+        assert [found["id"] for found in response.json()] == [word.id]
+
+        response = authorized_client.get(
+            "/words/lookup", params={"new_word": "Ánimal", "lang_code": "en-UK"}
+        )
+        assert response.json() == []
+
+    def test_lookup_words_without_accents(
+        self, authorized_client, accents_stripped, word
+    ):
+        response = authorized_client.get(
+            "/words/lookup", params={"new_word": " ÁNIMAL ", "lang_code": "en-UK"}
+        )
+        assert [found["id"] for found in response.json()] == [word.id]
+
+    def test_lookup_words_other_language(self, authorized_client, word):
+        response = authorized_client.get(
+            "/words/lookup", params={"new_word": "animal", "lang_code": "fr-FR"}
+        )
         assert response.json() == []
 
+    def test_lookup_words_after_rename(self, authorized_client, word):
+        authorized_client.patch(f"/words/{word.id}", json={"new_word": "Beast"})
+        response = authorized_client.get(
+            "/words/lookup", params={"new_word": "beast", "lang_code": "en-UK"}
+        )
+        assert [found["id"] for found in response.json()] == [word.id]
+
+
+class TestRejectDuplicateWords:
+    """POST /words/ and PATCH /words/{word_id} with reject_duplicates"""
+
+    def test_create_duplicate_allowed_by_default(self, authorized_client, word):
+        response = authorized_client.post(
+            "/words/", json={"new_word": "Animal", "lang_code": "en-UK"}
+        )
+        assert response.status_code == 201
+
+    def test_create_duplicate_rejected(self, authorized_client, word):
+        response = authorized_client.post(
+            "/words/",
+            params={"reject_duplicates": True},
+            json={"new_word": "ANIMAL ", "lang_code": "en-UK"},
+        )
+        assert response.status_code == 409
+
+    def test_create_accented_spelling_allowed(self, authorized_client, word):
+        response = authorized_client.post(
+            "/words/",
+            params={"reject_duplicates": True},
+            json={"new_word": "Ánimal", "lang_code": "en-UK"},
+        )
+        assert response.status_code == 201
+
+    def test_create_accented_spelling_rejected_without_accents(
+        self, authorized_client, accents_stripped, word
+    ):
+        response = authorized_client.post(
+            "/words/",
+            params={"reject_duplicates": True},
+            json={"new_word": "Ánimal ", "lang_code": "en-UK"},
+        )
+        assert response.status_code == 409
+
+    def test_create_other_user_duplicate_allowed(
+        self, authorized_client, another_user_word
+    ):
+        response = authorized_client.post(
+            "/words/",
+            params={"reject_duplicates": True},
+            json={"new_word": "animal", "lang_code": "en-UK"},
+        )
+        assert response.status_code == 201
+
+    def test_update_to_duplicate_rejected(self, authorized_client, word, user):
+        response = authorized_client.post(
+            "/words/", json={"new_word": "plant", "lang_code": "en-UK"}
+        )
+        plant_id = response.json()["id"]
+
+        response = authorized_client.patch(
+            f"/words/{plant_id}",
+            params={"reject_duplicates": True},
+            json={"new_word": "ANIMAL"},
+        )
+        assert response.status_code == 409
+
+        response = authorized_client.patch(
+            f"/words/{word.id}",
+            params={"reject_duplicates": True},
+            json={"translation": "тварина"},
+        )
+        assert response.status_code == 200
+
+
+class TestAutocompleteWords:
+    """GET /words/autocomplete"""
+
+    @pytest.fixture
+    def words(self, user, language, db_session):
+        lang_service.create_language(
+            schemas.LanguageSchema(code="fr-FR", name="French"), db_session
+        )
+        word_service.create_words_bulk(
+            [
+                schemas.WordCreate(new_word="Animal", lang_code="en-UK"),
+                schemas.WordCreate(new_word="anim_al", lang_code="en-UK"),
+                schemas.WordCreate(
+                    new_word="beast", translation="anima", lang_code="en-UK"
+                ),
+                schemas.WordCreate(new_word="plant", lang_code="en-UK"),
+                schemas.WordCreate(new_word="animal", lang_code="fr-FR"),
+            ],
+            user.id,
+            db_session,
+        )
+
+    def test_autocomplete_words(self, authorized_client, words, another_user_word):
+        response = authorized_client.get(
+            "/words/autocomplete", params={"prefix": "ANIM", "lang_code": "en-UK"}
+        )
+        assert response.status_code == 200
+        assert [word["new_word"] for word in response.json()] == [
+            "anim_al",
+            "beast",
+            "Animal",
+        ]
+
+    def test_autocomplete_words_escapes_wildcards(self, authorized_client, words):
+        response = authorized_client.get(
+            "/words/autocomplete", params={"prefix": "anim_", "lang_code": "en-UK"}
+        )
+        assert [word["new_word"] for word in response.json()] == ["anim_al"]
+
+    def test_autocomplete_words_limit(self, authorized_client, words):
+        response = authorized_client.get(
+            "/words/autocomplete",
+            params={"prefix": "a", "lang_code": "en-UK", "limit": 1},
+        )
+        assert [word["new_word"] for word in response.json()] == ["anim_al"]
+
+    def test_autocomplete_words_requires_lang_code(self, authorized_client):
+        response = authorized_client.get("/words/autocomplete", params={"prefix": "a"})
+        assert response.status_code == 422
+
+
+class TestGetSimilarWords:
+    """GET /words/similar"""
+
+    @pytest.fixture
+    def words(self, user, language, db_session):
+        word_service.create_words_bulk(
+            [
+                schemas.WordCreate(new_word=new_word, lang_code="en-UK")
+                for new_word in ("receive", "received", "river")
+            ],
+            user.id,
+            db_session,
+        )
+
+    def test_get_similar_words(self, authorized_client, words, another_user_word):
+        response = authorized_client.get("/words/similar", params={"q": "receiv"})
+        assert response.status_code == 200
+        data = response.json()
+        assert [word["new_word"] for word in data] == ["receive", "received"]
+        assert data[0]["similarity"] > data[1]["similarity"] >= 0.3
+
+    def test_get_similar_words_follows_changes(self, authorized_client, words):
+        response = authorized_client.get("/words/similar", params={"q": "receiv"})
+        receive_id = response.json()[0]["id"]
+
+        response = authorized_client.patch(
+            f"/words/{receive_id}", json={"new_word": "accept"}
+        )
+        assert response.status_code == 200
+        response = authorized_client.post(
+            "/words/", json={"new_word": "receiver", "lang_code": "en-UK"}
+        )
+        assert response.status_code == 201
+
+        response = authorized_client.get("/words/similar", params={"q": "receiv"})
+        assert [word["new_word"] for word in response.json()] == [
+            "received",
+            "receiver",
+        ]
+
+    def test_get_similar_words_limit(self, authorized_client, words):
+        response = authorized_client.get(
+            "/words/similar", params={"q": "receiv", "limit": 1}
+        )
+        assert [word["new_word"] for word in response.json()] == ["receive"]
+
+    def test_create_word_with_similar_hint(self, authorized_client, words):
+        response = authorized_client.post(
+            "/words/",
+            params={"check_similar": True},
+            json={"new_word": "receiv", "lang_code": "en-UK"},
+        )
+        assert response.status_code == 201
+        similar = response.json()["similar_words"]
+        assert [word["new_word"] for word in similar] == ["receive", "received"]
+
+
+class TestSearchWords:
+    """GET /words/search"""
+
+    @pytest.fixture
+    def words(self, user, language, db_session):
+        word_service.create_words_bulk(
+            [
+                schemas.WordCreate(
+                    new_word="forest",
+                    translation="ліс",
+                    lang_code="en-UK",
+                    contexts=["A walk in the park", "Deep in the forest"],
+                ),
+                schemas.WordCreate(
+                    new_word="tree",
+                    note="grows in a forest",
+                    lang_code="en-UK",
+                ),
+                schemas.WordCreate(new_word="river", lang_code="en-UK"),
+            ],
+            user.id,
+            db_session,
+        )
+
+    def test_search_words_ranked(self, authorized_client, words, another_user_word):
+        response = authorized_client.get("/words/search", params={"q": "Forest!"})
+        assert response.status_code == 200
+        items = response.json()["items"]
+        assert [item["word"]["new_word"] for item in items] == ["forest", "tree"]
+        assert items[0]["rank"] > items[1]["rank"]
+        assert items[0]["matched_context"] == "Deep in the forest"
+        assert items[1]["matched_context"] is None
+
+    def test_search_words_in_contexts(self, authorized_client, words):
+        response = authorized_client.get("/words/search", params={"q": "park walk"})
+        items = response.json()["items"]
+        assert [item["word"]["new_word"] for item in items] == ["forest"]
+        assert items[0]["matched_context"] == "A walk in the park"
+
+    def test_search_words_follows_updates(self, authorized_client, word):
+        response = authorized_client.patch(
+            f"/words/{word.id}", json={"contexts": ["Birds sing at dawn"]}
+        )
+        assert response.status_code == 200
+
+        response = authorized_client.get("/words/search", params={"q": "forest"})
+        assert response.json()["items"] == []
+        response = authorized_client.get("/words/search", params={"q": "dawn"})
+        assert [item["word"]["id"] for item in response.json()["items"]] == [word.id]
+
+    def test_search_words_paginated(self, authorized_client, words):
+        response = authorized_client.get(
+            "/words/search", params={"q": "forest", "limit": 1}
+        )
+        data = response.json()
+        assert [item["word"]["new_word"] for item in data["items"]] == ["forest"]
+        assert data["next_cursor"]
+
+        response = authorized_client.get(
+            "/words/search",
+            params={"q": "forest", "limit": 1, "cursor": data["next_cursor"]},
+        )
+        data = response.json()
+        assert [item["word"]["new_word"] for item in data["items"]] == ["tree"]
+        assert data["next_cursor"] is None
+
+    def test_search_words_without_terms(self, authorized_client):
+        response = authorized_client.get("/words/search", params={"q": "?!"})
+        assert response.status_code == 400
+
 
 class TestDeleteWord:
     """DELETE /words/{word_id}"""
@@ -142,6 +554,18 @@ class TestDeleteWord:
         with pytest.raises(NotFoundError):
             word_service.get_word_by_id(word.id, db_session)
 
+    def test_delete_word_updates_dictlist_word_count(
+        self, authorized_client, word, dictlist, db_session
+    ):
+        dictlist.words.append(word)
+        db_session.commit()
+        assert dictlist.word_count == 1
+
+        response = authorized_client.delete(f"/words/{word.id}")
+        assert response.status_code == 204
+        db_session.refresh(dictlist)
+        assert dictlist.word_count == 0
+
     def test_delete_word_not_found(self, authorized_client):
         response = authorized_client.delete("/words/12345")
         assert response.status_code == 404
@@ -193,6 +617,146 @@ class TestUpdateWord:
         assert "Wild animals live in the forest" in updated_word.contexts_list
         assert "Yesterday I saw few cute animals" in updated_word.contexts_list
 
+    def test_update_word_context_keeps_unchanged_rows(
+        self, authorized_client, word, db_session, sql_statements
+    ):
+        kept_id = db_session.scalars(
+            select(models.WordContext.id).where(
+                models.WordContext.context == "Wild animals live in the forest"
+            )
+        ).one()
+        sql_statements.clear()
+
+        response = authorized_client.patch(
+            f"/words/{word.id}",
+            json={
+                "contexts": [
+                    "Wild animals live in the forest",
+                    "Wild animals live in the forest",
+                    "A herd of animals",
+                ]
+            },
+        )
+        assert response.status_code == 200
+        assert response.json()["contexts"] == [
+            "Wild animals live in the forest",
+            "Wild animals live in the forest",
+            "A herd of animals",
+        ]
+        rows = db_session.execute(
+            select(models.WordContext.id, models.WordContext.context).order_by(
+                models.WordContext.id
+            )
+        ).all()
+        assert rows[0] == (kept_id, "Wild animals live in the forest")
+        assert [context for _, context in rows[1:]] == [
+            "Wild animals live in the forest",
+            "A herd of animals",
+        ]
+        writes = [
+            statement
+            for statement in sql_statements
+            if statement.startswith(
+                ("INSERT INTO wordcontext", "DELETE FROM wordcontext")
+            )
+        ]
+        assert len(writes) == 2
+
+    def test_update_word_context_unchanged(
+        self, authorized_client, word, db_session, sql_statements
+    ):
+        contexts = ["Wild animals live in the forest", "My favorite animal is a dog"]
+        sql_statements.clear()
+
+        response = authorized_client.patch(
+            f"/words/{word.id}", json={"contexts": contexts}
+        )
+        assert response.status_code == 200
+        assert response.json()["contexts"] == contexts
+        assert not any(
+            statement.startswith(("INSERT INTO wordcontext", "DELETE FROM wordcontext"))
+            for statement in sql_statements
+        )
+
+    def test_update_word_context_changes_one_sentence(
+        self, authorized_client, word, db_session, sql_statements
+    ):
+        kept_id = db_session.scalars(
+            select(models.WordContext.id).where(
+                models.WordContext.context == "Wild animals live in the forest"
+            )
+        ).one()
+        contexts = ["Wild animals live in the forest", "My favorite animal is a cat"]
+        sql_statements.clear()
+
+        response = authorized_client.patch(
+            f"/words/{word.id}", json={"contexts": contexts}
+        )
+        assert response.status_code == 200
+        assert response.json()["contexts"] == contexts
+        writes = [
+            statement
+            for statement in sql_statements
+            if statement.startswith(
+                (
+                    "INSERT INTO wordcontext",
+                    "DELETE FROM wordcontext",
+                    "UPDATE wordcontext",
+                )
+            )
+        ]
+        assert [statement.split()[0] for statement in writes] == ["DELETE", "INSERT"]
+        rows = db_session.execute(
+            select(models.WordContext.id, models.WordContext.position)
+            .where(models.WordContext.word_id == word.id)
+            .order_by(models.WordContext.position)
+        ).all()
+        assert rows[0] == (kept_id, 0)
+        assert rows[1].position == 1
+
+    def test_update_word_context_reordered(
+        self, authorized_client, word, db_session, sql_statements
+    ):
+        ids = dict(
+            db_session.execute(
+                select(models.WordContext.context, models.WordContext.id)
+            ).all()
+        )
+        contexts = [
+            "My favorite animal is a dog",
+            "A herd of animals",
+            "Wild animals live in the forest",
+        ]
+        sql_statements.clear()
+
+        response = authorized_client.patch(
+            f"/words/{word.id}", json={"contexts": contexts}
+        )
+        assert response.status_code == 200
+        assert response.json()["contexts"] == contexts
+        response = authorized_client.get(f"/words/{word.id}")
+        assert response.json()["contexts"] == contexts
+        writes = [
+            statement
+            for statement in sql_statements
+            if statement.startswith(
+                (
+                    "INSERT INTO wordcontext",
+                    "DELETE FROM wordcontext",
+                    "UPDATE wordcontext",
+                )
+            )
+        ]
+        assert [statement.split()[0] for statement in writes] == ["UPDATE", "INSERT"]
+        rows = db_session.execute(
+            select(models.WordContext.context, models.WordContext.id)
+            .where(models.WordContext.word_id == word.id)
+            .order_by(models.WordContext.position)
+        ).all()
+        assert [context for context, _ in rows] == contexts
+        assert rows[0].id == ids["My favorite animal is a dog"]
+        assert rows[2].id == ids["Wild animals live in the forest"]
+
     def test_update_word_context_empty(self, authorized_client, word, db_session):
         response = authorized_client.patch(f"/words/{word.id}", json={"contexts": []})
         assert response.status_code == 200
@@ -210,3 +774,109 @@ class TestUpdateWord:
             f"/words/{another_user_word.id}", json={"new_word": "New word"}
         )
         assert response.status_code == 403
+
+
+class TestUpdateWordsBulk:
+    """PATCH /words/bulk"""
+
+    def test_update_words_bulk_success(
+        self, authorized_client, word, user, db_session, sql_statements
+    ):
+        other = word_service.create_word(
+            schemas.WordCreate(new_word="plant", lang_code="en-UK"), user, db_session
+        )
+        sql_statements.clear()
+
+        response = authorized_client.patch(
+            "/words/bulk",
+            json={
+                "word_ids": [word.id, other.id],
+                "changes": {"note": "to revise", "translation": None},
+            },
+        )
+        assert response.status_code == 200
+        assert response.json() == {"updated": 2}
+        updates = [s for s in sql_statements if s.startswith("UPDATE word ")]
+        assert len(updates) == 1
+
+        for word_id in (word.id, other.id):
+            updated = word_service.get_word_by_id(word_id, db_session)
+            db_session.refresh(updated)
+            assert updated.note == "to revise"
+            assert updated.translation is None
+
+    def test_update_words_bulk_unknown_language(self, authorized_client, word):
+        response = authorized_client.patch(
+            "/words/bulk",
+            json={"word_ids": [word.id], "changes": {"lang_code": "xx-XX"}},
+        )
+        assert response.status_code == 400
+
+    def test_update_words_bulk_new_word_none(self, authorized_client, word):
+        response = authorized_client.patch(
+            "/words/bulk",
+            json={"word_ids": [word.id], "changes": {"new_word": None}},
+        )
+        assert response.status_code == 400
+
+    def test_update_words_bulk_forbidden(
+        self, authorized_client, word, another_user_word, db_session
+    ):
+        response = authorized_client.patch(
+            "/words/bulk",
+            json={
+                "word_ids": [word.id, another_user_word.id],
+                "changes": {"note": "mine now"},
+            },
+        )
+        assert response.status_code == 403
+        db_session.refresh(word)
+        assert word.note is None
+
+    def test_update_words_bulk_not_found(self, authorized_client, word):
+        response = authorized_client.patch(
+            "/words/bulk",
+            json={"word_ids": [word.id, 999999], "changes": {"note": "x"}},
+        )
+        assert response.status_code == 404
+
+
+class TestDeleteWordsBulk:
+    """DELETE /words/bulk"""
+
+    def test_delete_words_bulk_success(
+        self, authorized_client, word, dictlist, db_session, sql_statements
+    ):
+        dictlist.words.append(word)
+        db_session.commit()
+        sql_statements.clear()
+
+        response = authorized_client.request(
+            "DELETE", "/words/bulk", json={"word_ids": [word.id]}
+        )
+        assert response.status_code == 204
+        assert not any("FROM wordcontext" in s for s in sql_statements)
+
+        with pytest.raises(NotFoundError):
+            word_service.get_word_by_id(word.id, db_session)
+        contexts = db_session.scalars(select(models.WordContext)).all()
+        assert contexts == []
+        db_session.refresh(dictlist)
+        assert dictlist.word_count == 0
+
+    def test_delete_words_bulk_forbidden(
+        self, authorized_client, word, another_user_word, db_session
+    ):
+        response = authorized_client.request(
+            "DELETE",
+            "/words/bulk",
+            json={"word_ids": [word.id, another_user_word.id]},
+        )
+        assert response.status_code == 403
+        assert word_service.get_word_by_id(word.id, db_session)
+
+    def test_delete_words_bulk_not_found(self, authorized_client):
+        response = authorized_client.request(
+            "DELETE", "/words/bulk", json={"word_ids": [999999]}
+        )
+        assert response.status_code == 404
@@ -0,0 +1,415 @@
+"""Reading and writing Anki .apkg packages (legacy collection.anki2 format).
+
+An .apkg is a zip archive holding an SQLite collection database and a JSON
+media map. Everything here works on files on disk and processes notes in
+batches, so memory stays bounded for large decks.
+"""
+
+import hashlib
+import html
+import json
+import re
+import sqlite3
+import time
+import zipfile
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+COLLECTION_NAMES = ("collection.anki21", "collection.anki2")
+FIELD_SEPARATOR = "\x1f"
+NOTE_FIELDS = ("Front", "Back", "Note", "Context")
+NOTES_BATCH_SIZE = 5000
+COPY_CHUNK_SIZE = 1024 * 1024
+# Separates the parent and child names of nested decks
+DECK_SEPARATOR = "::"
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_BREAK_RE = re.compile(r"<br\s*/?>|</div>|</p>", re.IGNORECASE)
+
+
+@dataclass
+class AnkiNote:
+    fields: dict[str, str]
+
+
+@dataclass
+class ExportNote:
+    guid: str
+    front: str
+    back: str = ""
+    note: str = ""
+    contexts: tuple[str, ...] = ()
+
+
+def html_to_text(value: str) -> str:
+    return html.unescape(_TAG_RE.sub("", value)).strip()
+
+
+def html_to_lines(value: str) -> list[str]:
+    lines = (html_to_text(line) for line in _BREAK_RE.split(value))
+    return [line for line in lines if line]
+
+
+class AnkiPackageError(ValueError):
+    pass
+
+
+def _extract(source, target, max_bytes: int | None) -> None:
+    """Copy `source` to `target`, failing past `max_bytes`.
+
+    The sizes in the zip headers are only claims, so the bytes are counted.
+    """
+    copied = 0
+    while chunk := source.read(COPY_CHUNK_SIZE):
+        copied += len(chunk)
+        if max_bytes is not None and copied > max_bytes:
+            raise AnkiPackageError("Package too large once uncompressed")
+        target.write(chunk)
+
+
+class AnkiPackageReader:
+    """Extracts the collection of an .apkg to `workdir` and reads its notes.
+
+    With `max_uncompressed_bytes`, packages whose entries add up to more
+    once uncompressed are refused before anything is extracted.
+    """
+
+    def __init__(
+        self,
+        package_path: Path,
+        workdir: Path,
+        *,
+        max_uncompressed_bytes: int | None = None,
+    ):
+        try:
+            with zipfile.ZipFile(package_path) as archive:
+                infos = archive.infolist()
+                if max_uncompressed_bytes is not None and (
+                    sum(info.file_size for info in infos) > max_uncompressed_bytes
+                ):
+                    raise AnkiPackageError("Package too large once uncompressed")
+                names = {info.filename for info in infos}
+                name = next((n for n in COLLECTION_NAMES if n in names), None)
+                if name is None:
+                    raise AnkiPackageError("No legacy Anki collection in package")
+                self.collection_path = workdir / "collection.sqlite"
+                with (
+                    archive.open(name) as source,
+                    self.collection_path.open("wb") as target,
+                ):
+                    _extract(source, target, max_uncompressed_bytes)
+        except zipfile.BadZipFile as err:
+            raise AnkiPackageError("Not a zip archive") from err
+
+        self._conn = sqlite3.connect(f"file:{self.collection_path}?mode=ro", uri=True)
+        try:
+            models_json, decks_json = self._conn.execute(
+                "SELECT models, decks FROM col"
+            ).fetchone()
+        except sqlite3.DatabaseError as err:
+            self._conn.close()
+            raise AnkiPackageError("Not an Anki collection") from err
+        self._field_names = {
+            int(model_id): [field["name"] for field in model["flds"]]
+            for model_id, model in json.loads(models_json).items()
+        }
+        self._decks = json.loads(decks_json)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def deck_name(self) -> str | None:
+        """Name of the deck holding most of the cards."""
+        row = self._conn.execute(
+            "SELECT did FROM cards GROUP BY did ORDER BY count(*) DESC LIMIT 1"
+        ).fetchone()
+        deck = self._decks.get(str(row[0])) if row else None
+        return deck["name"] if deck else None
+
+    def deck_ids(self, name: str) -> list[int]:
+        """Ids of the deck named `name` and of the decks nested in it."""
+        ids = [
+            int(deck_id)
+            for deck_id, deck in self._decks.items()
+            if deck["name"] == name or deck["name"].startswith(name + DECK_SEPARATOR)
+        ]
+        if not ids:
+            raise AnkiPackageError(f"No deck named {name!r} in package")
+        return ids
+
+    def iter_note_batches(
+        self, batch_size: int = NOTES_BATCH_SIZE, *, deck_ids: list[int] | None = None
+    ) -> Iterator[list[AnkiNote]]:
+        """The notes, or those with a card in one of `deck_ids`, in batches."""
+        if deck_ids is None:
+            cursor = self._conn.execute("SELECT mid, flds FROM notes ORDER BY id")
+        else:
+            placeholders = ", ".join("?" * len(deck_ids))
+            cursor = self._conn.execute(
+                "SELECT mid, flds FROM notes WHERE id IN "
+                f"(SELECT nid FROM cards WHERE did IN ({placeholders})) ORDER BY id",
+                deck_ids,
+            )
+        while rows := cursor.fetchmany(batch_size):
+            yield [
+                AnkiNote(
+                    fields=dict(
+                        zip(
+                            self._field_names.get(model_id, ()),
+                            fields.split(FIELD_SEPARATOR),
+                            strict=False,
+                        )
+                    )
+                )
+                for model_id, fields in rows
+            ]
+
+
+_SCHEMA = (
+    """
+    CREATE TABLE col (
+        id integer primary key, crt integer not null, mod integer not null,
+        scm integer not null, ver integer not null, dty integer not null,
+        usn integer not null, ls integer not null, conf text not null,
+        models text not null, decks text not null, dconf text not null,
+        tags text not null
+    )
+    """,
+    """
+    CREATE TABLE notes (
+        id integer primary key, guid text not null, mid integer not null,
+        mod integer not null, usn integer not null, tags text not null,
+        flds text not null, sfld integer not null, csum integer not null,
+        flags integer not null, data text not null
+    )
+    """,
+    """
+    CREATE TABLE cards (
+        id integer primary key, nid integer not null, did integer not null,
+        ord integer not null, mod integer not null, usn integer not null,
+        type integer not null, queue integer not null, due integer not null,
+        ivl integer not null, factor integer not null, reps integer not null,
+        lapses integer not null, left integer not null, odue integer not null,
+        odid integer not null, flags integer not null, data text not null
+    )
+    """,
+    """
+    CREATE TABLE revlog (
+        id integer primary key, cid integer not null, usn integer not null,
+        ivl integer not null, lastIvl integer not null, factor integer not null,
+        time integer not null, type integer not null
+    )
+    """,
+    "CREATE TABLE graves (usn integer not null, oid integer not null, "
+    "type integer not null)",
+    "CREATE INDEX ix_notes_usn ON notes (usn)",
+    "CREATE INDEX ix_cards_usn ON cards (usn)",
+    "CREATE INDEX ix_revlog_usn ON revlog (usn)",
+    "CREATE INDEX ix_cards_nid ON cards (nid)",
+    "CREATE INDEX ix_cards_sched ON cards (did, queue, due)",
+    "CREATE INDEX ix_revlog_cid ON revlog (cid)",
+    "CREATE INDEX ix_notes_csum ON notes (csum)",
+)
+
+_DECK_CONF = {
+    "id": 1,
+    "name": "Default",
+    "mod": 0,
+    "usn": 0,
+    "maxTaken": 60,
+    "autoplay": True,
+    "timer": 0,
+    "replayq": True,
+    "dyn": False,
+    "new": {
+        "bury": True,
+        "delays": [1, 10],
+        "initialFactor": 2500,
+        "ints": [1, 4, 7],
+        "order": 1,
+        "perDay": 20,
+        "separate": True,
+    },
+    "lapse": {
+        "delays": [10],
+        "leechAction": 0,
+        "leechFails": 8,
+        "minInt": 1,
+        "mult": 0,
+    },
+    "rev": {
+        "bury": True,
+        "ease4": 1.3,
+        "fuzz": 0.05,
+        "ivlFct": 1,
+        "maxIvl": 36500,
+        "minSpace": 1,
+        "perDay": 200,
+    },
+}
+
+
+def _deck(deck_id: int, name: str, now: int) -> dict:
+    return {
+        "id": deck_id,
+        "name": name,
+        "mod": now,
+        "usn": -1,
+        "desc": "",
+        "dyn": 0,
+        "conf": 1,
+        "collapsed": False,
+        "extendNew": 10,
+        "extendRev": 50,
+        "newToday": [0, 0],
+        "revToday": [0, 0],
+        "lrnToday": [0, 0],
+        "timeToday": [0, 0],
+    }
+
+
+def _model(model_id: int, deck_id: int, now: int) -> dict:
+    return {
+        "id": model_id,
+        "name": "VocabularyNotes",
+        "type": 0,
+        "mod": now,
+        "usn": -1,
+        "sortf": 0,
+        "did": deck_id,
+        "tags": [],
+        "vers": [],
+        "req": [[0, "all", [0]]],
+        "flds": [
+            {
+                "name": name,
+                "ord": ord_,
+                "sticky": False,
+                "rtl": False,
+                "font": "Arial",
+                "size": 20,
+                "media": [],
+            }
+            for ord_, name in enumerate(NOTE_FIELDS)
+        ],
+        "tmpls": [
+            {
+                "name": "Card 1",
+                "ord": 0,
+                "qfmt": "{{Front}}",
+                "afmt": (
+                    "{{FrontSide}}<hr id=answer>{{Back}}"
+                    "{{#Note}}<br><i>{{Note}}</i>{{/Note}}"
+                    "{{#Context}}<br>{{Context}}{{/Context}}"
+                ),
+                "did": None,
+                "bqfmt": "",
+                "bafmt": "",
+            }
+        ],
+        "css": ".card { font-family: arial; font-size: 20px; text-align: center; }",
+        "latexPre": "\\documentclass[12pt]{article}\n\\begin{document}\n",
+        "latexPost": "\\end{document}",
+    }
+
+
+def _checksum(value: str) -> int:
+    return int(hashlib.sha1(value.encode()).hexdigest()[:8], 16)
+
+
+def write_package(
+    package_path: Path,
+    workdir: Path,
+    deck_name: str,
+    note_batches: Iterable[list[ExportNote]],
+) -> int:
+    """Write an .apkg with one deck, consuming `note_batches` in one pass.
+
+    Returns the number of notes written.
+    """
+    now = int(time.time())
+    base_id = int(time.time() * 1000)
+    deck_id = base_id
+    model_id = base_id + 1
+
+    collection_path = workdir / "collection.anki2"
+    conn = sqlite3.connect(collection_path)
+    try:
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        conn.execute(
+            "INSERT INTO col VALUES (1, ?, ?, ?, 11, 0, 0, 0, ?, ?, ?, ?, '{}')",
+            (
+                now,
+                now * 1000,
+                now * 1000,
+                json.dumps({"nextPos": 1, "curDeck": deck_id, "curModel": model_id}),
+                json.dumps({str(model_id): _model(model_id, deck_id, now)}),
+                json.dumps(
+                    {
+                        "1": _deck(1, "Default", now),
+                        str(deck_id): _deck(deck_id, deck_name, now),
+                    }
+                ),
+                json.dumps({"1": _DECK_CONF}),
+            ),
+        )
+
+        count = 0
+        for batch in note_batches:
+            notes = []
+            cards = []
+            for note in batch:
+                count += 1
+                note_id = base_id + count
+                fields = (
+                    html.escape(note.front),
+                    html.escape(note.back),
+                    html.escape(note.note),
+                    "<br>".join(html.escape(context) for context in note.contexts),
+                )
+                notes.append(
+                    (
+                        note_id,
+                        note.guid,
+                        model_id,
+                        now,
+                        -1,
+                        "",
+                        FIELD_SEPARATOR.join(fields),
+                        note.front,
+                        _checksum(note.front),
+                        0,
+                        "",
+                    )
+                )
+                # New card: type, queue and scheduling counters all zero,
+                # due is the position in the new-card queue
+                cards.append(
+                    (note_id, note_id, deck_id, 0, now, -1, 0, 0, count)
+                    + (0,) * 8
+                    + ("",)
+                )
+            conn.executemany(
+                "INSERT INTO notes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", notes
+            )
+            conn.executemany(
+                "INSERT INTO cards VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                cards,
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+    with zipfile.ZipFile(package_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.write(collection_path, "collection.anki2")
+        zf.writestr("media", "{}")
+    return count
@@ -2,15 +2,12 @@ from datetime import timedelta
 
 from fastapi.security import HTTPBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 
 from app.constants import JWT_ALGORITM, SECRET_KEY
 from app.utils.datetime_utils import utc_now
 
 auth_scheme = HTTPBearer()
 
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
-
 
 def create_access_token(data: dict, minutes_delta: int):
     to_encode = data.copy()
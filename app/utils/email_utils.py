@@ -1,27 +1,118 @@
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema
+import smtplib
+import ssl
+import time
+from email.message import EmailMessage
 
 from app import constants
 
-conf = ConnectionConfig(
-    MAIL_USERNAME=constants.MAIL_USERNAME,
-    MAIL_PASSWORD=constants.MAIL_PASSWORD,
-    MAIL_FROM=constants.MAIL_FROM,
-    MAIL_PORT=constants.MAIL_PORT,
-    MAIL_SERVER=constants.MAIL_SERVER,
-    MAIL_STARTTLS=constants.MAIL_STARTTLS,
-    MAIL_SSL_TLS=constants.MAIL_SSL_TLS,
-)
+# Errors the server answers a single message with. Any other error means the
+# connection itself is in trouble.
+REFUSED_ERRORS = (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)
 
-fm = FastMail(conf)
 
+def _flag(value: str) -> bool:
+    return value.lower() in ("1", "true", "yes")
 
-async def send_verification_email(request, email: str, token: str, action: str):
-    verify_link = f"{request.base_url}auth/{action}?token={token}"
 
-    message = MessageSchema(
-        subject="Verify your email",
-        recipients=[email],
-        body=f"Click the link to verify your account: {verify_link}",
-        subtype="html",
+class SMTPSender:
+    """Sends messages over a single SMTP connection kept open between sends.
+
+    The connection is opened on the first send. A server that dropped it
+    while idle gets one reconnect before the send counts as failed. With
+    `max_rate`, sends are spaced to at most that many per second.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        *,
+        username: str | None = None,
+        password: str | None = None,
+        starttls: bool = False,
+        ssl_tls: bool = False,
+        timeout: float = 30.0,
+        max_rate: float = 0,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.ssl_tls = ssl_tls
+        self.timeout = timeout
+        self.min_interval = 1 / max_rate if max_rate else 0.0
+        self._next_send_at = 0.0
+        self._smtp: smtplib.SMTP | None = None
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.ssl_tls:
+            smtp = smtplib.SMTP_SSL(
+                self.host,
+                self.port,
+                timeout=self.timeout,
+                context=ssl.create_default_context(),
+            )
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+        if self.username:
+            smtp.login(self.username, self.password)
+        return smtp
+
+    def _wait_for_rate_limit(self) -> None:
+        now = time.monotonic()
+        if now < self._next_send_at:
+            time.sleep(self._next_send_at - now)
+            now = self._next_send_at
+        self._next_send_at = now + self.min_interval
+
+    def send(self, message: EmailMessage) -> None:
+        if self.min_interval:
+            self._wait_for_rate_limit()
+        for reconnect in (True, False):
+            try:
+                if self._smtp is None:
+                    self._smtp = self._connect()
+                self._smtp.send_message(message)
+                return
+            except smtplib.SMTPServerDisconnected:
+                self.close()
+                if not reconnect:
+                    raise
+            except REFUSED_ERRORS:
+                # The server reset the transaction, the connection stays usable
+                raise
+            except (smtplib.SMTPException, OSError):
+                self.close()
+                raise
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
+
+
+def sender_from_settings() -> SMTPSender:
+    return SMTPSender(
+        constants.MAIL_SERVER,
+        constants.MAIL_PORT,
+        username=constants.MAIL_USERNAME,
+        password=constants.MAIL_PASSWORD,
+        starttls=_flag(constants.MAIL_STARTTLS),
+        ssl_tls=_flag(constants.MAIL_SSL_TLS),
+        max_rate=constants.MAIL_MAX_RATE,
     )
-    await fm.send_message(message)
+
+
+def build_message(recipient: str, subject: str, body: str) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = constants.MAIL_FROM
+    message["To"] = recipient
+    message["Subject"] = subject
+    message.set_content(body, subtype="html")
+    return message
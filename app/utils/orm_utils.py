@@ -0,0 +1,18 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, raiseload
+
+from app import constants
+
+
+def read_options(*options):
+    """Loader options for read paths, strict about lazy loads when enabled."""
+    if constants.SQL_STRICT_LOADING:
+        return (*options, raiseload("*"))
+    return options
+
+
+def dialect_insert(table, db: Session):
+    """INSERT construct of the session's dialect, supporting ON CONFLICT."""
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(table)
+    return sqlite.insert(table)
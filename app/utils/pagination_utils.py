@@ -0,0 +1,55 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import Session
+
+
+def encode_cursor(created_at: datetime, row_id) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at), row_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as err:
+        raise ValueError("Invalid cursor") from err
+
+
+def encode_rank_cursor(rank: float, row_id) -> str:
+    raw = json.dumps([rank, str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_rank_cursor(cursor: str) -> tuple[float, str]:
+    try:
+        rank, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(rank), row_id
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as err:
+        raise ValueError("Invalid cursor") from err
+
+
+def paginate(query: Select, model, limit: int, cursor: str | None, db: Session):
+    """Keyset pagination over (created_at, id), newest first.
+
+    Returns the page rows and the cursor of the next page, if there is one.
+    """
+    if cursor is not None:
+        created_at, row_id = decode_cursor(cursor)
+        try:
+            row_id = model.id.type.python_type(row_id)
+        except ValueError as err:
+            raise ValueError("Invalid cursor") from err
+        query = query.where(tuple_(model.created_at, model.id) < (created_at, row_id))
+
+    query = query.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+    rows = db.scalars(query).all()
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
@@ -0,0 +1,98 @@
+"""Password hashing in a process pool of its own.
+
+Hashing is deliberately slow, and in the route threads it holds the GIL
+long enough to stall every other request. The pool runs it in separate
+processes and accepts at most `workers + max_pending` calls at a time;
+the ones over that fail at once with ServiceUnavailableError instead of
+queueing behind a burst of logins. A pool broken by a dead worker is
+replaced, and the calls it fails raise ServiceUnavailableError too.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from passlib.context import CryptContext
+
+from app.constants import PASSWORD_HASH_MAX_PENDING, PASSWORD_HASH_WORKERS
+from app.exceptions import ServiceUnavailableError
+
+pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                # Forking copies the threads' locks in whatever state they are,
+                # so the workers are started from a clean server process
+                self._executor = ProcessPoolExecutor(
+                    self.workers,
+                    mp_context=multiprocessing.get_context("forkserver"),
+                )
+            return self._executor
+
+    def _drop_executor(self, executor: ProcessPoolExecutor) -> None:
+        with self._executor_lock:
+            # Another call may have replaced it already
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False)
+
+    def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise ServiceUnavailableError
+        try:
+            executor = self._get_executor()
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._slots.release()
+            self._drop_executor(executor)
+            raise ServiceUnavailableError from None
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        try:
+            return future.result()
+        except BrokenProcessPool:
+            self._drop_executor(executor)
+            raise ServiceUnavailableError from None
+
+    def hash(self, password: str) -> str:
+        return self._run(_hash, password)
+
+    def verify(self, password: str, hashed_password: str) -> bool:
+        return self._run(_verify, password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_PENDING)
+
+
+def hash_password(password: str) -> str:
+    return password_hasher.hash(password)
+
+
+def verify_password(password: str, hashed_password: str) -> bool:
+    return password_hasher.verify(password, hashed_password)
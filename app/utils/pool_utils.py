@@ -0,0 +1,134 @@
+"""Connection pool settings and instrumentation.
+
+Checkouts are timed by a subclass of the dialect's QueuePool, and pool
+events keep count of open and checked out connections, so exhaustion shows
+up as growing waits and a saturated pool before requests time out.
+"""
+
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool
+
+from app import constants
+from app.utils import metrics
+
+
+class PoolStats:
+    def __init__(self, name: str, max_overflow: int = constants.DB_MAX_OVERFLOW):
+        self.name = name
+        # Connections opened past the size of the pool, negative for no limit
+        self.max_overflow = max_overflow
+        self.pool: QueuePool | None = None
+        self.checkout_waits = 0
+        self.checkout_wait_seconds = 0.0
+        self.checkout_timeouts = 0
+        self.connections = 0
+        self.in_use = 0
+        self._lock = threading.Lock()
+
+    def add(self, *, connections: int = 0, in_use: int = 0, timeouts: int = 0) -> None:
+        with self._lock:
+            self.connections += connections
+            self.in_use += in_use
+            self.checkout_timeouts += timeouts
+        if connections:
+            metrics.DB_POOL_CONNECTIONS.labels(self.name).inc(connections)
+        if in_use:
+            metrics.DB_POOL_IN_USE.labels(self.name).inc(in_use)
+        if timeouts:
+            metrics.DB_POOL_CHECKOUT_TIMEOUTS.labels(self.name).inc(timeouts)
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkout_waits += 1
+            self.checkout_wait_seconds += seconds
+        metrics.DB_POOL_CHECKOUT_WAIT.labels(self.name).observe(seconds)
+
+    @property
+    def capacity(self) -> int | None:
+        """Connections the pool may open, None when it has no limit."""
+        if self.pool is None or self.max_overflow < 0:
+            return None
+        return self.pool.size() + self.max_overflow
+
+    @property
+    def saturation(self) -> float:
+        capacity = self.capacity
+        return self.in_use / capacity if capacity else 0.0
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.pool.size(),
+            "max_overflow": self.max_overflow,
+            "timeout": self.pool.timeout(),
+            "connections": self.connections,
+            "in_use": self.in_use,
+            "idle": self.connections - self.in_use,
+            "saturation": self.saturation,
+            "checkout_waits": self.checkout_waits,
+            "checkout_wait_seconds": self.checkout_wait_seconds,
+            "checkout_timeouts": self.checkout_timeouts,
+        }
+
+
+class _TimedCheckout:
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Also reached by recreate(), when the engine is disposed
+        self.stats.pool = self
+        metrics.DB_POOL_CAPACITY.labels(self.stats.name).set(self.stats.capacity or 0)
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.add(timeouts=1)
+            raise
+        finally:
+            self.stats.observe_wait(time.perf_counter() - started)
+
+
+def instrumented_pool_class(base: type[QueuePool], stats: PoolStats) -> type[QueuePool]:
+    """A subclass of `base` timing its checkouts into `stats`."""
+    return type(
+        f"Instrumented{base.__name__}", (_TimedCheckout, base), {"stats": stats}
+    )
+
+
+def listen_pool_events(engine: Engine, stats: PoolStats) -> None:
+    """Keep the gauges of `stats` from the events of the pool of `engine`.
+
+    Listeners on the engine stay on the new pool when it is disposed.
+    """
+    if stats.pool is None:
+        return
+    event.listen(engine, "connect", lambda *_: stats.add(connections=1))
+    event.listen(engine, "close", lambda *_: stats.add(connections=-1))
+    event.listen(engine, "close_detached", lambda *_: stats.add(connections=-1))
+    event.listen(engine, "checkout", lambda *_: stats.add(in_use=1))
+    event.listen(engine, "checkin", lambda *_: stats.add(in_use=-1))
+
+
+def pool_options(url: str, stats: PoolStats) -> dict:
+    """Engine arguments for the configured pool of `url`.
+
+    Only dialects pooling with a QueuePool are sized and instrumented; the
+    in-memory SQLite of the tests keeps its single connection.
+    """
+    url = make_url(url)
+    options = {"pool_pre_ping": constants.DB_POOL_PRE_PING}
+    pool_class = url.get_dialect().get_pool_class(url)
+    if issubclass(pool_class, QueuePool):
+        options.update(
+            poolclass=instrumented_pool_class(pool_class, stats),
+            pool_size=constants.DB_POOL_SIZE,
+            max_overflow=stats.max_overflow,
+            pool_timeout=constants.DB_POOL_TIMEOUT,
+        )
+    return options
@@ -0,0 +1,245 @@
+"""Sampling profiler of single requests, asked for by an admin.
+
+An admin gets a short-lived profiling token from POST /profiles/token and
+sends it in the X-Profile header, or the `profile` query parameter, of the
+request to profile. While that request is handled, a thread samples the
+stack of the event loop, and of the busy threadpool threads running sync
+endpoints and dependencies, every PROFILE_INTERVAL seconds, at most
+PROFILE_MAX_SAMPLES times. The samples are stored as a speedscope file
+under PROFILE_DIR, downloaded from GET /profiles/{id} with the id of the
+X-Profile-Id response header, and opened in https://www.speedscope.app.
+
+PROFILE_DIR is local to each replica: behind a load balancer the download
+has to reach the replica that handled the profiled request. The event loop
+and the threadpool are shared: their samples also show other requests
+handled at the same time. Requests without the token only pay for a header
+lookup.
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import anyio
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import constants
+from app.utils.auth_utils import create_access_token, jwt_decode
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_QUERY_PARAMETER = "profile"
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+# Name of the threadpool threads of anyio, which run the sync endpoints
+WORKER_THREAD_NAME = "AnyIO worker thread"
+
+# (qualified name, file, first line) of a function
+FrameKey = tuple[str, str, int]
+
+
+class Sampler:
+    """Samples the stacks of threads from a thread of its own.
+
+    The registered threads and the busy threadpool threads are sampled, at
+    most `max_samples` times.
+    """
+
+    def __init__(self, interval: float, max_samples: int):
+        self.interval = interval
+        self.max_samples = max_samples
+        self.taken = 0
+        self._threads: set[int] = set()
+        self._samples: dict[int, list[tuple[tuple[FrameKey, ...], float]]] = (
+            defaultdict(list)
+        )
+        # Taken while sampling, worker threads may be gone by the end
+        self._thread_names: dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="request-profiler", daemon=True
+        )
+        self._last_sample = 0.0
+
+    def add_thread(self, ident: int) -> None:
+        with self._lock:
+            self._threads.add(ident)
+
+    def start(self) -> None:
+        """Start sampling, with a first sample of the calling thread."""
+        self._last_sample = time.perf_counter()
+        self._sample()
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while self.taken < self.max_samples and not self._stopped.wait(self.interval):
+            self._sample()
+
+    def _sample(self) -> None:
+        now = time.perf_counter()
+        weight = max(now - self._last_sample, self.interval)
+        self._last_sample = now
+        self.taken += 1
+        frames = sys._current_frames()
+        with self._lock:
+            idents = set(self._threads)
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        workers = {ident for ident, name in names.items() if name == WORKER_THREAD_NAME}
+        for ident in idents | workers:
+            frame = frames.get(ident)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_qualname, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            stack.reverse()
+            if stack and not (ident in workers and _is_idle_worker(stack)):
+                self._samples[ident].append((tuple(stack), weight))
+                self._thread_names.setdefault(ident, names.get(ident, str(ident)))
+
+    def speedscope(self, name: str) -> dict:
+        """The samples in the speedscope file format, a profile per thread."""
+        frame_indexes: dict[FrameKey, int] = {}
+        profiles = []
+        for ident, samples in self._samples.items():
+            stacks = [
+                [frame_indexes.setdefault(key, len(frame_indexes)) for key in stack]
+                for stack, _ in samples
+            ]
+            weights = [weight for _, weight in samples]
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": self._thread_names[ident],
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": stacks,
+                    "weights": weights,
+                }
+            )
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "vocabularynotes",
+            "shared": {
+                "frames": [
+                    {"name": qualname, "file": file, "line": line}
+                    for qualname, file, line in frame_indexes
+                ]
+            },
+            "profiles": profiles,
+        }
+
+
+def _is_idle_worker(stack: list[FrameKey]) -> bool:
+    """Whether a threadpool thread is waiting for work, from its stack."""
+    names = [qualname for qualname, _, _ in stack]
+    try:
+        run = names.index("WorkerThread.run")
+    except ValueError:
+        return False
+    return names[run + 1 : run + 2] == ["Queue.get"]
+
+
+def create_profile_token(user_id: uuid.UUID) -> str:
+    return create_access_token(
+        {"profile_by": str(user_id)}, constants.PROFILE_TOKEN_EXPIRE_MINUTES
+    )
+
+
+def is_profile_token(token: str) -> bool:
+    try:
+        payload = jwt_decode(token)
+    except ValueError:
+        return False
+    return isinstance(payload, dict) and "profile_by" in payload
+
+
+def profile_path(profile_id: str) -> Path:
+    return Path(constants.PROFILE_DIR) / f"{profile_id}.speedscope.json"
+
+
+def save_profile(profile_id: str, profile: dict) -> None:
+    """Write a profile, dropping the oldest ones over PROFILE_MAX_FILES."""
+    directory = Path(constants.PROFILE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_path(profile_id).write_text(json.dumps(profile))
+    stored = sorted(
+        directory.glob("*.speedscope.json"), key=lambda path: path.stat().st_mtime
+    )
+    for path in stored[: max(len(stored) - constants.PROFILE_MAX_FILES, 0)]:
+        path.unlink(missing_ok=True)
+
+
+def _requested_token(scope: Scope) -> str | None:
+    token = Headers(scope=scope).get(PROFILE_HEADER)
+    if token is None and PROFILE_QUERY_PARAMETER.encode() in scope["query_string"]:
+        query = parse_qs(scope["query_string"].decode("latin-1"))
+        token = query.get(PROFILE_QUERY_PARAMETER, [None])[0]
+    return token
+
+
+class ProfilingMiddleware:
+    """Profiles the requests that carry a profiling token."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = _requested_token(scope)
+        if token is None:
+            await self.app(scope, receive, send)
+            return
+        if not is_profile_token(token):
+            response = JSONResponse(
+                {"detail": "Invalid profiling token"},
+                status_code=status.HTTP_403_FORBIDDEN,
+            )
+            await response(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Profile-Id", profile_id)
+            await send(message)
+
+        sampler = Sampler(constants.PROFILE_INTERVAL, constants.PROFILE_MAX_SAMPLES)
+        sampler.add_thread(threading.get_ident())
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            sampler.stop()
+            if sampler.taken >= sampler.max_samples:
+                logger.warning(
+                    "Profile %s stopped after %d samples", profile_id, sampler.taken
+                )
+            name = f"{scope['method']} {scope['path']}"
+            try:
+                await anyio.to_thread.run_sync(
+                    save_profile, profile_id, sampler.speedscope(name)
+                )
+            except OSError:
+                logger.exception("Could not save profile %s", profile_id)
+            else:
+                logger.info("Profile %s saved for %s", profile_id, name)
@@ -0,0 +1,150 @@
+"""Statements and database time of each request, and the slow query log.
+
+Engine events add every statement to the QueryStats of the request in
+progress, found through a context variable that the threadpool threads
+inherit. The middleware reports them in the X-DB-Queries and Server-Timing
+headers; statements run while a streamed body is being sent come after the
+headers and are not in them.
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import constants
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_PREFIXES = {
+    "postgresql": "EXPLAIN (ANALYZE, BUFFERS) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+# Longest parameters repr written to the log
+MAX_PARAMETERS_LENGTH = 1000
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    seconds: float = 0.0
+
+
+_request_queries: ContextVar[QueryStats | None] = ContextVar(
+    "request_queries", default=None
+)
+
+
+def _explain(conn, statement: str, parameters) -> str:
+    """The plan of a SELECT just run on `conn`, from its dialect's EXPLAIN.
+
+    On PostgreSQL the EXPLAIN runs in a savepoint, so that its failure does
+    not abort the transaction of the request.
+    """
+    dialect = conn.dialect.name
+    savepoint = dialect == "postgresql"
+    cursor = conn.connection.dbapi_connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT explain_slow_query")
+        try:
+            cursor.execute(EXPLAIN_PREFIXES[dialect] + statement, parameters)
+            plan = "\n".join(str(row[-1]) for row in cursor.fetchall())
+        except Exception:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT explain_slow_query")
+            raise
+        if savepoint:
+            cursor.execute("RELEASE SAVEPOINT explain_slow_query")
+        return plan
+    finally:
+        cursor.close()
+
+
+def _explainable(context) -> bool:
+    """Whether the statement of `context` is a SELECT that takes no row locks.
+
+    The compiled statement tells, so a SELECT starting with a WITH clause is
+    one too. EXPLAIN ANALYZE would run a SELECT ... FOR UPDATE or FOR SHARE
+    again, taking its locks a second time, so those are left out.
+    """
+    compiled = getattr(context, "compiled", None)
+    if compiled is None or not compiled.statement.is_select:
+        return False
+    return getattr(compiled.statement, "_for_update_arg", None) is None
+
+
+def _log_slow_query(
+    conn, statement: str, parameters, context, executemany: bool, seconds: float
+) -> None:
+    message = "Slow query (%.1f ms): %s\nParameters: %.*s"
+    args = [seconds * 1000, statement, MAX_PARAMETERS_LENGTH, repr(parameters)]
+    if (
+        constants.SQL_EXPLAIN_SLOW_QUERIES
+        and not executemany
+        and conn.dialect.name in EXPLAIN_PREFIXES
+        and _explainable(context)
+    ):
+        try:
+            plan = _explain(conn, statement, parameters)
+        except Exception as err:
+            plan = f"EXPLAIN failed: {err}"
+        message += "\nPlan:\n%s"
+        args.append(plan)
+    logger.warning(message, *args)
+
+
+def track_queries(engine: Engine) -> None:
+    """Count and time the statements of `engine` for the current request."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = conn.info.pop("query_started", None)
+        if started is None:
+            return
+        seconds = time.perf_counter() - started
+        stats = _request_queries.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+        if seconds >= constants.SLOW_QUERY_SECONDS:
+            _log_slow_query(conn, statement, parameters, context, many, seconds)
+
+
+class QueryStatsMiddleware:
+    """Reports the statements of each request in its response headers."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+
+        async def send_with_stats(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Queries", str(stats.count))
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        token = _request_queries.set(stats)
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _request_queries.reset(token)
@@ -0,0 +1,46 @@
+import re
+import unicodedata
+
+from app import constants
+
+MAX_SEARCH_TERMS = 16
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> list[str]:
+    """Lowercased words of a search query, without duplicates.
+
+    Only word characters are kept, so the terms are safe to quote into FTS5
+    and tsquery syntax.
+    """
+    terms = dict.fromkeys(term.lower() for term in _TERM_RE.findall(query))
+    return list(terms)[:MAX_SEARCH_TERMS]
+
+
+def matching_context(contexts: list[str], terms: list[str]) -> str | None:
+    """First context sentence containing any of the search terms."""
+    for context in contexts:
+        if not set(terms).isdisjoint(_TERM_RE.findall(context.lower())):
+            return context
+    return None
+
+
+def normalize_word(value: str, *, strip_accents: bool = False) -> str:
+    """Key under which spellings of the same word compare equal.
+
+    NFKC-normalized, casefolded, with runs of whitespace collapsed and,
+    with `strip_accents`, combining accents removed.
+    """
+    value = unicodedata.normalize("NFKC", value).casefold()
+    if strip_accents:
+        decomposed = unicodedata.normalize("NFD", value)
+        value = unicodedata.normalize(
+            "NFC", "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+        )
+    return " ".join(value.split())
+
+
+def word_key(value: str) -> str:
+    """The normalized_key of a word spelled `value`."""
+    return normalize_word(value, strip_accents=constants.WORD_KEY_STRIP_ACCENTS)
@@ -0,0 +1,103 @@
+"""Trigram similarity with the same rules as PostgreSQL's pg_trgm.
+
+Used where pg_trgm is not available. Each word of a string is lowercased and
+padded with two spaces in front and one behind, and the similarity of two
+strings is the Jaccard index of their trigram sets.
+"""
+
+import math
+import re
+import threading
+
+SIMILARITY_THRESHOLD = 0.3
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(value: str) -> frozenset[str]:
+    result = set()
+    for word in _WORD_RE.findall(value.lower()):
+        padded = f"  {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return frozenset(result)
+
+
+def similarity(a: str, b: str) -> float:
+    a_trigrams, b_trigrams = trigrams(a), trigrams(b)
+    if not a_trigrams or not b_trigrams:
+        return 0.0
+    shared = len(a_trigrams & b_trigrams)
+    return shared / (len(a_trigrams) + len(b_trigrams) - shared)
+
+
+class TrigramIndex:
+    """Inverted index from trigrams to ids, safe to share between threads.
+
+    A search only visits the postings of the query's trigrams, so its cost
+    depends on how common those trigrams are rather than on the index size.
+    """
+
+    def __init__(self, items=()):
+        self._lock = threading.Lock()
+        self._postings: dict[str, set[int]] = {}
+        self._trigrams: dict[int, frozenset[str]] = {}
+        for item_id, value in items:
+            self._add(item_id, value)
+
+    def __len__(self):
+        return len(self._trigrams)
+
+    def _add(self, item_id: int, value: str):
+        self._remove(item_id)
+        item_trigrams = trigrams(value)
+        self._trigrams[item_id] = item_trigrams
+        for trigram in item_trigrams:
+            self._postings.setdefault(trigram, set()).add(item_id)
+
+    def _remove(self, item_id: int):
+        for trigram in self._trigrams.pop(item_id, ()):
+            posting = self._postings[trigram]
+            posting.discard(item_id)
+            if not posting:
+                del self._postings[trigram]
+
+    def add(self, items):
+        with self._lock:
+            for item_id, value in items:
+                self._add(item_id, value)
+
+    def remove(self, item_ids):
+        with self._lock:
+            for item_id in item_ids:
+                self._remove(item_id)
+
+    def search(
+        self, query: str, limit: int, threshold: float = SIMILARITY_THRESHOLD
+    ) -> list[tuple[int, float]]:
+        """Ids with a similarity of at least `threshold`, most similar first.
+
+        A match shares at least m = ceil(threshold * q) of the q query
+        trigrams, so it is in at least one of the q - m + 1 shortest postings.
+        Only those are read, and each candidate is then scored exactly.
+        """
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return []
+        min_shared = max(1, math.ceil(threshold * len(query_trigrams)))
+
+        with self._lock:
+            postings = sorted(
+                (self._postings.get(trigram, ()) for trigram in query_trigrams),
+                key=len,
+            )
+            candidates = set().union(*postings[: len(query_trigrams) - min_shared + 1])
+            scored = []
+            for item_id in candidates:
+                item_trigrams = self._trigrams[item_id]
+                shared = len(query_trigrams & item_trigrams)
+                score = shared / (len(query_trigrams) + len(item_trigrams) - shared)
+                if score >= threshold:
+                    scored.append((item_id, score))
+
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return scored[:limit]
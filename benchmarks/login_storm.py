@@ -0,0 +1,94 @@
+"""Latency of a cheap route while the server is flooded with logins.
+
+Run against a started server, e.g.
+
+    uvicorn app.main:app --workers 2
+    python benchmarks/login_storm.py --base-url http://127.0.0.1:8000
+
+The probe route is timed alone first and then during the storm. With
+password hashing in its own process pool the two should stay close, and
+logins over the pool's capacity come back as 503 instead of piling up.
+"""
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+
+def percentiles(samples: list[float]) -> str:
+    quantiles = statistics.quantiles(samples, n=100)
+    return (
+        f"p50={quantiles[49] * 1000:.1f}ms "
+        f"p95={quantiles[94] * 1000:.1f}ms "
+        f"max={max(samples) * 1000:.1f}ms"
+    )
+
+
+def probe(client: httpx.Client, path: str, count: int) -> list[float]:
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        client.get(path).raise_for_status()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--logins", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--probe-path", default="/languages/")
+    parser.add_argument("--probes", type=int, default=200)
+    parser.add_argument(
+        "--username", help="log in as an existing user instead of registering one"
+    )
+    parser.add_argument("--password")
+    args = parser.parse_args()
+
+    with httpx.Client(base_url=args.base_url, timeout=60) as client:
+        if args.username:
+            credentials = {"username": args.username, "password": args.password}
+        else:
+            name = f"bench{uuid.uuid4().hex[:12]}"
+            credentials = {"username": name, "password": "benchmark-password"}
+            client.post(
+                "/users/", json={**credentials, "email": f"{name}@example.com"}
+            ).raise_for_status()
+        client.post("/auth/login", json=credentials).raise_for_status()
+
+        baseline = probe(client, args.probe_path, args.probes)
+
+        statuses = Counter()
+        statuses_lock = threading.Lock()
+
+        def login(_):
+            response = client.post("/auth/login", json=credentials)
+            with statuses_lock:
+                statuses[response.status_code] += 1
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            storm = pool.map(login, range(args.logins))
+            during = probe(client, args.probe_path, args.probes)
+            list(storm)
+        elapsed = time.perf_counter() - start
+
+    sys.stdout.write(
+        f"{args.probe_path} alone:        {percentiles(baseline)}\n"
+        f"{args.probe_path} during storm: {percentiles(during)}\n"
+        f"logins: {args.logins} in {elapsed:.1f}s "
+        f"({statuses[200] / elapsed:.1f}/s accepted), "
+        f"statuses {dict(sorted(statuses.items()))}\n"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Latency of the similar words lookup for a user with many words.
+
+Seeds a user with --words words, and --other-users users with as many
+again, into the database of DATABASE_URL, then times find_similar_words
+for random queries of the first user. For example
+
+    DATABASE_URL=postgresql+psycopg://... PYTHONPATH=. \
+        python benchmarks/similar_words.py
+
+On PostgreSQL the EXPLAIN (ANALYZE, BUFFERS) of one lookup is printed too.
+It should be a bitmap scan of ix_word_user_id_new_word_trgm whose rows stay
+within the user's words however many other users there are. Elsewhere the
+in-process index is timed, after the first lookup has built it.
+
+The seeded users and their words are deleted at the end.
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+import uuid
+
+from sqlalchemy import delete, event, insert
+
+from app import models, schemas
+from app.database import SessionLocal, engine
+from app.services import languages as lang_service
+from app.services import words as word_service
+from app.utils.datetime_utils import utc_now
+from app.utils.search_utils import word_key
+
+INDEX_NAME = "ix_word_user_id_new_word_trgm"
+LANG_CODE = "en-UK"
+SYLLABLES = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"] + ["st", "ng"]
+BATCH_SIZE = 5000
+
+
+def percentiles(samples: list[float]) -> str:
+    quantiles = statistics.quantiles(samples, n=100)
+    return (
+        f"p50={quantiles[49] * 1000:.1f}ms "
+        f"p95={quantiles[94] * 1000:.1f}ms "
+        f"max={max(samples) * 1000:.1f}ms"
+    )
+
+
+def random_word(rng: random.Random) -> str:
+    return "".join(rng.choices(SYLLABLES, k=rng.randint(2, 5)))
+
+
+def seed_user(db, rng: random.Random, words: int) -> uuid.UUID:
+    name = f"bench-{uuid.uuid4().hex[:12]}"
+    user = models.User(username=name, email=f"{name}@example.com", password="-")
+    db.add(user)
+    db.flush()
+    for start in range(0, words, BATCH_SIZE):
+        spellings = [random_word(rng) for _ in range(min(BATCH_SIZE, words - start))]
+        db.execute(
+            insert(models.Word),
+            [
+                {
+                    "user_id": user.id,
+                    "lang_code": LANG_CODE,
+                    "new_word": spelling,
+                    "normalized_key": word_key(spelling),
+                    "created_at": utc_now(),
+                }
+                for spelling in spellings
+            ],
+        )
+    db.commit()
+    return user.id
+
+
+def explain(db, query: str, user_id: uuid.UUID) -> str:
+    """The plan of the statement find_similar_words runs for `query`."""
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        word_service.find_similar_words(query, user_id, db)
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+    (statement, parameters), *_ = statements
+    cursor = db.connection().connection.dbapi_connection.cursor()
+    try:
+        cursor.execute("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters)
+        return "\n".join(row[0] for row in cursor.fetchall())
+    finally:
+        cursor.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--words", type=int, default=100_000)
+    parser.add_argument("--other-users", type=int, default=4)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    # Tables are only created where migrations have not been run
+    models.Base.metadata.create_all(engine)
+    user_ids = []
+    with SessionLocal() as db:
+        if not lang_service.has_language(LANG_CODE, db):
+            lang_service.create_language(
+                schemas.LanguageSchema(code=LANG_CODE, name="English"), db
+            )
+        try:
+            started = time.perf_counter()
+            for _ in range(args.other_users + 1):
+                user_ids.append(seed_user(db, rng, args.words))
+            total = args.words * len(user_ids)
+            seeding = time.perf_counter() - started
+
+            user_id = user_ids[0]
+            queries = [random_word(rng) for _ in range(args.queries)]
+            started = time.perf_counter()
+            word_service.find_similar_words(queries[0], user_id, db)
+            first = time.perf_counter() - started
+
+            samples, hits = [], 0
+            for query in queries:
+                started = time.perf_counter()
+                hits += len(word_service.find_similar_words(query, user_id, db))
+                samples.append(time.perf_counter() - started)
+            sys.stdout.write(
+                f"seeded {total} words in {seeding:.1f}s\n"
+                f"first lookup: {first * 1000:.1f}ms\n"
+                f"{args.queries} lookups, {hits} hits: {percentiles(samples)}\n"
+            )
+
+            if db.get_bind().dialect.name == "postgresql":
+                plan = explain(db, queries[0], user_id)
+                sys.stdout.write(plan + "\n")
+                if INDEX_NAME not in plan:
+                    sys.stderr.write(f"{INDEX_NAME} is not used\n")
+                    return 1
+        finally:
+            db.rollback()
+            db.execute(delete(models.Word).where(models.Word.user_id.in_(user_ids)))
+            db.execute(delete(models.User).where(models.User.id.in_(user_ids)))
+            db.commit()
+            word_service.clear_similarity_indexes()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())